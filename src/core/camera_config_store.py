@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+摄像头配置缓存 - camera.json 进程内共享缓存
+功能:
+1. 配置文件只解析一次，文件修改时间/大小变化时自动重新加载
+2. 通过 ConfigManager 写入时立即更新缓存
+3. 为拍照/切图预先计算每个摄像头的 RTSP 地址、有效标记、裁剪矩形和角标区域
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+def setup_project_paths():
+    """设置项目路径，确保可以正确导入模块"""
+    current_file = Path(__file__).resolve()
+    
+    # 找到项目根目录（包含 main.py 的目录）
+    project_root = current_file
+    while project_root.parent != project_root:
+        if (project_root / "main.py").exists():
+            break
+        project_root = project_root.parent
+    
+    # 将项目根目录添加到 Python 路径
+    project_root_str = str(project_root)
+    if project_root_str not in sys.path:
+        sys.path.insert(0, project_root_str)
+    
+    return project_root
+
+# 调用路径设置
+PROJECT_ROOT = setup_project_paths()
+
+import copy
+import json
+import threading
+from typing import Dict, Any, Optional, List
+from src.core.utils import get_config_dir, safe_json_dump, log_info, log_warning
+
+# 标准的6个位置
+STANDARD_POSITIONS = ['zhuang_1', 'zhuang_2', 'zhuang_3', 'xian_1', 'xian_2', 'xian_3']
+
+def build_rtsp_url(camera_config: Dict[str, Any]) -> str:
+    """构建RTSP URL"""
+    username = camera_config.get('username', 'admin')
+    password = camera_config.get('password', '')
+    ip = camera_config.get('ip', '')
+    port = camera_config.get('port', 554)
+    stream_path = camera_config.get('stream_path', '/Streaming/Channels/101')
+    
+    return f"rtsp://{username}:{password}@{ip}:{port}{stream_path}"
+
+def select_valid_marks(camera_config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    筛选有效的标记位置（已标记且坐标、尺寸为正）
+    
+    Args:
+        camera_config: 摄像头配置
+    
+    Returns:
+        有效标记位置 {位置: 标记数据}，按标准位置顺序
+    """
+    mark_positions = camera_config.get('mark_positions', {}) or {}
+    valid_marks = {}
+    
+    for position in STANDARD_POSITIONS:
+        position_data = mark_positions.get(position)
+        if not isinstance(position_data, dict):
+            continue
+        
+        try:
+            if (position_data.get('marked', False) and
+                float(position_data.get('x', 0)) > 0 and
+                float(position_data.get('y', 0)) > 0 and
+                float(position_data.get('width', 0)) > 0 and
+                float(position_data.get('height', 0)) > 0):
+                valid_marks[position] = position_data
+        except (TypeError, ValueError):
+            continue
+    
+    return valid_marks
+
+# 角标区域类型：点数框、花色框
+CORNER_ROI_KINDS = ('rank', 'suit')
+
+def parse_corner_rois(value: Any) -> Optional[Dict[str, tuple]]:
+    """
+    解析标记位置上的角标区域配置
+    
+    配置格式（相对裁剪图的比例，横图位置按旋转后的方向）:
+        "corner_rois": {"rank": [left, top, right, bottom], "suit": [left, top, right, bottom]}
+    
+    Args:
+        value: mark_positions 中某个位置的 corner_rois 字段
+    
+    Returns:
+        {'rank': (left, top, right, bottom), 'suit': (...)}，未配置或格式无效返回None
+    """
+    if not isinstance(value, dict):
+        return None
+    
+    rois = {}
+    for kind in CORNER_ROI_KINDS:
+        box = value.get(kind)
+        if not isinstance(box, (list, tuple)) or len(box) != 4:
+            return None
+        try:
+            left, top, right, bottom = (float(v) for v in box)
+        except (TypeError, ValueError):
+            return None
+        if not (0.0 <= left < right <= 1.0 and 0.0 <= top < bottom <= 1.0):
+            return None
+        rois[kind] = (left, top, right, bottom)
+    return rois
+
+def compute_crop_rect(position_data: Dict[str, Any]) -> tuple:
+    """
+    由中心坐标和尺寸计算裁剪矩形（未按画面尺寸限制）
+    
+    Returns:
+        (left, top, right, bottom)
+    """
+    center_x = int(position_data['x'])
+    center_y = int(position_data['y'])
+    width = int(position_data['width'])
+    height = int(position_data['height'])
+    
+    left = center_x - width // 2
+    top = center_y - height // 2
+    return (left, top, left + width, top + height)
+
+class CameraConfigStore:
+    """摄像头配置缓存"""
+    
+    def __init__(self, config_file: Optional[Path] = None):
+        """
+        初始化配置缓存
+        
+        Args:
+            config_file: 配置文件路径，默认 src/config/camera.json
+        """
+        self.config_file = Path(config_file) if config_file else get_config_dir() / "camera.json"
+        
+        self._lock = threading.RLock()
+        self._config = None        # 解析后的配置
+        self._signature = None     # (mtime_ns, size)，变化时重新加载
+        self._profiles = {}        # {摄像头ID: 预计算的摄像头配置}
+        
+        self.stats = {'loads': 0, 'hits': 0, 'invalidations': 0, 'load_errors': 0}
+    
+    def _file_signature(self) -> Optional[tuple]:
+        """配置文件签名，文件不存在返回None"""
+        try:
+            stat = self.config_file.stat()
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+    
+    def _ensure_loaded(self) -> Dict[str, Any]:
+        """确保缓存与文件一致，返回缓存的配置（调用方持有锁，不可修改）"""
+        signature = self._file_signature()
+        if self._config is not None and signature == self._signature:
+            self.stats['hits'] += 1
+            return self._config
+        
+        if signature is None:
+            self._set_config({}, None)
+            return self._config
+        
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            if not isinstance(config, dict):
+                raise ValueError("配置文件顶层不是对象")
+        except (OSError, ValueError) as e:
+            # 文件正在被写入或内容损坏：保留上次的配置，下次调用重试
+            self.stats['load_errors'] += 1
+            log_warning(f"读取摄像头配置失败，使用缓存配置: {e}", "CONFIG")
+            if self._config is None:
+                self._config = {}
+            return self._config
+        
+        self._set_config(config, signature)
+        self.stats['loads'] += 1
+        return self._config
+    
+    def _set_config(self, config: Dict[str, Any], signature: Optional[tuple]):
+        """替换缓存配置并清除预计算结果"""
+        self._config = config
+        self._signature = signature
+        self._profiles = {}
+    
+    def _build_profile(self, camera: Dict[str, Any]) -> Dict[str, Any]:
+        """预计算摄像头配置"""
+        camera = copy.deepcopy(camera)
+        valid_marks = select_valid_marks(camera)
+        corner_rois = {}
+        for position, data in valid_marks.items():
+            if 'corner_rois' not in data:
+                continue
+            rois = parse_corner_rois(data['corner_rois'])
+            if rois is None:
+                log_warning(f"摄像头 {camera.get('id')} {position} 角标区域配置无效，使用左上角1/4", "CONFIG")
+            else:
+                corner_rois[position] = rois
+        
+        return {
+            'camera_id': camera.get('id'),
+            'name': camera.get('name', f"摄像头{camera.get('id')}"),
+            'enabled': camera.get('enabled', True),
+            'camera': camera,
+            'rtsp_url': build_rtsp_url(camera),
+            'valid_marks': valid_marks,
+            'crop_rects': {position: compute_crop_rect(data) for position, data in valid_marks.items()},
+            'corner_rois': corner_rois
+        }
+    
+    # ============ 读取 ============
+    
+    def get_config(self) -> Dict[str, Any]:
+        """获取完整配置（副本，可修改）"""
+        with self._lock:
+            return copy.deepcopy(self._ensure_loaded())
+    
+    def get_cameras(self) -> List[Dict[str, Any]]:
+        """获取所有摄像头配置（副本）"""
+        with self._lock:
+            return copy.deepcopy(self._ensure_loaded().get('cameras', []))
+    
+    def get_camera(self, camera_id: str) -> Optional[Dict[str, Any]]:
+        """获取指定摄像头配置（副本），不存在返回None"""
+        profile = self.get_profile(camera_id)
+        return copy.deepcopy(profile['camera']) if profile else None
+    
+    def get_section(self, name: str) -> Dict[str, Any]:
+        """获取 system 下的配置节（副本）"""
+        with self._lock:
+            return copy.deepcopy(self._ensure_loaded().get('system', {}).get(name, {}))
+    
+    def get_profile(self, camera_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取摄像头预计算配置（共享对象，调用方只读）
+        
+        Args:
+            camera_id: 摄像头ID
+        
+        Returns:
+            {'camera_id', 'name', 'enabled', 'camera', 'rtsp_url', 'valid_marks', 'crop_rects', 'corner_rois'}，
+            摄像头不存在返回None
+        """
+        with self._lock:
+            config = self._ensure_loaded()
+            profile = self._profiles.get(camera_id)
+            if profile is not None:
+                return profile
+            
+            for camera in config.get('cameras', []):
+                if camera.get('id') == camera_id:
+                    profile = self._build_profile(camera)
+                    self._profiles[camera_id] = profile
+                    return profile
+            return None
+    
+    # ============ 写入和失效 ============
+    
+    def save_config(self, config: Dict[str, Any]) -> bool:
+        """
+        写入配置文件并更新缓存
+        
+        Args:
+            config: 完整配置
+        
+        Returns:
+            是否写入成功
+        """
+        with self._lock:
+            if not safe_json_dump(config, self.config_file):
+                self.invalidate()
+                return False
+            
+            self._set_config(copy.deepcopy(config), self._file_signature())
+            self.stats['invalidations'] += 1
+            return True
+    
+    def invalidate(self):
+        """丢弃缓存，下次读取时重新解析配置文件"""
+        with self._lock:
+            self._set_config(None, None)
+            self.stats['invalidations'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            return {
+                'config_file': str(self.config_file),
+                'cached': self._config is not None,
+                'profiles': len(self._profiles),
+                **self.stats
+            }
+
+# ============ 供其他模块调用的函数接口 ============
+
+# 全局配置缓存（首次使用时创建）
+_camera_config_store = None
+_camera_config_store_lock = threading.Lock()
+
+def get_camera_config_store() -> CameraConfigStore:
+    """获取全局摄像头配置缓存"""
+    global _camera_config_store
+    if _camera_config_store is None:
+        with _camera_config_store_lock:
+            if _camera_config_store is None:
+                _camera_config_store = CameraConfigStore()
+                log_info("摄像头配置缓存初始化完成", "CONFIG")
+    return _camera_config_store
+
+def get_camera_profile(camera_id: str) -> Optional[Dict[str, Any]]:
+    """获取摄像头预计算配置"""
+    return get_camera_config_store().get_profile(camera_id)
+
+def get_crop_rect(camera_id: str, position: str) -> Optional[tuple]:
+    """获取标记位置的裁剪矩形 (left, top, right, bottom)，摄像头或位置不存在返回None"""
+    profile = get_camera_profile(camera_id)
+    return profile['crop_rects'].get(position) if profile else None
+
+def invalidate_camera_config():
+    """丢弃摄像头配置缓存"""
+    get_camera_config_store().invalidate()
@@ -40,11 +40,12 @@ PROJECT_ROOT = setup_project_paths()
 import json
 from typing import Dict, Any, Optional, List
 from src.core.utils import (
-    get_config_dir, safe_json_load, safe_json_dump,
+    get_config_dir,
     format_success_response, format_error_response,
     validate_camera_id, validate_mark_position,
     log_info, log_success, log_error, log_warning, get_timestamp
 )
+from src.core.camera_config_store import get_camera_config_store
 
 class ConfigManager:
     """配置管理器"""
@@ -52,7 +53,9 @@ class ConfigManager:
     def __init__(self):
         """初始化配置管理器"""
         self.config_dir = get_config_dir()
-        self.config_file = self.config_dir / "camera.json"
+        
+        # 共享配置缓存：读取不再每次解析文件，写入后立即更新缓存
+        self.store = get_camera_config_store()
                
         log_info("配置管理器初始化完成", "CONFIG")
     
@@ -64,7 +67,7 @@ class ConfigManager:
             所有摄像头配置数据
         """
         try:
-            config = safe_json_load(self.config_file, {})
+            config = self.store.get_config()
             cameras = config.get('cameras', [])
             
             return format_success_response(
@@ -93,7 +96,7 @@ class ConfigManager:
             if not validate_camera_id(camera_id):
                 return format_error_response("摄像头ID格式无效", "INVALID_CAMERA_ID")
             
-            config = safe_json_load(self.config_file, {})
+            config = self.store.get_config()
             cameras = config.get('cameras', [])
             
             # 查找指定摄像头
@@ -137,7 +140,7 @@ class ConfigManager:
                 return format_error_response("标记数据格式无效", "INVALID_MARKS_DATA")
             
             # 读取现有配置
-            config = safe_json_load(self.config_file, {})
+            config = self.store.get_config()
             cameras = config.get('cameras', [])
             
             # 查找并更新指定摄像头
@@ -168,7 +171,7 @@ class ConfigManager:
                 return format_error_response(f"摄像头ID {camera_id} 不存在", "CAMERA_NOT_FOUND")
             
             # 保存配置文件
-            if not safe_json_dump(config, self.config_file):
+            if not self.store.save_config(config):
                 return format_error_response("保存配置文件失败", "SAVE_CONFIG_ERROR")
             
             log_success(f"摄像头 {camera_id} 标记数据更新成功 ({updated_marks} 个标记点)", "CONFIG")
@@ -206,7 +209,8 @@ class ConfigManager:
                 return format_error_response(f"摄像头ID {camera_id} 已存在", "CAMERA_EXISTS")
             
             # 读取现有配置
-            config = safe_json_load(self.config_file, {'cameras': []})
+            config = self.store.get_config()
+            config.setdefault('cameras', [])
             
             # 创建新摄像头配置
             new_camera = {
@@ -229,7 +233,7 @@ class ConfigManager:
             config['cameras'].append(new_camera)
             
             # 保存配置文件
-            if not safe_json_dump(config, self.config_file):
+            if not self.store.save_config(config):
                 return format_error_response("保存配置文件失败", "SAVE_CONFIG_ERROR")
             
             log_success(f"添加摄像头 {camera_id} 成功", "CONFIG")
@@ -259,7 +263,7 @@ class ConfigManager:
                 return format_error_response("摄像头ID格式无效", "INVALID_CAMERA_ID")
             
             # 读取现有配置
-            config = safe_json_load(self.config_file, {})
+            config = self.store.get_config()
             cameras = config.get('cameras', [])
             
             # 查找并更新指定摄像头
@@ -280,7 +284,7 @@ class ConfigManager:
                 return format_error_response(f"摄像头ID {camera_id} 不存在", "CAMERA_NOT_FOUND")
             
             # 保存配置文件
-            if not safe_json_dump(config, self.config_file):
+            if not self.store.save_config(config):
                 return format_error_response("保存配置文件失败", "SAVE_CONFIG_ERROR")
             
             log_success(f"摄像头 {camera_id} 信息更新成功", "CONFIG")
@@ -309,7 +313,7 @@ class ConfigManager:
                 return format_error_response("摄像头ID格式无效", "INVALID_CAMERA_ID")
             
             # 读取现有配置
-            config = safe_json_load(self.config_file, {})
+            config = self.store.get_config()
             cameras = config.get('cameras', [])
             
             # 查找并删除指定摄像头
@@ -320,7 +324,7 @@ class ConfigManager:
                 return format_error_response(f"摄像头ID {camera_id} 不存在", "CAMERA_NOT_FOUND")
             
             # 保存配置文件
-            if not safe_json_dump(config, self.config_file):
+            if not self.store.save_config(config):
                 return format_error_response("保存配置文件失败", "SAVE_CONFIG_ERROR")
             
             log_success(f"删除摄像头 {camera_id} 成功", "CONFIG")
@@ -361,7 +365,7 @@ class ConfigManager:
     def get_config_status(self) -> Dict[str, Any]:
         """获取配置文件状态信息"""
         try:
-            config = safe_json_load(self.config_file, {})
+            config = self.store.get_config()
             cameras = config.get('cameras', [])
             
             # 统计标记完成情况
@@ -386,8 +390,8 @@ class ConfigManager:
             return format_success_response(
                 "获取配置状态成功",
                 data={
-                    'config_file': str(self.config_file),
-                    'file_exists': self.config_file.exists(),
+                    'config_file': str(self.store.config_file),
+                    'file_exists': self.store.config_file.exists(),
                     'total_cameras': total_cameras,
                     'marked_cameras': marked_cameras,
                     'total_positions': total_positions,
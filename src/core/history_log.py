@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分段历史日志 - 识别历史以追加方式写入JSONL分段文件
+功能:
+1. 每条记录追加为一行JSON，按大小/时间轮转分段
+2. 每个分段配套 .idx 偏移索引（每条记录8字节），按序号直接定位
+3. 保留策略按整段删除
+4. 记录数/字节数/分段数随写入和删除增量维护，统计O(1)，可定期与磁盘对账
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+def setup_project_paths():
+    """设置项目路径，确保可以正确导入模块"""
+    current_file = Path(__file__).resolve()
+    
+    # 找到项目根目录（包含 main.py 的目录）
+    project_root = current_file
+    while project_root.parent != project_root:
+        if (project_root / "main.py").exists():
+            break
+        project_root = project_root.parent
+    
+    # 将项目根目录添加到 Python 路径
+    project_root_str = str(project_root)
+    if project_root_str not in sys.path:
+        sys.path.insert(0, project_root_str)
+    
+    return project_root
+
+# 调用路径设置
+PROJECT_ROOT = setup_project_paths()
+
+import json
+import time
+import struct
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterator, Iterable
+from src.core.utils import log_info, log_error, log_warning
+
+# 索引项格式：记录在分段文件中的起始偏移（8字节无符号小端）
+INDEX_ENTRY = struct.Struct('<Q')
+
+# 分段文件名前缀
+SEGMENT_PREFIX = "segment_"
+
+class SegmentedHistoryLog:
+    """分段追加历史日志"""
+    
+    def __init__(self, log_dir: Path, max_segment_bytes: int = 16 * 1024 * 1024,
+                 max_segment_age: float = 3600.0):
+        """
+        初始化历史日志
+        
+        Args:
+            log_dir: 分段文件目录
+            max_segment_bytes: 单个分段的最大字节数，超过后轮转
+            max_segment_age: 单个分段的最长写入时间(秒)，超过后轮转
+        """
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        
+        self._lock = threading.RLock()
+        self._active = None   # 当前写入分段 {'name', 'data', 'index', 'size', 'created_at'}
+        self._segment_counter = 0
+        
+        # 增量统计（写入/删除时更新，reconcile() 按磁盘实际情况校正）
+        self._counters = {'segments': 0, 'records': 0, 'total_bytes': 0, 'oldest_segment': None}
+        self.reconcile()
+    
+    # ============ 分段管理 ============
+    
+    def _list_segments(self) -> List[Path]:
+        """按创建顺序列出所有分段数据文件（文件名有序）"""
+        return sorted(self.log_dir.glob(f"{SEGMENT_PREFIX}*.jsonl"))
+    
+    def _index_path(self, segment_path: Path) -> Path:
+        """分段对应的索引文件"""
+        return segment_path.with_suffix('.idx')
+    
+    def _segment_record_count(self, segment_path: Path) -> int:
+        """分段记录数（索引文件大小 / 8）"""
+        try:
+            return self._index_path(segment_path).stat().st_size // INDEX_ENTRY.size
+        except OSError:
+            return 0
+    
+    def _open_new_segment(self):
+        """关闭当前分段并新建分段（启动后总是写入新分段，不续写可能不完整的旧分段）"""
+        self._close_active()
+        
+        self._segment_counter += 1
+        name = f"{SEGMENT_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self._segment_counter:04d}"
+        data_path = self.log_dir / f"{name}.jsonl"
+        
+        self._active = {
+            'name': name,
+            'data': open(data_path, 'ab'),
+            'index': open(self._index_path(data_path), 'ab'),
+            'size': data_path.stat().st_size,
+            'created_at': time.time()
+        }
+        self._counters['segments'] += 1
+        if self._counters['oldest_segment'] is None:
+            self._counters['oldest_segment'] = name
+        log_info(f"历史日志新分段: {name}", "HISTORY")
+    
+    def _close_active(self):
+        """关闭当前写入分段"""
+        if self._active is None:
+            return
+        
+        for key in ('data', 'index'):
+            try:
+                self._active[key].close()
+            except OSError:
+                pass
+        self._active = None
+    
+    def _needs_rotation(self) -> bool:
+        """判断当前分段是否需要轮转"""
+        if self._active is None:
+            return True
+        if self._active['size'] >= self.max_segment_bytes:
+            return True
+        return time.time() - self._active['created_at'] >= self.max_segment_age
+    
+    # ============ 写入 ============
+    
+    def _commit_lines(self, lines: List[bytes]) -> int:
+        """
+        将一批数据行写入当前分段（数据行落盘后才写索引项）
+        
+        Args:
+            lines: 已序列化的数据行
+        
+        Returns:
+            成功写入的记录数，写入失败时为0并停止向该分段追加
+        """
+        if not lines:
+            return 0
+        
+        active = self._active
+        start = active['size']
+        offsets = []
+        for line in lines:
+            offsets.append(active['size'])
+            active['size'] += len(line)
+        
+        try:
+            active['data'].write(b''.join(lines))
+            active['data'].flush()
+            active['index'].write(b''.join(INDEX_ENTRY.pack(offset) for offset in offsets))
+            active['index'].flush()
+        except Exception as e:
+            # 分段尾部可能留下部分数据或索引，不再向该分段追加，下一条记录写入新分段
+            # （没有索引项的数据不计入记录，计数偏差由 reconcile() 校正）
+            log_error(f"写入历史日志失败: {e}", "HISTORY")
+            self._close_active()
+            return 0
+        
+        self._counters['records'] += len(lines)
+        self._counters['total_bytes'] += active['size'] - start + len(lines) * INDEX_ENTRY.size
+        return len(lines)
+    
+    def append_many(self, records: List[Dict[str, Any]]) -> int:
+        """
+        批量追加记录
+        
+        Args:
+            records: 记录列表（每条为可JSON序列化的字典）
+        
+        Returns:
+            成功写入的记录数
+        """
+        written = 0
+        
+        with self._lock:
+            pending = []
+            pending_bytes = 0
+            for record in records:
+                try:
+                    line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+                except Exception as e:
+                    log_error(f"序列化历史记录失败: {e}", "HISTORY")
+                    continue
+                
+                # 当前分段写满时先提交已积累的记录，再轮转
+                if pending and self._active['size'] + pending_bytes >= self.max_segment_bytes:
+                    written += self._commit_lines(pending)
+                    pending, pending_bytes = [], 0
+                
+                if not pending and self._needs_rotation():
+                    try:
+                        self._open_new_segment()
+                    except Exception as e:
+                        log_error(f"创建历史分段失败: {e}", "HISTORY")
+                        continue
+                
+                pending.append(line)
+                pending_bytes += len(line)
+            
+            written += self._commit_lines(pending)
+        
+        return written
+    
+    def append(self, record: Dict[str, Any]) -> bool:
+        """追加单条记录"""
+        return self.append_many([record]) == 1
+    
+    def import_segment(self, records: Iterable[Dict[str, Any]], segment_time: str) -> Optional[str]:
+        """
+        将一批旧记录写为一个独立的已关闭分段（用于导入旧格式历史）
+        
+        分段名为 segment_<segment_time>_0000，segment_time 取最早一条记录的时间时排在之后新建的分段之前；
+        数据和索引先写入临时文件，全部写完后才改名生效
+        
+        Args:
+            records: 按时间顺序的记录（逐条写入，不一次性载入内存）
+            segment_time: 分段时间（'%Y%m%d_%H%M%S'）
+        
+        Returns:
+            分段名，同名分段已存在（之前已导入）或没有记录时返回None
+        """
+        name = f"{SEGMENT_PREFIX}{segment_time}_0000"
+        data_path = self.log_dir / f"{name}.jsonl"
+        index_path = self._index_path(data_path)
+        if data_path.exists():
+            return None
+        
+        tmp_data_path = data_path.with_suffix('.jsonl.tmp')
+        tmp_index_path = index_path.with_suffix('.idx.tmp')
+        count = 0
+        size = 0
+        try:
+            with open(tmp_data_path, 'wb') as data_file, open(tmp_index_path, 'wb') as index_file:
+                for record in records:
+                    line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+                    data_file.write(line)
+                    index_file.write(INDEX_ENTRY.pack(size))
+                    size += len(line)
+                    count += 1
+            
+            if count == 0:
+                tmp_data_path.unlink()
+                tmp_index_path.unlink()
+                return None
+            
+            # 先放置索引再放置数据文件：分段按数据文件列出，数据文件出现即表示导入完成
+            with self._lock:
+                tmp_index_path.replace(index_path)
+                tmp_data_path.replace(data_path)
+                self._counters['segments'] += 1
+                self._counters['records'] += count
+                self._counters['total_bytes'] += size + count * INDEX_ENTRY.size
+                self._counters['oldest_segment'] = self._list_segments()[0].stem
+        except Exception:
+            for path in (tmp_data_path, tmp_index_path):
+                path.unlink(missing_ok=True)
+            raise
+        
+        log_info(f"历史日志导入分段: {name} ({count} 条记录)", "HISTORY")
+        return name
+
+    # ============ 读取 ============
+    
+    def _read_segment_record(self, segment_path: Path, position: int) -> Optional[Dict[str, Any]]:
+        """通过索引读取分段中的第 position 条记录"""
+        with open(self._index_path(segment_path), 'rb') as index_file:
+            index_file.seek(position * INDEX_ENTRY.size)
+            entry = index_file.read(INDEX_ENTRY.size)
+            if len(entry) < INDEX_ENTRY.size:
+                return None
+            offset = INDEX_ENTRY.unpack(entry)[0]
+        
+        with open(segment_path, 'rb') as data_file:
+            data_file.seek(offset)
+            line = data_file.readline()
+        
+        try:
+            return json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+    
+    def get_record(self, sequence: int) -> Optional[Dict[str, Any]]:
+        """
+        按全局序号读取记录（0为保留的最早一条）
+        
+        Args:
+            sequence: 全局序号
+        
+        Returns:
+            记录，不存在返回None
+        """
+        if sequence < 0:
+            return None
+        
+        with self._lock:
+            for segment_path in self._list_segments():
+                count = self._segment_record_count(segment_path)
+                if sequence < count:
+                    return self._read_segment_record(segment_path, sequence)
+                sequence -= count
+        
+        return None
+    
+    def iter_records(self, reverse: bool = False, segment: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        顺序（或倒序）遍历所有记录
+        
+        Args:
+            reverse: 是否从最新记录开始
+            segment: 只遍历指定分段（分段名），默认遍历全部
+        """
+        with self._lock:
+            segments = self._list_segments()
+        if segment is not None:
+            segments = [path for path in segments if path.stem == segment]
+        
+        if reverse:
+            segments = list(reversed(segments))
+        
+        for segment_path in segments:
+            try:
+                if reverse:
+                    count = self._segment_record_count(segment_path)
+                    for position in range(count - 1, -1, -1):
+                        record = self._read_segment_record(segment_path, position)
+                        if record is not None:
+                            yield record
+                else:
+                    # 只读取有索引项的记录（写入失败的分段尾部可能有未建索引的数据）
+                    count = self._segment_record_count(segment_path)
+                    with open(segment_path, 'rb') as data_file:
+                        for _, line in zip(range(count), data_file):
+                            try:
+                                yield json.loads(line)
+                            except (json.JSONDecodeError, UnicodeDecodeError):
+                                continue
+            except FileNotFoundError:
+                # 遍历期间分段被保留策略删除
+                continue
+    
+    def tail(self, count: int = 20) -> List[Dict[str, Any]]:
+        """读取最新的 count 条记录（最新在前）"""
+        records = []
+        for record in self.iter_records(reverse=True):
+            records.append(record)
+            if len(records) >= count:
+                break
+        return records
+    
+    # ============ 统计和保留策略 ============
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取日志统计（读取增量计数，不访问磁盘）"""
+        with self._lock:
+            return {
+                'segments': self._counters['segments'],
+                'records': self._counters['records'],
+                'total_bytes': self._counters['total_bytes'],
+                'active_segment': self._active['name'] if self._active else None,
+                'oldest_segment': self._counters['oldest_segment'],
+                'max_segment_bytes': self.max_segment_bytes,
+                'max_segment_age': self.max_segment_age
+            }
+    
+    def reconcile(self) -> Dict[str, Any]:
+        """
+        扫描分段文件校正增量统计（外部删除文件、写入失败等会导致计数偏差）
+        
+        Returns:
+            {'records_drift', 'bytes_drift', 'segments_drift'}: 校正量（实际 - 计数）
+        """
+        with self._lock:
+            segments = self._list_segments()
+            total_records = 0
+            total_bytes = 0
+            
+            for segment_path in segments:
+                total_records += self._segment_record_count(segment_path)
+                try:
+                    total_bytes += segment_path.stat().st_size + self._index_path(segment_path).stat().st_size
+                except OSError:
+                    continue
+            
+            drift = {
+                'records_drift': total_records - self._counters['records'],
+                'bytes_drift': total_bytes - self._counters['total_bytes'],
+                'segments_drift': len(segments) - self._counters['segments']
+            }
+            self._counters.update({
+                'segments': len(segments),
+                'records': total_records,
+                'total_bytes': total_bytes,
+                'oldest_segment': segments[0].stem if segments else None
+            })
+            return drift
+    
+    def cleanup(self, keep_records: Optional[int] = None, max_age_days: Optional[float] = None) -> Dict[str, Any]:
+        """
+        按整段删除旧记录
+        
+        Args:
+            keep_records: 至少保留的记录数（删除后仍不少于该数量的最旧分段才会被删除）
+            max_age_days: 删除最后写入时间早于该天数的分段
+        
+        Returns:
+            {'deleted_segments', 'deleted_records', 'remaining_records'}
+        """
+        with self._lock:
+            segments = self._list_segments()
+            counts = [self._segment_record_count(path) for path in segments]
+            remaining = sum(counts)
+            active_name = self._active['name'] if self._active else None
+            cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+            
+            deleted_segments = 0
+            deleted_records = 0
+            
+            for segment_path, count in zip(segments, counts):
+                # 当前写入分段不删除
+                if segment_path.stem == active_name:
+                    break
+                
+                by_count = keep_records is not None and remaining - count >= keep_records
+                by_age = cutoff is not None and segment_path.stat().st_mtime < cutoff
+                if not (by_count or by_age):
+                    break
+                
+                try:
+                    segment_bytes = segment_path.stat().st_size + self._index_path(segment_path).stat().st_size
+                    segment_path.unlink()
+                    self._index_path(segment_path).unlink(missing_ok=True)
+                except OSError as e:
+                    log_warning(f"删除历史分段失败 {segment_path.name}: {e}", "HISTORY")
+                    break
+                
+                remaining -= count
+                deleted_segments += 1
+                deleted_records += count
+                self._counters['segments'] -= 1
+                self._counters['records'] -= count
+                self._counters['total_bytes'] -= segment_bytes
+            
+            if deleted_segments:
+                remaining_segments = segments[deleted_segments:]
+                self._counters['oldest_segment'] = remaining_segments[0].stem if remaining_segments else None
+            
+            return {
+                'deleted_segments': deleted_segments,
+                'deleted_records': deleted_records,
+                'remaining_records': remaining
+            }
+    
+    def close(self):
+        """关闭当前分段"""
+        with self._lock:
+            self._close_active()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+识别历史查询库 - 基于SQLite的历史记录索引
+功能:
+1. 每条识别结果写入 recognitions 表，识别出的牌写入 cards 表
+2. 按摄像头、时间范围、牌面建立索引
+3. 分页查询和逐行流式导出
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+def setup_project_paths():
+    """设置项目路径，确保可以正确导入模块"""
+    current_file = Path(__file__).resolve()
+    
+    # 找到项目根目录（包含 main.py 的目录）
+    project_root = current_file
+    while project_root.parent != project_root:
+        if (project_root / "main.py").exists():
+            break
+        project_root = project_root.parent
+    
+    # 将项目根目录添加到 Python 路径
+    project_root_str = str(project_root)
+    if project_root_str not in sys.path:
+        sys.path.insert(0, project_root_str)
+    
+    return project_root
+
+# 调用路径设置
+PROJECT_ROOT = setup_project_paths()
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Union
+from src.core.utils import log_info, log_error
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recognitions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    camera_id TEXT NOT NULL DEFAULT '',
+    received_at TEXT NOT NULL,
+    ts REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cards (
+    recognition_id INTEGER NOT NULL REFERENCES recognitions(id) ON DELETE CASCADE,
+    camera_id TEXT NOT NULL DEFAULT '',
+    ts REAL NOT NULL,
+    position TEXT NOT NULL,
+    suit TEXT NOT NULL,
+    rank TEXT NOT NULL,
+    card TEXT NOT NULL,
+    confidence REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_recognitions_camera_ts ON recognitions(camera_id, ts);
+CREATE INDEX IF NOT EXISTS idx_recognitions_ts ON recognitions(ts);
+CREATE INDEX IF NOT EXISTS idx_cards_card_ts ON cards(card, ts);
+CREATE INDEX IF NOT EXISTS idx_cards_rank_ts ON cards(rank, ts);
+CREATE INDEX IF NOT EXISTS idx_cards_recognition ON cards(recognition_id);
+"""
+
+# 分页大小上限
+MAX_PAGE_SIZE = 500
+
+def parse_time(value: Union[str, float, int, None]) -> Optional[float]:
+    """
+    解析时间参数
+    
+    Args:
+        value: 时间戳(秒)、ISO时间字符串（如 2025-05-29T10:00:00 或 2025-05-29 10:00:00）或日期
+    
+    Returns:
+        时间戳(秒)，为空返回None
+    
+    Raises:
+        ValueError: 格式无法识别
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.strip()).timestamp()
+
+def make_card_key(suit: str, rank: str) -> str:
+    """牌面键: 花色:点数"""
+    return f"{suit}:{rank}"
+
+class HistoryStore:
+    """识别历史查询库"""
+    
+    def __init__(self, db_path: Path):
+        """
+        初始化查询库
+        
+        Args:
+            db_path: SQLite数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        
+        log_info(f"历史查询库初始化完成: {self.db_path.name}", "HISTORY")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接（WAL模式，读写互不阻塞）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # 允许跨线程关闭，连接本身只在创建它的线程中使用
+            conn = sqlite3.connect(str(self.db_path), timeout=10.0, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    # ============ 写入 ============
+    
+    def insert_many(self, results: List[Dict[str, Any]]) -> int:
+        """
+        批量写入识别结果（单个事务）
+        
+        Args:
+            results: 标准化后的识别结果列表
+        
+        Returns:
+            写入的记录数
+        """
+        if not results:
+            return 0
+        
+        with self._write_lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    for data in results:
+                        self._insert_result(conn, data)
+                return len(results)
+            except Exception as e:
+                log_error(f"写入历史查询库失败: {e}", "HISTORY")
+                return 0
+    
+    def _insert_result(self, conn: sqlite3.Connection, data: Dict[str, Any]):
+        """写入单条识别结果及其识别出的牌"""
+        camera_id = str(data.get('camera_id', '') or '')
+        received_at = data.get('received_at') or datetime.now().isoformat()
+        try:
+            ts = parse_time(received_at)
+        except ValueError:
+            ts = datetime.now().timestamp()
+        
+        cursor = conn.execute(
+            "INSERT INTO recognitions (camera_id, received_at, ts, data) VALUES (?, ?, ?, ?)",
+            (camera_id, received_at, ts, json.dumps(data, ensure_ascii=False))
+        )
+        recognition_id = cursor.lastrowid
+        
+        card_rows = []
+        for position, pos_data in (data.get('positions') or {}).items():
+            if not isinstance(pos_data, dict):
+                continue
+            suit = str(pos_data.get('suit', '') or '')
+            rank = str(pos_data.get('rank', '') or '')
+            # 未识别的位置不建索引
+            if not suit or not rank or rank == '0':
+                continue
+            card_rows.append((
+                recognition_id, camera_id, ts, position, suit, rank,
+                make_card_key(suit, rank), float(pos_data.get('confidence', 0.0) or 0.0)
+            ))
+        
+        if card_rows:
+            conn.executemany(
+                "INSERT INTO cards (recognition_id, camera_id, ts, position, suit, rank, card, confidence) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                card_rows
+            )
+    
+    # ============ 查询 ============
+    
+    def _build_filter(self, camera_id: Optional[str], start: Optional[float], end: Optional[float],
+                      card: Optional[str]) -> Tuple[str, list]:
+        """构建查询条件"""
+        clauses = []
+        params = []
+        
+        if camera_id:
+            clauses.append("r.camera_id = ?")
+            params.append(camera_id)
+        if start is not None:
+            clauses.append("r.ts >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("r.ts <= ?")
+            params.append(end)
+        if card:
+            # 花色:点数 精确匹配，只给点数时匹配任意花色
+            column = 'card' if ':' in card else 'rank'
+            clauses.append(f"EXISTS (SELECT 1 FROM cards c WHERE c.recognition_id = r.id AND c.{column} = ?)")
+            params.append(card)
+        
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+    
+    def _row_to_record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """数据库行转换为记录"""
+        return {
+            'id': row['id'],
+            'camera_id': row['camera_id'],
+            'received_at': row['received_at'],
+            'data': json.loads(row['data'])
+        }
+    
+    def query(self, camera_id: Optional[str] = None, start: Optional[float] = None,
+              end: Optional[float] = None, card: Optional[str] = None,
+              page: int = 1, page_size: int = 50) -> Dict[str, Any]:
+        """
+        分页查询历史记录（最新在前）
+        
+        Args:
+            camera_id: 摄像头ID
+            start: 起始时间戳(秒)
+            end: 结束时间戳(秒)
+            card: 牌面（"花色:点数" 或只给点数）
+            page: 页码（从1开始）
+            page_size: 每页条数（最多 MAX_PAGE_SIZE）
+        
+        Returns:
+            {'records', 'total', 'page', 'page_size', 'pages'}
+        """
+        page = max(1, int(page))
+        page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+        where, params = self._build_filter(camera_id, start, end, card)
+        
+        conn = self._connect()
+        total = conn.execute(f"SELECT COUNT(*) FROM recognitions r {where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT r.id, r.camera_id, r.received_at, r.data FROM recognitions r {where} "
+            f"ORDER BY r.ts DESC, r.id DESC LIMIT ? OFFSET ?",
+            params + [page_size, (page - 1) * page_size]
+        ).fetchall()
+        
+        return {
+            'records': [self._row_to_record(row) for row in rows],
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'pages': (total + page_size - 1) // page_size
+        }
+    
+    def iter_query(self, camera_id: Optional[str] = None, start: Optional[float] = None,
+                   end: Optional[float] = None, card: Optional[str] = None,
+                   batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        按时间顺序逐条遍历查询结果（用于流式导出，不一次性载入内存）
+        
+        Args:
+            camera_id: 摄像头ID
+            start: 起始时间戳(秒)
+            end: 结束时间戳(秒)
+            card: 牌面
+            batch_size: 每次从数据库读取的行数
+        """
+        where, params = self._build_filter(camera_id, start, end, card)
+        
+        # 导出使用独立连接，避免长时间遍历占用线程共享连接的游标
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.execute(
+                f"SELECT r.id, r.camera_id, r.received_at, r.data FROM recognitions r {where} "
+                f"ORDER BY r.ts, r.id",
+                params
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_record(row)
+        finally:
+            conn.close()
+    
+    def count(self) -> int:
+        """记录总数"""
+        return self._connect().execute("SELECT COUNT(*) FROM recognitions").fetchone()[0]
+    
+    def count_by_camera(self) -> Dict[str, int]:
+        """按摄像头统计记录数（走 camera_id 索引）"""
+        rows = self._connect().execute(
+            "SELECT camera_id, COUNT(*) FROM recognitions GROUP BY camera_id"
+        ).fetchall()
+        return {row[0]: row[1] for row in rows}
+    
+    def trim(self, keep_records: int) -> int:
+        """
+        删除最旧的记录（按接收时间），只保留最新的 keep_records 条
+        
+        Returns:
+            删除的记录数
+        """
+        with self._write_lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute(
+                    "DELETE FROM recognitions WHERE id NOT IN "
+                    "(SELECT id FROM recognitions ORDER BY ts DESC, id DESC LIMIT ?)",
+                    (max(0, int(keep_records)),)
+                ).rowcount
+    
+    def close(self):
+        """关闭所有线程的数据库连接"""
+        with self._connections_lock:
+            connections = self._connections
+            self._connections = []
+        
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
@@ -43,6 +43,7 @@ from src.core.utils import (
     log_info, log_success, log_error, log_warning, get_timestamp
 )
 from src.core.config_manager import update_camera_marks, get_camera_by_id
+from src.core.camera_config_store import parse_corner_rois
 
 class MarkManager:
     """标记管理器"""
@@ -334,6 +335,14 @@ class MarkManager:
                     else:
                         processed_data[field] = str(position_data[field])
             
+            # 角标区域（点数框/花色框，相对裁剪图的比例）
+            if 'corner_rois' in position_data:
+                corner_rois = parse_corner_rois(position_data['corner_rois'])
+                if corner_rois is None:
+                    log_warning(f"忽略无效的 corner_rois 值: {position_data['corner_rois']}", "MARK")
+                else:
+                    processed_data['corner_rois'] = {kind: list(box) for kind, box in corner_rois.items()}
+            
             return {
                 'valid': True,
                 'error': None,
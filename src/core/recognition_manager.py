@@ -9,6 +9,9 @@
 4. 识别结果格式化供荷官端使用
 5. 推送配置管理和状态监控
 6. 数据统计和清理维护
+7. 识别结果事件广播（SSE / 长轮询，按序号回放）
+8. 最新结果常驻内存，后台线程合并写盘（write-behind）
+9. 历史记录写入分段追加日志（JSONL + 偏移索引）
 """
 
 import sys
@@ -36,7 +39,13 @@ def setup_project_paths():
 # 调用路径设置
 PROJECT_ROOT = setup_project_paths()
 
+import re
+import copy
 import json
+import time
+import atexit
+import threading
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from src.core.utils import (
@@ -44,6 +53,100 @@ from src.core.utils import (
     format_success_response, format_error_response,
     get_result_dir, log_info, log_success, log_error, log_warning
 )
+from src.core.history_log import SegmentedHistoryLog
+from src.core.history_store import HistoryStore, parse_time
+
+# 旧版历史文件（每条结果一个JSON文件）：history/recognition_<接收时间>.json
+LEGACY_HISTORY_PATTERN = re.compile(r'^recognition_(\d{8}_\d{6}_\d{3})\.json$')
+
+class RecognitionEventBroker:
+    """识别结果事件广播器 - 为每条接收的识别结果分配递增序号，订阅者按序号等待和回放"""
+    
+    def __init__(self, backlog_size: int = 200):
+        """
+        初始化广播器
+        
+        Args:
+            backlog_size: 保留用于回放的最近事件数
+        """
+        self._events = deque(maxlen=backlog_size)
+        self._sequence = 0
+        self._condition = threading.Condition()
+    
+    def publish(self, data: Dict[str, Any]) -> int:
+        """
+        发布识别结果事件并唤醒所有等待者
+        
+        Args:
+            data: 标准化后的识别结果
+        
+        Returns:
+            事件序号
+        """
+        with self._condition:
+            self._sequence += 1
+            self._events.append({
+                'sequence': self._sequence,
+                'camera_id': data.get('camera_id', ''),
+                'published_at': get_timestamp(),
+                'data': data
+            })
+            self._condition.notify_all()
+            return self._sequence
+    
+    def _collect_events(self, since: int, camera_id: Optional[str]) -> List[Dict[str, Any]]:
+        """收集序号大于since的事件（调用方持有锁）"""
+        return [
+            event for event in self._events
+            if event['sequence'] > since and (camera_id is None or event['camera_id'] == camera_id)
+        ]
+    
+    def wait_for_events(self, since: Optional[int] = None, camera_id: Optional[str] = None,
+                        timeout: float = 25.0) -> Dict[str, Any]:
+        """
+        等待新事件
+        
+        Args:
+            since: 已收到的最后序号，None表示只等待新事件，0表示回放全部保留事件
+            camera_id: 只返回指定摄像头的事件（可选）
+            timeout: 最长等待时间(秒)，0表示立即返回
+        
+        Returns:
+            {'events': 事件列表, 'last_sequence': 下次请求使用的序号, 'gap': 是否有事件已超出回放范围}
+        """
+        deadline = time.time() + max(0.0, timeout)
+        
+        with self._condition:
+            # 序号比当前还大说明服务已重启，从保留的事件开始回放
+            if since is None:
+                since = self._sequence
+            elif since > self._sequence:
+                since = 0
+            
+            oldest = self._events[0]['sequence'] if self._events else self._sequence + 1
+            gap = since < oldest - 1
+            
+            while True:
+                events = self._collect_events(since, camera_id)
+                remaining = deadline - time.time()
+                if events or remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            
+            return {
+                'events': events,
+                'last_sequence': self._sequence,
+                'gap': gap
+            }
+    
+    def get_status(self) -> Dict[str, Any]:
+        """获取广播器状态"""
+        with self._condition:
+            return {
+                'last_sequence': self._sequence,
+                'backlog': len(self._events),
+                'oldest_sequence': self._events[0]['sequence'] if self._events else None
+            }
 
 class RecognitionManager:
     """识别结果管理器"""
@@ -63,6 +166,14 @@ class RecognitionManager:
         self.result_dir.mkdir(parents=True, exist_ok=True)
         self.history_dir.mkdir(parents=True, exist_ok=True)
         
+        # 历史记录分段日志（替代每条结果一个JSON文件），旧版历史文件一次性导入
+        self.history_log = SegmentedHistoryLog(self.history_dir)
+        legacy_segment = self._migrate_legacy_history()
+        
+        # 历史查询库（按摄像头/时间/牌面建索引），首次启用时从分段日志导入，之后导入新迁移的旧版历史
+        self.history_store = HistoryStore(self.result_dir / "history.db")
+        self._backfill_history_store(legacy_segment)
+        
         # 推送客户端状态
         self.push_client = None
         self.push_client_active = False
@@ -70,6 +181,38 @@ class RecognitionManager:
         # 加载推送配置
         self.push_config = self._load_push_config()
         
+        # 识别结果事件广播（供SSE和长轮询订阅）
+        self.event_broker = RecognitionEventBroker()
+        
+        # 最新结果常驻内存（整体最新 + 每个摄像头最新），读取不再访问磁盘
+        self._latest_lock = threading.Lock()
+        self._latest_result = None
+        self._latest_by_camera = {}
+        self._load_latest_from_disk()
+        
+        # 后台合并写盘：短时间内的多次更新只写一次最新结果文件
+        self.persist_delay = 0.2
+        self._persist_condition = threading.Condition()
+        self._pending_latest = None
+        self._pending_history = []
+        self._persist_busy = False
+        self._persist_stopped = False
+        self.persist_stats = {'latest_writes': 0, 'history_writes': 0, 'coalesced': 0, 'errors': 0}
+        self._writer_thread = threading.Thread(target=self._persistence_loop, name="recognition-writer", daemon=True)
+        self._writer_thread.start()
+        
+        # 存储统计增量维护（写入/删除时更新），后台定期与磁盘对账
+        self.stats_reconcile_interval = 300.0
+        self._storage_lock = threading.Lock()
+        self._camera_counts = {}
+        self._file_sizes = {'latest': 0, 'push_config': 0, 'history_db': 0, 'history_db_wal': 0, 'history_db_shm': 0}
+        self._last_reconciled_at = None
+        self._reconcile_storage_stats()
+        self._reconcile_stop = threading.Event()
+        self._reconcile_thread = threading.Thread(target=self._reconcile_loop, name="storage-reconciler", daemon=True)
+        self._reconcile_thread.start()
+        atexit.register(self.close)
+        
         log_info("识别结果管理器初始化完成", "RECOGNITION")
     
     def _load_push_config(self) -> Dict[str, Any]:
@@ -115,7 +258,10 @@ class RecognitionManager:
         """保存推送配置"""
         try:
             self.push_config["updated_at"] = get_timestamp()
-            return safe_json_dump(self.push_config, self.push_config_file)
+            saved = safe_json_dump(self.push_config, self.push_config_file)
+            if saved:
+                self._update_file_size('push_config', self.push_config_file)
+            return saved
         except Exception as e:
             log_error(f"保存推送配置失败: {e}", "RECOGNITION")
             return False
@@ -148,12 +294,12 @@ class RecognitionManager:
             # 标准化位置数据
             standardized_data = self._standardize_recognition_data(processed_data)
             
-            # 保存最新结果
-            if not self._save_latest_result(standardized_data):
-                return format_error_response("保存识别结果失败", "SAVE_FAILED")
+            # 更新内存中的最新结果，最新结果和历史记录交给后台线程写盘
+            self._store_latest_result(standardized_data)
+            self._schedule_persistence(standardized_data)
             
-            # 保存历史记录
-            self._save_history_result(standardized_data)
+            # 广播给实时订阅者
+            sequence = self.event_broker.publish(standardized_data)
             
             # 计算统计信息
             stats = self._calculate_recognition_stats(standardized_data)
@@ -167,6 +313,7 @@ class RecognitionManager:
             
             response_data = {
                 "stats": stats,
+                "sequence": sequence,
                 "received_at": standardized_data['received_at'],
                 "auto_push_result": push_result
             }
@@ -250,23 +397,259 @@ class RecognitionManager:
             log_error(f"标准化识别数据失败: {e}", "RECOGNITION")
             return data
     
+    def _load_latest_from_disk(self):
+        """启动时从磁盘恢复最新结果"""
+        try:
+            if self.latest_file.exists():
+                data = safe_json_load(self.latest_file)
+                if data:
+                    self._store_latest_result(data)
+        except Exception as e:
+            log_warning(f"恢复最新识别结果失败: {e}", "RECOGNITION")
+    
+    def _store_latest_result(self, data: Dict[str, Any]):
+        """更新内存中的最新结果"""
+        with self._latest_lock:
+            self._latest_result = data
+            camera_id = data.get('camera_id')
+            if camera_id:
+                self._latest_by_camera[camera_id] = data
+    
+    def _schedule_persistence(self, data: Dict[str, Any]):
+        """登记待写盘的结果并唤醒写盘线程"""
+        # 历史记录使用接收时间，保证写盘延迟不影响顺序
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]  # 包含毫秒
+        
+        with self._persist_condition:
+            if self._pending_latest is not None:
+                self.persist_stats['coalesced'] += 1
+            self._pending_latest = data
+            self._pending_history.append((timestamp, data))
+            self._persist_condition.notify_all()
+    
+    def _persistence_loop(self):
+        """写盘线程：等待更新，合并窗口结束后批量写入"""
+        while True:
+            with self._persist_condition:
+                while self._pending_latest is None and not self._pending_history and not self._persist_stopped:
+                    self._persist_condition.wait()
+                if self._persist_stopped and self._pending_latest is None and not self._pending_history:
+                    return
+                stopping = self._persist_stopped
+            
+            # 合并窗口：窗口内的后续更新只写最后一次的最新结果
+            if not stopping:
+                time.sleep(self.persist_delay)
+            
+            with self._persist_condition:
+                latest = self._pending_latest
+                history = self._pending_history
+                self._pending_latest = None
+                self._pending_history = []
+                self._persist_busy = True
+            
+            try:
+                if latest is not None:
+                    if self._save_latest_result(latest):
+                        self.persist_stats['latest_writes'] += 1
+                    else:
+                        self.persist_stats['errors'] += 1
+                
+                if history:
+                    written = self._save_history_results(history)
+                    self.persist_stats['history_writes'] += written
+                    self.persist_stats['errors'] += len(history) - written
+            finally:
+                with self._persist_condition:
+                    self._persist_busy = False
+                    self._persist_condition.notify_all()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        等待所有待写盘的结果写入完成
+        
+        Args:
+            timeout: 最长等待时间(秒)
+            
+        Returns:
+            是否在超时前全部写入
+        """
+        with self._persist_condition:
+            return self._persist_condition.wait_for(
+                lambda: self._pending_latest is None and not self._pending_history and not self._persist_busy,
+                timeout
+            )
+    
+    def close(self):
+        """写完剩余结果并停止写盘线程（进程退出时自动调用）"""
+        self._reconcile_stop.set()
+        
+        with self._persist_condition:
+            self._persist_stopped = True
+            self._persist_condition.notify_all()
+        
+        if self._writer_thread.is_alive():
+            self._writer_thread.join(timeout=5.0)
+        
+        self.history_log.close()
+        self.history_store.close()
+    
     def _save_latest_result(self, data: Dict[str, Any]) -> bool:
         """保存最新识别结果"""
         try:
-            return safe_json_dump(data, self.latest_file)
+            saved = safe_json_dump(data, self.latest_file)
+            if saved:
+                self._update_file_size('latest', self.latest_file)
+            return saved
         except Exception as e:
             log_error(f"保存最新结果失败: {e}", "RECOGNITION")
             return False
     
-    def _save_history_result(self, data: Dict[str, Any]) -> bool:
-        """保存历史识别结果"""
+    def _save_history_results(self, history: List[tuple]) -> int:
+        """
+        批量追加历史识别结果到分段日志
+        
+        Args:
+            history: [(接收时间戳, 识别结果), ...]
+            
+        Returns:
+            成功写入的记录数
+        """
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]  # 包含毫秒
-            history_file = self.history_dir / f"recognition_{timestamp}.json"
-            return safe_json_dump(data, history_file)
+            written = self.history_log.append_many([
+                {'logged_at': timestamp, 'data': data} for timestamp, data in history
+            ])
         except Exception as e:
             log_error(f"保存历史结果失败: {e}", "RECOGNITION")
-            return False
+            return 0
+        
+        # 查询库写入失败不影响分段日志（日志为主存储）
+        # 写入和计数在同一把锁内完成，对账不会在两者之间读到新行而重复计数
+        with self._storage_lock:
+            stored = self.history_store.insert_many([data for _, data in history])
+            # insert_many 为单个事务：要么全部写入，要么返回0
+            for _, data in (history if stored else []):
+                camera_id = str(data.get('camera_id', '') or '')
+                self._camera_counts[camera_id] = self._camera_counts.get(camera_id, 0) + 1
+        return written
+    
+    # ============ 存储统计 ============
+    
+    def _update_file_size(self, key: str, file_path: Path):
+        """写入文件后更新其大小计数"""
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            size = 0
+        with self._storage_lock:
+            self._file_sizes[key] = size
+    
+    def _reconcile_storage_stats(self):
+        """按磁盘和查询库实际情况校正存储统计"""
+        try:
+            drift = self.history_log.reconcile()
+            
+            db_path = self.history_store.db_path
+            for key, file_path in (('latest', self.latest_file), ('push_config', self.push_config_file),
+                                   ('history_db', db_path),
+                                   ('history_db_wal', db_path.with_name(db_path.name + '-wal')),
+                                   ('history_db_shm', db_path.with_name(db_path.name + '-shm'))):
+                self._update_file_size(key, file_path)
+            
+            # 与写入共用锁：计数快照和写入后的增量不会重叠
+            with self._storage_lock:
+                self._camera_counts = self.history_store.count_by_camera()
+                self._last_reconciled_at = get_timestamp()
+            
+            if drift['records_drift'] or drift['segments_drift']:
+                log_warning(
+                    f"存储统计已校正: 记录 {drift['records_drift']:+d}, 分段 {drift['segments_drift']:+d}",
+                    "RECOGNITION"
+                )
+        except Exception as e:
+            log_error(f"存储统计对账失败: {e}", "RECOGNITION")
+    
+    def _reconcile_loop(self):
+        """对账线程：定期校正存储统计"""
+        while not self._reconcile_stop.wait(self.stats_reconcile_interval):
+            self._reconcile_storage_stats()
+    
+    def _migrate_legacy_history(self) -> Optional[str]:
+        """
+        将旧版历史文件按接收时间顺序导入为一个分段，导入后删除旧文件
+        
+        Returns:
+            导入的分段名，没有旧文件、之前已导入或导入失败时返回None
+        """
+        try:
+            legacy_files = sorted(
+                (match.group(1), file_path)
+                for file_path in self.history_dir.glob("recognition_*.json")
+                for match in [LEGACY_HISTORY_PATTERN.match(file_path.name)] if match
+            )
+            if not legacy_files:
+                return None
+            
+            skipped = []
+            
+            def legacy_records():
+                for timestamp, file_path in legacy_files:
+                    data = safe_json_load(file_path)
+                    if isinstance(data, dict):
+                        yield {'logged_at': timestamp, 'data': data}
+                    else:
+                        skipped.append(file_path.name)
+            
+            # 分段以最早一条的时间命名，排在升级后新建的分段之前，保留策略按时间顺序删除
+            segment = self.history_log.import_segment(legacy_records(), legacy_files[0][0][:15])
+            
+            # 从最新的文件开始删除：中途中断时最早的文件仍在，下次启动得到同一分段名，不会重复导入
+            for _, file_path in reversed(legacy_files):
+                file_path.unlink(missing_ok=True)
+            
+            if segment is not None:
+                log_success(
+                    f"旧版历史文件已导入分段 {segment}: {len(legacy_files) - len(skipped)} 条记录"
+                    + (f"，{len(skipped)} 个文件无法读取已跳过" if skipped else ""),
+                    "RECOGNITION"
+                )
+            else:
+                log_info(f"已删除 {len(legacy_files)} 个旧版历史文件（之前已导入或没有可读取的记录）", "RECOGNITION")
+            return segment
+        except Exception as e:
+            log_error(f"导入旧版历史文件失败: {e}", "RECOGNITION")
+            return None
+    
+    def _backfill_history_store(self, legacy_segment: Optional[str] = None):
+        """
+        查询库为空时从分段日志导入已有历史记录；查询库已有记录时只导入本次迁移的旧版历史分段
+        
+        Args:
+            legacy_segment: 本次启动由旧版历史文件导入的分段名
+        """
+        try:
+            if self.history_store.count() > 0:
+                if legacy_segment is None:
+                    return
+                records = self.history_log.iter_records(segment=legacy_segment)
+            else:
+                records = self.history_log.iter_records()
+            
+            batch = []
+            imported = 0
+            for record in records:
+                data = record.get('data')
+                if isinstance(data, dict):
+                    batch.append(data)
+                if len(batch) >= 500:
+                    imported += self.history_store.insert_many(batch)
+                    batch = []
+            imported += self.history_store.insert_many(batch)
+            
+            if imported:
+                log_info(f"历史查询库导入了 {imported} 条记录", "RECOGNITION")
+        except Exception as e:
+            log_error(f"导入历史查询库失败: {e}", "RECOGNITION")
     
     def _calculate_recognition_stats(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """计算识别统计信息"""
@@ -361,28 +744,104 @@ class RecognitionManager:
             log_error(f"WebSocket推送异常: {e}", "RECOGNITION")
             return {"status": "error", "message": str(e)}
     
-    def get_latest_recognition(self) -> Dict[str, Any]:
+    def get_latest_recognition(self, camera_id: str = None) -> Dict[str, Any]:
         """
-        获取最新的识别结果
+        获取最新的识别结果（从内存读取）
+        
+        Args:
+            camera_id: 指定摄像头ID，默认返回所有摄像头中最新的一条
         
         Returns:
             最新识别结果
         """
         try:
-            if not self.latest_file.exists():
-                return self._get_empty_recognition_result()
+            with self._latest_lock:
+                if camera_id:
+                    recognition_data = self._latest_by_camera.get(camera_id)
+                else:
+                    recognition_data = self._latest_result
             
-            # 读取最新结果
-            recognition_data = safe_json_load(self.latest_file)
             if not recognition_data:
                 return self._get_empty_recognition_result()
             
-            return format_success_response("获取识别结果成功", data=recognition_data)
+            # 返回副本，调用方修改不影响内存中的结果
+            return format_success_response("获取识别结果成功", data=copy.deepcopy(recognition_data))
             
         except Exception as e:
             log_error(f"获取识别结果失败: {e}", "RECOGNITION")
             return format_error_response(f"获取识别结果失败: {str(e)}", "GET_ERROR")
     
+    def get_recognition_events(self, since: Optional[int] = None, camera_id: Optional[str] = None,
+                               timeout: float = 25.0) -> Dict[str, Any]:
+        """
+        长轮询获取识别结果事件
+        
+        Args:
+            since: 已收到的最后序号（None表示只等待新事件）
+            camera_id: 只返回指定摄像头的事件（可选）
+            timeout: 最长等待时间(秒)
+        
+        Returns:
+            事件列表响应
+        """
+        try:
+            result = self.event_broker.wait_for_events(since, camera_id, timeout)
+            return format_success_response(
+                f"获取到 {len(result['events'])} 个识别事件",
+                data=result
+            )
+        except Exception as e:
+            log_error(f"获取识别事件失败: {e}", "RECOGNITION")
+            return format_error_response(f"获取识别事件失败: {str(e)}", "GET_EVENTS_ERROR")
+    
+    def query_history(self, camera_id: Optional[str] = None, start: Optional[str] = None,
+                      end: Optional[str] = None, card: Optional[str] = None,
+                      page: int = 1, page_size: int = 50) -> Dict[str, Any]:
+        """
+        按摄像头、时间范围、牌面分页查询历史识别结果（最新在前）
+        
+        Args:
+            camera_id: 摄像头ID（可选）
+            start: 起始时间，ISO时间或时间戳(秒)（可选）
+            end: 结束时间，ISO时间或时间戳(秒)（可选）
+            card: 牌面，"花色:点数"（如 hearts:A）或只给点数（可选）
+            page: 页码（从1开始）
+            page_size: 每页条数
+        
+        Returns:
+            查询结果响应
+        """
+        try:
+            start_ts = parse_time(start)
+            end_ts = parse_time(end)
+        except ValueError as e:
+            return format_error_response(f"时间格式错误: {str(e)}", "INVALID_TIME")
+        
+        try:
+            # 先写完待写盘的记录，保证刚收到的结果可查
+            self.flush()
+            result = self.history_store.query(camera_id, start_ts, end_ts, card, page, page_size)
+            return format_success_response(
+                f"查询到 {result['total']} 条历史记录",
+                data=result
+            )
+        except Exception as e:
+            log_error(f"查询历史记录失败: {e}", "RECOGNITION")
+            return format_error_response(f"查询历史记录失败: {str(e)}", "QUERY_HISTORY_ERROR")
+    
+    def iter_history(self, camera_id: Optional[str] = None, start: Optional[str] = None,
+                     end: Optional[str] = None, card: Optional[str] = None):
+        """
+        按时间顺序逐条遍历历史识别结果（用于流式导出）
+        
+        Raises:
+            ValueError: 时间格式错误
+        """
+        start_ts = parse_time(start)
+        end_ts = parse_time(end)
+        self.flush()
+        return self.history_store.iter_query(camera_id, start_ts, end_ts, card)
+    
     def _get_empty_recognition_result(self) -> Dict[str, Any]:
         """获取默认的空识别结果"""
         empty_positions = {}
@@ -500,34 +959,51 @@ class RecognitionManager:
     def get_system_statistics(self) -> Dict[str, Any]:
         """获取系统统计信息"""
         try:
-            # 统计历史记录数量
-            history_count = 0
-            if self.history_dir.exists():
-                history_count = len(list(self.history_dir.glob("recognition_*.json")))
-            
-            # 获取最新结果状态
-            latest_exists = self.latest_file.exists()
-            latest_size = self.latest_file.stat().st_size if latest_exists else 0
-            
-            # 计算目录大小
-            total_size = 0
-            if self.result_dir.exists():
-                for file_path in self.result_dir.rglob("*"):
-                    if file_path.is_file():
-                        total_size += file_path.stat().st_size
+            # 历史记录统计（增量计数，不访问磁盘）
+            history_stats = self.history_log.get_stats()
+            history_count = history_stats['records']
+            
+            with self._storage_lock:
+                latest_size = self._file_sizes['latest']
+                push_config_size = self._file_sizes['push_config']
+                db_sizes = [self._file_sizes[key] for key in ('history_db', 'history_db_wal', 'history_db_shm')]
+                camera_counts = dict(self._camera_counts)
+                last_reconciled_at = self._last_reconciled_at
+            latest_exists = latest_size > 0
+            
+            # 存储大小 = 历史分段 + 历史查询库（含WAL文件） + 最新结果 + 推送配置
+            total_size = history_stats['total_bytes'] + sum(db_sizes) + latest_size + push_config_size
+            
+            with self._latest_lock:
+                cameras_in_memory = sorted(self._latest_by_camera.keys())
+            with self._persist_condition:
+                pending_writes = len(self._pending_history)
             
             stats_data = {
                 "recognition": {
                     "total_recognitions": history_count,
                     "latest_result_exists": latest_exists,
-                    "latest_result_size": latest_size
+                    "latest_result_size": latest_size,
+                    "cameras_in_memory": cameras_in_memory,
+                    "per_camera": camera_counts
+                },
+                "persistence": {
+                    "pending_writes": pending_writes,
+                    "coalesce_delay": self.persist_delay,
+                    **self.persist_stats
                 },
                 "storage": {
                     "result_directory": str(self.result_dir),
                     "history_directory": str(self.history_dir),
-                    "total_files": history_count + (1 if latest_exists else 0),
+                    "history_segments": history_stats['segments'],
+                    "active_segment": history_stats['active_segment'],
+                    "history_db_size": sum(db_sizes),
+                    "total_files": (history_stats['segments'] * 2 + sum(1 for size in db_sizes if size > 0)
+                                    + (1 if latest_exists else 0) + (1 if push_config_size > 0 else 0)),
                     "total_size_bytes": total_size,
-                    "total_size_mb": round(total_size / (1024 * 1024), 2)
+                    "total_size_mb": round(total_size / (1024 * 1024), 2),
+                    "last_reconciled_at": last_reconciled_at,
+                    "reconcile_interval": self.stats_reconcile_interval
                 },
                 "push_config": {
                     "websocket_enabled": self.push_config.get("websocket", {}).get("enabled", False),
@@ -548,33 +1024,32 @@ class RecognitionManager:
             return format_error_response(f"获取系统统计失败: {str(e)}", "GET_STATS_ERROR")
     
     def cleanup_old_history(self, keep_count: int = 100) -> Dict[str, Any]:
-        """清理老的历史记录"""
+        """
+        清理老的历史记录（按整段删除，删除后至少保留 keep_count 条）
+        
+        Args:
+            keep_count: 至少保留的记录数
+        """
         try:
-            if not self.history_dir.exists():
-                return format_success_response("历史目录不存在，无需清理", data={"deleted_count": 0})
-            
-            # 获取所有历史文件，按时间排序
-            history_files = list(self.history_dir.glob("recognition_*.json"))
-            history_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+            # 先写完待写盘的记录，保证保留数量准确
+            self.flush()
             
-            # 删除超出保留数量的文件
-            deleted_count = 0
-            files_to_delete = history_files[keep_count:]
+            result = self.history_log.cleanup(keep_records=keep_count)
+            with self._storage_lock:
+                self.history_store.trim(result['remaining_records'])
+                self._camera_counts = self.history_store.count_by_camera()
             
-            for file_path in files_to_delete:
-                try:
-                    file_path.unlink()
-                    deleted_count += 1
-                except OSError as e:
-                    log_error(f"删除历史文件失败 {file_path}: {e}", "RECOGNITION")
-            
-            log_success(f"清理历史记录完成，删除了 {deleted_count} 个文件", "RECOGNITION")
+            log_success(
+                f"清理历史记录完成，删除了 {result['deleted_segments']} 个分段 ({result['deleted_records']} 条记录)",
+                "RECOGNITION"
+            )
             
             return format_success_response(
-                f"清理历史记录成功，删除了 {deleted_count} 个文件",
+                f"清理历史记录成功，删除了 {result['deleted_records']} 条记录",
                 data={
-                    "deleted_count": deleted_count,
-                    "remaining_count": len(history_files) - deleted_count,
+                    "deleted_count": result['deleted_records'],
+                    "deleted_segments": result['deleted_segments'],
+                    "remaining_count": result['remaining_records'],
                     "keep_count": keep_count
                 }
             )
@@ -591,9 +1066,29 @@ def receive_recognition_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """接收识别结果数据"""
     return recognition_manager.receive_recognition_data(data)
 
-def get_latest_recognition() -> Dict[str, Any]:
+def get_latest_recognition(camera_id: str = None) -> Dict[str, Any]:
     """获取最新识别结果"""
-    return recognition_manager.get_latest_recognition()
+    return recognition_manager.get_latest_recognition(camera_id)
+
+def flush_recognition_results(timeout: float = 5.0) -> bool:
+    """等待识别结果写盘完成"""
+    return recognition_manager.flush(timeout)
+
+def get_recognition_events(since: Optional[int] = None, camera_id: Optional[str] = None,
+                           timeout: float = 25.0) -> Dict[str, Any]:
+    """长轮询获取识别结果事件"""
+    return recognition_manager.get_recognition_events(since, camera_id, timeout)
+
+def query_history(camera_id: Optional[str] = None, start: Optional[str] = None,
+                  end: Optional[str] = None, card: Optional[str] = None,
+                  page: int = 1, page_size: int = 50) -> Dict[str, Any]:
+    """分页查询历史识别结果"""
+    return recognition_manager.query_history(camera_id, start, end, card, page, page_size)
+
+def iter_history(camera_id: Optional[str] = None, start: Optional[str] = None,
+                 end: Optional[str] = None, card: Optional[str] = None):
+    """逐条遍历历史识别结果"""
+    return recognition_manager.iter_history(camera_id, start, end, card)
 
 def get_push_config() -> Dict[str, Any]:
     """获取推送配置"""
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扑克牌存在检测器 - 在识别引擎之前快速判断位置上是否有牌
+功能:
+1. 白色区域占比：牌面为白色，桌布为深色/彩色，占比高即判定有牌
+2. 空桌背景模型：每个摄像头每个标记位置保留空桌时的颜色直方图，只由识别引擎确认无牌的画面建立和EMA更新
+3. 与空桌背景颜色分布接近且白色占比低的位置判定为空位，跳过YOLO/OCR/OpenCV识别；尚无背景时交给识别引擎
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+import cv2
+import numpy as np
+
+def setup_project_paths():
+    """设置项目路径"""
+    current_file = Path(__file__).resolve()
+    project_root = current_file
+    while project_root.parent != project_root:
+        if (project_root / "main.py").exists():
+            break
+        project_root = project_root.parent
+    
+    project_root_str = str(project_root)
+    if project_root_str not in sys.path:
+        sys.path.insert(0, project_root_str)
+    
+    return project_root
+
+PROJECT_ROOT = setup_project_paths()
+
+# 存在检测默认配置（可在 camera.json 的 system.card_presence 中覆盖）
+DEFAULT_PRESENCE_CONFIG = {
+    'enabled': True,
+    'analysis_size': 64,         # 分析前缩小到的边长（像素）
+    'white_min_value': 170,      # 白色像素最低亮度 V（0-255）
+    'white_max_saturation': 60,  # 白色像素最高饱和度 S（0-255）
+    'min_white_ratio': 0.12,     # 白色占比不低于该值判定有牌
+    'max_background_distance': 0.35,  # 与空桌背景直方图的巴氏距离超过该值视为不确定（交给识别引擎）
+    'background_alpha': 0.1      # 确认空位时背景直方图的EMA更新系数
+}
+
+# 色相-饱和度直方图分箱
+HIST_BINS = [16, 8]
+HIST_RANGES = [0, 180, 0, 256]
+
+class CardPresenceDetector:
+    """扑克牌存在检测器"""
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """初始化检测器"""
+        self.config = DEFAULT_PRESENCE_CONFIG.copy()
+        if config:
+            self.config.update(config)
+        
+        self._backgrounds = {}  # {(摄像头ID, 位置): {'region': 裁剪矩形, 'hist': 空桌直方图}}
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'present': 0,
+            'empty': 0,
+            'uncertain': 0
+        }
+    
+    def _analyze(self, image) -> Optional[Dict[str, Any]]:
+        """计算白色占比和颜色直方图"""
+        if isinstance(image, (str, Path)):
+            image = cv2.imread(str(image))
+        if image is None or image.size == 0:
+            return None
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        
+        size = int(self.config['analysis_size'])
+        small = cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        
+        white = (hsv[:, :, 2] >= self.config['white_min_value']) & (hsv[:, :, 1] <= self.config['white_max_saturation'])
+        
+        hist = cv2.calcHist([hsv], [0, 1], None, HIST_BINS, HIST_RANGES)
+        cv2.normalize(hist, hist, alpha=1.0, norm_type=cv2.NORM_L1)
+        
+        return {'white_ratio': float(np.count_nonzero(white)) / white.size, 'hist': hist}
+    
+    def _current_region(self, camera_id: str, position: str) -> Optional[tuple]:
+        """标记位置当前的裁剪矩形（标记移动或调整大小后与背景记录的不同，旧背景作废）"""
+        try:
+            from src.core.camera_config_store import get_crop_rect
+            return get_crop_rect(camera_id, position)
+        except Exception:
+            return None
+    
+    def _get_background(self, key: tuple, region: Optional[tuple]):
+        """获取与当前裁剪矩形一致的背景直方图，矩形已变化时丢弃旧背景（调用方持有锁）"""
+        entry = self._backgrounds.get(key)
+        if entry is None:
+            return None
+        if entry['region'] != region:
+            del self._backgrounds[key]
+            return None
+        return entry['hist']
+    
+    def check(self, camera_id: str, position: str, image) -> Dict[str, Any]:
+        """
+        判断位置上是否有牌
+        
+        Args:
+            camera_id: 摄像头ID
+            position: 位置名称
+            image: 区域图片 numpy数组(BGR) 或图片路径
+        
+        Returns:
+            {'present': 是否需要识别, 'state': 'present'/'empty'/'uncertain', 'white_ratio', 'background_distance'}
+            图片不可用或尚无空桌背景时判定为 uncertain（交给识别引擎处理）
+        """
+        analysis = self._analyze(image)
+        if analysis is None:
+            return {'present': True, 'state': 'uncertain', 'white_ratio': None, 'background_distance': None}
+        
+        white_ratio = analysis['white_ratio']
+        key = (camera_id, position)
+        region = self._current_region(camera_id, position)
+        
+        with self._lock:
+            background = self._get_background(key, region)
+            distance = None
+            if background is not None:
+                distance = float(cv2.compareHist(background, analysis['hist'], cv2.HISTCMP_BHATTACHARYYA))
+            
+            if white_ratio >= self.config['min_white_ratio']:
+                state = 'present'
+            elif distance is None or distance > self.config['max_background_distance']:
+                # 没有空桌背景，或颜色分布与空桌不同但白色不多（遮挡、牌背、光照变化），不跳过识别
+                state = 'uncertain'
+            else:
+                state = 'empty'
+            
+            self.stats[state] += 1
+        
+        return {
+            'present': state != 'empty',
+            'state': state,
+            'white_ratio': round(white_ratio, 3),
+            'background_distance': round(distance, 3) if distance is not None else None
+        }
+    
+    def learn_empty(self, camera_id: str, position: str, image) -> bool:
+        """
+        将识别引擎确认无牌的位置画面记为空桌背景（首次建立背景，之后按EMA更新，跟随光照变化）
+        
+        Args:
+            camera_id: 摄像头ID
+            position: 位置名称
+            image: 区域图片 numpy数组(BGR) 或图片路径
+        
+        Returns:
+            是否更新了背景（图片不可用或白色占比达到有牌阈值时不更新）
+        """
+        analysis = self._analyze(image)
+        if analysis is None or analysis['white_ratio'] >= self.config['min_white_ratio']:
+            return False
+        
+        key = (camera_id, position)
+        region = self._current_region(camera_id, position)
+        with self._lock:
+            background = self._get_background(key, region)
+            if background is None:
+                hist = analysis['hist']
+            else:
+                alpha = self.config['background_alpha']
+                hist = cv2.addWeighted(background, 1.0 - alpha, analysis['hist'], alpha, 0)
+            self._backgrounds[key] = {'region': region, 'hist': hist}
+        return True
+    
+    def reset(self, camera_id: Optional[str] = None):
+        """清除背景模型（指定摄像头或全部）；标记位置调整后旧背景会自动作废，无需调用"""
+        with self._lock:
+            if camera_id is None:
+                self._backgrounds.clear()
+            else:
+                for key in [key for key in self._backgrounds if key[0] == camera_id]:
+                    del self._backgrounds[key]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取检测统计"""
+        with self._lock:
+            total = self.stats['present'] + self.stats['empty'] + self.stats['uncertain']
+            return {
+                'config': self.config.copy(),
+                'backgrounds': len(self._backgrounds),
+                'present': self.stats['present'],
+                'empty': self.stats['empty'],
+                'uncertain': self.stats['uncertain'],
+                'skip_rate': round(self.stats['empty'] / total * 100, 1) if total > 0 else 0.0
+            }
+
+def load_presence_config() -> Dict[str, Any]:
+    """从 camera.json 的 system.card_presence 读取配置"""
+    try:
+        from src.core.camera_config_store import get_camera_config_store
+        return get_camera_config_store().get_section('card_presence')
+    except Exception as e:
+        print(f"⚠️  读取存在检测配置失败: {e}")
+        return {}
+
+# ============ 供其他模块调用的函数接口 ============
+
+# 全局存在检测器（首次使用时创建）
+_presence_detector = None
+_presence_detector_lock = threading.Lock()
+
+def get_presence_detector() -> CardPresenceDetector:
+    """获取全局存在检测器"""
+    global _presence_detector
+    if _presence_detector is None:
+        with _presence_detector_lock:
+            if _presence_detector is None:
+                _presence_detector = CardPresenceDetector(load_presence_config())
+    return _presence_detector
+
+def reset_presence_detector(camera_id: Optional[str] = None):
+    """清除空桌背景模型"""
+    get_presence_detector().reset(camera_id)
+
+def get_presence_stats() -> Dict[str, Any]:
+    """获取存在检测统计"""
+    return get_presence_detector().get_stats()
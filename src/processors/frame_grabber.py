@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RTSP常驻抓帧器 - 每个启用的摄像头保持一条长连接，持续解码到最新帧槽位
+功能:
+1. 后台线程持续读取RTSP流，只保留最新一帧
+2. 断流自动重连
+3. 拍照时直接取最新帧（毫秒级），无需每次启动ffmpeg
+用法: python src/processors/frame_grabber.py --camera 001
+或者: from frame_grabber import start_frame_grabbers, get_latest_frame
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+def setup_project_paths():
+    """设置项目路径"""
+    current_file = Path(__file__).resolve()
+    project_root = current_file
+    while project_root.parent != project_root:
+        if (project_root / "main.py").exists():
+            break
+        project_root = project_root.parent
+    
+    project_root_str = str(project_root)
+    if project_root_str not in sys.path:
+        sys.path.insert(0, project_root_str)
+    
+    return project_root
+
+PROJECT_ROOT = setup_project_paths()
+
+# 抓帧器默认配置（可在 camera.json 的 system.frame_grabber 中覆盖）
+DEFAULT_GRABBER_CONFIG = {
+    'enabled': True,           # 启用常驻抓帧
+    'max_frame_age': 2.0,      # 最新帧的最大有效时长(秒)，超过则视为过期
+    'reconnect_delay': 3.0,    # 断流后重连间隔(秒)
+    'first_frame_timeout': 10.0  # 启动后等待首帧的超时时间(秒)
+}
+
+class RTSPFrameGrabber(threading.Thread):
+    """单个摄像头的RTSP常驻抓帧线程"""
+    
+    def __init__(self, camera_id: str, rtsp_url: str, reconnect_delay: float = 3.0):
+        """
+        初始化抓帧线程
+        
+        Args:
+            camera_id: 摄像头ID
+            rtsp_url: RTSP地址
+            reconnect_delay: 断流后重连间隔(秒)
+        """
+        super().__init__(name=f"frame-grabber-{camera_id}", daemon=True)
+        self.camera_id = camera_id
+        self.rtsp_url = rtsp_url
+        self.reconnect_delay = reconnect_delay
+        
+        self._frame = None
+        self._frame_time = 0.0
+        self._frame_lock = threading.Lock()
+        self._first_frame = threading.Event()
+        self._stop_event = threading.Event()
+        
+        self.stats = {
+            'frames': 0,
+            'connects': 0,
+            'errors': 0,
+            'last_error': ''
+        }
+    
+    def _open_capture(self):
+        """打开RTSP流"""
+        import cv2
+        
+        # 与ffmpeg拍照保持一致，使用TCP传输
+        os.environ.setdefault('OPENCV_FFMPEG_CAPTURE_OPTIONS', 'rtsp_transport;tcp')
+        
+        capture = cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG)
+        # 尽量减少缓冲，保证读到的是最新画面
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return capture
+    
+    def run(self):
+        """抓帧主循环：持续读取，断流后重连"""
+        while not self._stop_event.is_set():
+            capture = None
+            try:
+                capture = self._open_capture()
+                if not capture.isOpened():
+                    raise ConnectionError("RTSP流打开失败")
+                
+                self.stats['connects'] += 1
+                
+                while not self._stop_event.is_set():
+                    ok, frame = capture.read()
+                    if not ok or frame is None:
+                        raise ConnectionError("RTSP流读取失败")
+                    
+                    with self._frame_lock:
+                        self._frame = frame
+                        self._frame_time = time.time()
+                    
+                    self.stats['frames'] += 1
+                    self._first_frame.set()
+            
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.stats['last_error'] = str(e)
+            finally:
+                if capture is not None:
+                    capture.release()
+            
+            # 重连等待（可被停止信号打断）
+            self._stop_event.wait(self.reconnect_delay)
+    
+    def get_frame(self, max_age: Optional[float] = None):
+        """
+        获取最新帧
+        
+        Args:
+            max_age: 最大有效时长(秒)，None表示不检查
+        
+        Returns:
+            (帧数组副本, 帧时间戳)，无可用帧或已过期时返回 (None, 时间戳)
+        """
+        with self._frame_lock:
+            frame = self._frame
+            frame_time = self._frame_time
+        
+        if frame is None:
+            return None, 0.0
+        
+        if max_age is not None and time.time() - frame_time > max_age:
+            return None, frame_time
+        
+        # 返回副本，避免调用方修改共享帧
+        return frame.copy(), frame_time
+    
+    def wait_first_frame(self, timeout: float) -> bool:
+        """等待首帧到达"""
+        return self._first_frame.wait(timeout)
+    
+    def stop(self):
+        """通知线程停止"""
+        self._stop_event.set()
+    
+    def get_status(self) -> Dict[str, Any]:
+        """获取抓帧器状态"""
+        with self._frame_lock:
+            frame_time = self._frame_time
+        
+        return {
+            'camera_id': self.camera_id,
+            'alive': self.is_alive(),
+            'has_frame': frame_time > 0,
+            'frame_age': round(time.time() - frame_time, 3) if frame_time > 0 else None,
+            'stats': self.stats.copy()
+        }
+
+class FrameGrabberManager:
+    """抓帧器管理器 - 管理所有启用摄像头的常驻抓帧线程"""
+    
+    def __init__(self):
+        """初始化管理器"""
+        self.config = DEFAULT_GRABBER_CONFIG.copy()
+        self._grabbers = {}
+        self._lock = threading.Lock()
+    
+    def _load_config(self) -> List[Dict[str, Any]]:
+        """读取 camera.json，更新抓帧器配置并返回摄像头列表"""
+        from src.core.camera_config_store import get_camera_config_store
+        store = get_camera_config_store()
+        
+        self.config = DEFAULT_GRABBER_CONFIG.copy()
+        self.config.update(store.get_section('frame_grabber'))
+        return store.get_cameras()
+    
+    def start(self, camera_ids: Optional[List[str]] = None, wait_first_frame: bool = True) -> Dict[str, Any]:
+        """
+        为启用的摄像头启动抓帧线程
+        
+        Args:
+            camera_ids: 指定摄像头ID列表，默认为所有启用的摄像头
+            wait_first_frame: 是否等待首帧到达
+        
+        Returns:
+            启动结果
+        """
+        try:
+            from src.processors.photo_controller import build_rtsp_url
+            
+            cameras = self._load_config()
+            if not self.config.get('enabled', True):
+                return {'success': False, 'message': '常驻抓帧已禁用', 'started': []}
+            
+            started = []
+            with self._lock:
+                for camera in cameras:
+                    camera_id = camera.get('id')
+                    if not camera.get('enabled', True):
+                        continue
+                    if camera_ids is not None and camera_id not in camera_ids:
+                        continue
+                    if camera_id in self._grabbers and self._grabbers[camera_id].is_alive():
+                        continue
+                    
+                    grabber = RTSPFrameGrabber(camera_id, build_rtsp_url(camera), self.config['reconnect_delay'])
+                    grabber.start()
+                    self._grabbers[camera_id] = grabber
+                    started.append(camera_id)
+            
+            # 等待首帧（各线程并行连接，总等待不超过一个超时周期）
+            ready = []
+            if wait_first_frame:
+                deadline = time.time() + self.config['first_frame_timeout']
+                for camera_id in started:
+                    if self._grabbers[camera_id].wait_first_frame(max(0.0, deadline - time.time())):
+                        ready.append(camera_id)
+            
+            return {
+                'success': True,
+                'message': f"已启动 {len(started)} 个抓帧器",
+                'started': started,
+                'ready': ready
+            }
+        
+        except Exception as e:
+            return {'success': False, 'message': f"启动抓帧器失败: {str(e)}", 'started': []}
+    
+    def stop(self, timeout: float = 3.0):
+        """停止所有抓帧线程"""
+        with self._lock:
+            grabbers = list(self._grabbers.values())
+            self._grabbers.clear()
+        
+        for grabber in grabbers:
+            grabber.stop()
+        for grabber in grabbers:
+            grabber.join(timeout)
+    
+    def get_latest_frame(self, camera_id: str, max_age: Optional[float] = None):
+        """
+        获取摄像头的最新帧
+        
+        Args:
+            camera_id: 摄像头ID
+            max_age: 最大有效时长(秒)，默认使用配置值
+        
+        Returns:
+            帧数组(BGR)，无抓帧器、无帧或帧过期时返回None
+        """
+        grabber = self._grabbers.get(camera_id)
+        if grabber is None or not grabber.is_alive():
+            return None
+        
+        if max_age is None:
+            max_age = self.config['max_frame_age']
+        
+        frame, _ = grabber.get_frame(max_age)
+        return frame
+    
+    def get_status(self) -> Dict[str, Any]:
+        """获取所有抓帧器状态"""
+        with self._lock:
+            grabbers = list(self._grabbers.values())
+        
+        return {
+            'config': self.config.copy(),
+            'grabbers': {grabber.camera_id: grabber.get_status() for grabber in grabbers}
+        }
+
+# ============ 供其他模块调用的函数接口 ============
+
+# 全局抓帧器管理器
+frame_grabber_manager = FrameGrabberManager()
+
+def start_frame_grabbers(camera_ids: Optional[List[str]] = None, wait_first_frame: bool = True) -> Dict[str, Any]:
+    """启动常驻抓帧器"""
+    return frame_grabber_manager.start(camera_ids, wait_first_frame)
+
+def stop_frame_grabbers():
+    """停止所有常驻抓帧器"""
+    frame_grabber_manager.stop()
+
+def get_latest_frame(camera_id: str, max_age: Optional[float] = None):
+    """获取摄像头的最新帧，不可用时返回None"""
+    return frame_grabber_manager.get_latest_frame(camera_id, max_age)
+
+def get_frame_grabber_status() -> Dict[str, Any]:
+    """获取抓帧器状态"""
+    return frame_grabber_manager.get_status()
+
+# ============ 命令行测试 ============
+
+def main():
+    """主函数 - 启动指定摄像头的抓帧器并测量取帧耗时"""
+    parser = argparse.ArgumentParser(description='RTSP常驻抓帧器测试')
+    parser.add_argument('--camera', type=str, required=True, help='摄像头ID (如: 001)')
+    parser.add_argument('--count', type=int, default=5, help='取帧次数 (默认: 5)')
+    args = parser.parse_args()
+    
+    print("🎥 RTSP常驻抓帧器测试")
+    print("=" * 50)
+    
+    start_result = start_frame_grabbers([args.camera])
+    print(f"启动结果: {start_result['message']}")
+    
+    if args.camera not in start_result.get('ready', []):
+        print(f"❌ 摄像头 {args.camera} 未能在超时时间内取到首帧")
+        stop_frame_grabbers()
+        sys.exit(1)
+    
+    for i in range(args.count):
+        start_time = time.time()
+        frame = get_latest_frame(args.camera)
+        duration = (time.time() - start_time) * 1000
+        
+        if frame is not None:
+            print(f"✅ 第{i + 1}次取帧: {frame.shape[1]}×{frame.shape[0]} ({duration:.2f}ms)")
+        else:
+            print(f"❌ 第{i + 1}次取帧失败")
+        time.sleep(1)
+    
+    print(f"\n📊 状态: {json.dumps(get_frame_grabber_status()['grabbers'], ensure_ascii=False, indent=2)}")
+    stop_frame_grabbers()
+
+if __name__ == "__main__":
+    main()
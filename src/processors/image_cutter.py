@@ -10,9 +10,10 @@ import sys
 import os
 import json
 import cv2
+import threading
 import numpy as np
 from pathlib import Path
-from PIL import Image
+from typing import Optional
 
 def get_project_root():
     """获取项目根目录"""
@@ -27,39 +28,45 @@ def get_project_root():
     
     return project_root
 
-def load_camera_config(camera_id):
+if str(get_project_root()) not in sys.path:
+    sys.path.insert(0, str(get_project_root()))
+
+from src.core.camera_config_store import get_camera_config_store, get_camera_profile, select_valid_marks
+
+def load_camera_profile(camera_id):
     """
-    加载指定摄像头的配置
+    加载指定摄像头的预计算配置（共享配置缓存，含有效标记和裁剪矩形）
     
     Args:
         camera_id: 摄像头ID (如 "001")
         
     Returns:
-        dict: 摄像头配置，如果找不到返回None
+        dict: 预计算配置，如果找不到返回None
     """
     try:
-        project_root = get_project_root()
-        config_path = project_root / "src" / "config" / "camera.json"
-        
-        if not config_path.exists():
-            print(f"❌ 配置文件不存在: {config_path}")
-            return None
-        
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # 查找指定摄像头
-        for camera in config.get('cameras', []):
-            if camera.get('id') == camera_id:
-                return camera
-        
-        print(f"❌ 找不到摄像头ID: {camera_id}")
-        return None
+        profile = get_camera_profile(camera_id)
+        if profile is None:
+            print(f"❌ 找不到摄像头ID: {camera_id}")
+        return profile
         
     except Exception as e:
         print(f"❌ 加载配置失败: {e}")
         return None
 
+def load_camera_config(camera_id):
+    """
+    加载指定摄像头的配置
+    
+    Args:
+        camera_id: 摄像头ID (如 "001")
+        
+    Returns:
+        dict: 摄像头配置（副本），如果找不到返回None
+    """
+    if load_camera_profile(camera_id) is None:
+        return None
+    return get_camera_config_store().get_camera(camera_id)
+
 def extract_camera_id_from_filename(image_path):
     """
     从文件名中提取摄像头ID
@@ -91,25 +98,10 @@ def get_valid_marks(camera_config):
     Returns:
         dict: 有效标记位置 {position_name: position_data}
     """
-    mark_positions = camera_config.get('mark_positions', {})
-    valid_marks = {}
+    valid_marks = select_valid_marks(camera_config)
     
-    # 标准的6个位置
-    positions = ['zhuang_1', 'zhuang_2', 'zhuang_3', 'xian_1', 'xian_2', 'xian_3']
-    
-    for position in positions:
-        if position in mark_positions:
-            position_data = mark_positions[position]
-            
-            # 检查标记是否有效（已标记且坐标有效）
-            if (position_data.get('marked', False) and 
-                position_data.get('x', 0) > 0 and 
-                position_data.get('y', 0) > 0 and
-                position_data.get('width', 0) > 0 and 
-                position_data.get('height', 0) > 0):
-                
-                valid_marks[position] = position_data
-                print(f"✅ 找到有效标记: {position} - 中心({position_data['x']}, {position_data['y']}) 尺寸({position_data['width']}×{position_data['height']})")
+    for position, position_data in valid_marks.items():
+        print(f"✅ 找到有效标记: {position} - 中心({position_data['x']}, {position_data['y']}) 尺寸({position_data['width']}×{position_data['height']})")
     
     return valid_marks
 
@@ -131,123 +123,167 @@ def should_rotate_image(position_name: str, width: int, height: int) -> bool:
     
     return position_name in horizontal_positions and is_horizontal
 
-def rotate_image_to_vertical(pil_image, position_name: str):
+# ============ ROI裁剪计划（每个摄像头编译一次，按numpy视图裁剪） ============
+
+# 已编译的裁剪计划 {(摄像头ID, 画面高, 画面宽): (摄像头预计算配置, 计划)}
+_roi_plans = {}
+_roi_plans_lock = threading.Lock()
+
+def compile_roi_plan(profile: dict, frame_width: int, frame_height: int) -> list:
     """
-    将横图旋转为竖图
+    根据标记位置编译裁剪计划
     
     Args:
-        pil_image: PIL图像对象
-        position_name: 位置名称
+        profile: 摄像头预计算配置（含裁剪矩形）
+        frame_width: 画面宽度
+        frame_height: 画面高度
         
     Returns:
-        PIL.Image: 旋转后的图像
+        list: [{"position", "top", "bottom", "left", "right", "rotate", "corner_height", "corner_width",
+                "rank_box", "suit_box"}, ...]，裁剪区域超出画面的位置不在计划中；
+              rank_box/suit_box 为旋转后裁剪图内的 (top, bottom, left, right)，未配置角标区域时为None
     """
-    try:
-        width, height = pil_image.size
-        
-        if should_rotate_image(position_name, width, height):
-            # 逆时针旋转90度，使横图变竖图
-            rotated_image = pil_image.rotate(90, expand=True)
-            new_width, new_height = rotated_image.size
-            
-            print(f"  ↻ 横图旋转: {width}×{height} -> {new_width}×{new_height}")
-            return rotated_image
-        
-        return pil_image
-        
-    except Exception as e:
-        print(f"❌ 图片旋转失败: {e}")
-        return pil_image
+    plan = []
+    corner_rois = profile.get('corner_rois', {})
+    for position_name, (left, top, right, bottom) in profile['crop_rects'].items():
+        # 限制在画面范围内
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(right, frame_width), min(bottom, frame_height)
+        if right <= left or bottom <= top:
+            continue
+        
+        width, height = right - left, bottom - top
+        rotate = should_rotate_image(position_name, width, height)
+        # 左上角1/4按旋转后的尺寸计算
+        out_height, out_width = (width, height) if rotate else (height, width)
+        rois = corner_rois.get(position_name)
+        
+        plan.append({
+            "position": position_name,
+            "top": top,
+            "bottom": bottom,
+            "left": left,
+            "right": right,
+            "rotate": rotate,
+            "corner_height": out_height // 2,
+            "corner_width": out_width // 2,
+            "rank_box": _corner_box(rois['rank'], out_width, out_height) if rois else None,
+            "suit_box": _corner_box(rois['suit'], out_width, out_height) if rois else None
+        })
+    return plan
 
-def crop_region(image, position_name, position_data):
+def _corner_box(fractions: tuple, width: int, height: int) -> tuple:
+    """角标区域比例转换为裁剪图内的像素范围 (top, bottom, left, right)，至少1像素"""
+    left, top, right, bottom = fractions
+    box_left = min(int(left * width), width - 1)
+    box_top = min(int(top * height), height - 1)
+    box_right = max(int(round(right * width)), box_left + 1)
+    box_bottom = max(int(round(bottom * height)), box_top + 1)
+    return (box_top, box_bottom, box_left, box_right)
+
+def _corner_view(main: np.ndarray, box: Optional[tuple]) -> Optional[np.ndarray]:
+    """按像素范围切出角标视图"""
+    if box is None:
+        return None
+    return main[box[0]:box[1], box[2]:box[3]]
+
+def cut_corner_views(camera_id: str, position_name: str, main: np.ndarray) -> tuple:
     """
-    裁剪指定区域（支持智能旋转）
+    从已保存的裁剪图切出点数框和花色框（与 apply_roi_plan 的 rank/suit 一致）
     
     Args:
-        image: PIL Image对象
+        camera_id: 摄像头ID
         position_name: 位置名称
-        position_data: 位置数据 (包含中心坐标和尺寸)
+        main: 旋转后的裁剪图 numpy数组
         
     Returns:
-        PIL.Image: 裁剪后的图片，失败返回None
+        (点数框视图, 花色框视图)，未配置角标区域时为 (None, None)
     """
-    try:
-        # 获取标记区域的中心坐标和尺寸
-        center_x = int(position_data['x'])     # 中心点X坐标
-        center_y = int(position_data['y'])     # 中心点Y坐标
-        width = int(position_data['width'])    # 区域宽度
-        height = int(position_data['height'])  # 区域高度
-        
-        # 获取图片尺寸
-        img_width, img_height = image.size
-        
-        print(f"🔍 {position_name}: 中心坐标({center_x}, {center_y}), 尺寸({width}×{height})")
-        
-        # 从中心坐标计算裁剪区域的边界
-        # 左上角坐标 = 中心坐标 - 尺寸/2
-        left = center_x - width // 2
-        top = center_y - height // 2
-        right = left + width
-        bottom = top + height
-        
-        print(f"🔍 {position_name}: 裁剪区域({left}, {top}) -> ({right}, {bottom})")
-        
-        # 确保坐标在图片范围内
-        left = max(0, left)
-        top = max(0, top)
-        right = min(right, img_width)
-        bottom = min(bottom, img_height)
-        
-        # 检查裁剪区域是否有效
-        if right <= left or bottom <= top:
-            print(f"❌ {position_name}: 裁剪区域无效")
-            return None
-        
-        print(f"✂️  {position_name}: 修正后区域({left}, {top}) -> ({right}, {bottom})")
-        
-        # 执行裁剪
-        cropped = image.crop((left, top, right, bottom))
-        
-        # 新增：智能旋转处理
-        cropped_width, cropped_height = cropped.size
-        if should_rotate_image(position_name, cropped_width, cropped_height):
-            print(f"  🔄 检测到横图 {position_name}，准备旋转...")
-            cropped = rotate_image_to_vertical(cropped, position_name)
-        
-        return cropped
-        
-    except Exception as e:
-        print(f"❌ {position_name}: 裁剪失败 - {e}")
-        return None
+    profile = get_camera_profile(camera_id)
+    rois = profile.get('corner_rois', {}).get(position_name) if profile else None
+    if not rois:
+        return None, None
+    
+    # 裁剪图即计划中旋转后的输出尺寸
+    height, width = main.shape[:2]
+    return (_corner_view(main, _corner_box(rois['rank'], width, height)),
+            _corner_view(main, _corner_box(rois['suit'], width, height)))
 
-def crop_left_quarter(image, position_name: str = ""):
+def get_roi_plan(camera_id: str, frame_shape: tuple):
     """
-    裁剪图片左上角的1/4部分
+    获取摄像头的裁剪计划（配置或画面尺寸变化时重新编译）
     
     Args:
-        image: PIL Image对象
-        position_name: 位置名称（用于日志）
+        camera_id: 摄像头ID
+        frame_shape: 画面 shape
         
     Returns:
-        PIL.Image: 左上角1/4的图片
+        (计划, 有效标记数)，摄像头配置不存在返回 (None, 0)
     """
-    try:
-        width, height = image.size
-        
-        # 计算1/4区域的尺寸
-        quarter_width = width // 2
-        quarter_height = height // 2
-        
-        # 裁剪左上角区域 (0, 0) -> (width/2, height/2)
-        left_quarter = image.crop((0, 0, quarter_width, quarter_height))
-        
-        print(f"  ↳ {position_name} 左上角1/4: {quarter_width}×{quarter_height}")
+    profile = load_camera_profile(camera_id)
+    if not profile:
+        return None, 0
+    
+    key = (camera_id, frame_shape[0], frame_shape[1])
+    with _roi_plans_lock:
+        cached = _roi_plans.get(key)
+        # 配置缓存重新加载后预计算配置是新对象，计划随之失效
+        if cached is None or cached[0] is not profile:
+            cached = (profile, compile_roi_plan(profile, frame_shape[1], frame_shape[0]))
+            _roi_plans[key] = cached
+    return cached[1], len(profile['valid_marks'])
+
+def apply_roi_plan(frame: np.ndarray, plan: list) -> dict:
+    """
+    按裁剪计划切出各位置区域（全部为画面的视图，不复制像素）
+    
+    Args:
+        frame: 整帧画面 numpy数组(BGR)
+        plan: compile_roi_plan 的结果
         
-        return left_quarter
+    Returns:
+        dict: {位置: {"main": 区域视图, "left": 左上角1/4视图, "rank": 点数框视图, "suit": 花色框视图,
+                     "rotated": bool, "region": 旋转前的区域视图}}，未配置角标区域时 rank/suit 为None
+    """
+    crops = {}
+    for entry in plan:
+        region = frame[entry["top"]:entry["bottom"], entry["left"]:entry["right"]]
+        # 横图逆时针旋转90度（与 PIL rotate(90, expand=True) 方向一致）
+        main = np.rot90(region) if entry["rotate"] else region
+        crops[entry["position"]] = {
+            "main": main,
+            "left": main[:entry["corner_height"], :entry["corner_width"]],
+            "rank": _corner_view(main, entry["rank_box"]),
+            "suit": _corner_view(main, entry["suit_box"]),
+            "rotated": entry["rotate"],
+            "region": region,
+            "entry": entry
+        }
+    return crops
+
+def materialize_crop(crop: dict) -> dict:
+    """
+    旋转视图转为连续内存（OpenCV 不接受负步长数组），未旋转的视图原样返回
+    
+    Args:
+        crop: apply_roi_plan 返回的单个位置
         
-    except Exception as e:
-        print(f"❌ {position_name} 左上角裁剪失败: {e}")
-        return None
+    Returns:
+        dict: {"main", "left", "rank", "suit", "rotated", "region", "entry"}
+    """
+    if not crop["rotated"]:
+        return crop
+    
+    # cv2.rotate 在正步长的原区域上旋转，比复制 np.rot90 视图快得多
+    main = cv2.rotate(crop["region"], cv2.ROTATE_90_COUNTERCLOCKWISE)
+    entry = crop["entry"]
+    return dict(
+        crop,
+        main=main,
+        left=main[:entry["corner_height"], :entry["corner_width"]],
+        rank=_corner_view(main, entry["rank_box"]),
+        suit=_corner_view(main, entry["suit_box"])
+    )
 
 def process_image(image_path):
     """
@@ -293,56 +329,47 @@ def process_image(image_path):
         
         # 打开图片
         try:
-            with Image.open(image_path) as image:
-                print(f"📐 图片尺寸: {image.size[0]}×{image.size[1]}")
-                
-                # 设置输出目录
-                output_dir = image_path.parent / "cut"
-                output_dir.mkdir(exist_ok=True)
-                
-                success_count = 0
-                total_count = len(valid_marks)
-                rotation_count = 0  # 统计旋转次数
-                
-                # 处理每个标记位置
-                for position_name, position_data in valid_marks.items():
-                    print(f"\n🔄 处理位置: {position_name}")
-                    
-                    # 第一步：裁剪标记区域（支持智能旋转）
-                    cropped = crop_region(image, position_name, position_data)
-                    if cropped is None:
-                        continue
-                    
-                    # 检查是否进行了旋转
-                    original_width = int(position_data['width'])
-                    original_height = int(position_data['height'])
-                    if should_rotate_image(position_name, original_width, original_height):
-                        rotation_count += 1
-                    
-                    # 保存完整裁剪图片
-                    main_filename = f"camera_{camera_id}_{position_name}.png"
-                    main_path = output_dir / main_filename
-                    cropped.save(main_path, 'PNG')
-                    print(f"💾 保存: {main_filename} ({cropped.size[0]}×{cropped.size[1]})")
-                    
-                    # 第二步：裁剪左上角1/4
-                    left_quarter = crop_left_quarter(cropped, position_name)
-                    if left_quarter is not None:
-                        # 保存左上角1/4图片
-                        left_filename = f"camera_{camera_id}_{position_name}_left.png"
-                        left_path = output_dir / left_filename
-                        left_quarter.save(left_path, 'PNG')
-                        print(f"💾 保存: {left_filename} ({left_quarter.size[0]}×{left_quarter.size[1]})")
-                    
-                    success_count += 1
-                
-                print(f"\n📊 处理完成: {success_count}/{total_count} 个位置成功")
-                if rotation_count > 0:
-                    print(f"🔄 智能旋转: {rotation_count} 个横图已旋转为竖图")
-                print(f"📁 输出目录: {output_dir}")
+            image = cv2.imread(str(image_path))
+            if image is None:
+                print(f"❌ 无法读取图片: {image_path}")
+                return False
+            print(f"📐 图片尺寸: {image.shape[1]}×{image.shape[0]}")
+            
+            # 设置输出目录
+            output_dir = image_path.parent / "cut"
+            output_dir.mkdir(exist_ok=True)
+            
+            # 按裁剪计划切出所有位置
+            plan, total_count = get_roi_plan(camera_id, image.shape)
+            crops = apply_roi_plan(image, plan)
+            rotation_count = 0  # 统计旋转次数
+            
+            for entry in plan:
+                position_name = entry["position"]
+                crop = crops[position_name]
+                print(f"\n🔄 处理位置: {position_name}")
+                print(f"✂️  {position_name}: 区域({entry['left']}, {entry['top']}) -> ({entry['right']}, {entry['bottom']})")
                 
-                return success_count > 0
+                if crop["rotated"]:
+                    rotation_count += 1
+                    print(f"  ↻ 横图旋转: {entry['right'] - entry['left']}×{entry['bottom'] - entry['top']} -> "
+                          f"{crop['main'].shape[1]}×{crop['main'].shape[0]}")
                 
+                # 保存完整裁剪图片和左上角1/4
+                main_filename = f"camera_{camera_id}_{position_name}.png"
+                left_filename = f"camera_{camera_id}_{position_name}_left.png"
+                save_crop(crop, output_dir / main_filename, output_dir / left_filename)
+                print(f"💾 保存: {main_filename} ({crop['main'].shape[1]}×{crop['main'].shape[0]})")
+                print(f"💾 保存: {left_filename} ({crop['left'].shape[1]}×{crop['left'].shape[0]})")
+            
+            success_count = len(crops)
+            print(f"\n📊 处理完成: {success_count}/{total_count} 个位置成功")
+            if rotation_count > 0:
+                print(f"🔄 智能旋转: {rotation_count} 个横图已旋转为竖图")
+            print(f"📁 输出目录: {output_dir}")
+            
+            return success_count > 0
+            
         except Exception as e:
             print(f"❌ 图片处理失败: {e}")
             return False
@@ -396,9 +423,9 @@ def process_image_silent(image_path: str) -> dict:
                 "output_dir": ""
             }
         
-        # 加载摄像头配置
-        camera_config = load_camera_config(camera_id)
-        if not camera_config:
+        # 加载摄像头配置（预计算的有效标记）
+        profile = load_camera_profile(camera_id)
+        if not profile:
             return {
                 "success": False,
                 "message": "摄像头配置不存在",
@@ -407,7 +434,7 @@ def process_image_silent(image_path: str) -> dict:
             }
         
         # 获取有效标记
-        valid_marks = get_valid_marks(camera_config)
+        valid_marks = profile['valid_marks']
         if not valid_marks:
             return {
                 "success": False,
@@ -417,39 +444,34 @@ def process_image_silent(image_path: str) -> dict:
             }
         
         # 处理图片
-        with Image.open(image_path) as image:
-            output_dir = image_path.parent / "cut"
-            output_dir.mkdir(exist_ok=True)
-            
-            success_count = 0
-            
-            # 处理每个标记位置
-            for position_name, position_data in valid_marks.items():
-                # 裁剪标记区域
-                cropped = crop_region(image, position_name, position_data)
-                if cropped is None:
-                    continue
-                
-                # 保存完整裁剪图片
-                main_filename = f"camera_{camera_id}_{position_name}.png"
-                main_path = output_dir / main_filename
-                cropped.save(main_path, 'PNG')
-                
-                # 裁剪并保存左上角1/4
-                left_quarter = crop_left_quarter(cropped, position_name)
-                if left_quarter is not None:
-                    left_filename = f"camera_{camera_id}_{position_name}_left.png"
-                    left_path = output_dir / left_filename
-                    left_quarter.save(left_path, 'PNG')
-                
-                success_count += 1
-            
+        image = cv2.imread(str(image_path))
+        if image is None:
             return {
-                "success": success_count > 0,
-                "message": f"处理完成: {success_count}/{len(valid_marks)} 个位置成功",
-                "processed_count": success_count,
-                "output_dir": str(output_dir)
+                "success": False,
+                "message": f"无法读取图片: {image_path}",
+                "processed_count": 0,
+                "output_dir": ""
             }
+        
+        output_dir = image_path.parent / "cut"
+        output_dir.mkdir(exist_ok=True)
+        
+        # 按裁剪计划切出所有位置并保存
+        plan, _ = get_roi_plan(camera_id, image.shape)
+        crops = apply_roi_plan(image, plan)
+        for position_name, crop in crops.items():
+            save_crop(
+                crop,
+                output_dir / f"camera_{camera_id}_{position_name}.png",
+                output_dir / f"camera_{camera_id}_{position_name}_left.png"
+            )
+        
+        return {
+            "success": len(crops) > 0,
+            "message": f"处理完成: {len(crops)}/{len(valid_marks)} 个位置成功",
+            "processed_count": len(crops),
+            "output_dir": str(output_dir)
+        }
             
     except Exception as e:
         return {
@@ -459,6 +481,73 @@ def process_image_silent(image_path: str) -> dict:
             "output_dir": ""
         }
 
+# ============ 内存切图接口（numpy数组，不落盘） ============
+
+def save_crop(crop: dict, main_path: Path, left_path: Path):
+    """保存裁剪区域和左上角1/4"""
+    crop = materialize_crop(crop)
+    cv2.imwrite(str(main_path), crop["main"])
+    cv2.imwrite(str(left_path), crop["left"])
+
+def cut_frame_silent(frame: np.ndarray, camera_id: str, debug_dir: str = None) -> dict:
+    """
+    静默内存切图函数，直接对整帧画面切出各位置区域
+    
+    Args:
+        frame: 整帧画面 numpy数组(BGR)
+        camera_id: 摄像头ID
+        debug_dir: 调试输出目录（可选），提供时把裁剪图以原文件名写入该目录
+        
+    Returns:
+        dict: 处理结果 {"success": bool, "message": str, "processed_count": int,
+                       "crops": {位置: {"main": 数组, "left": 数组, "rank": 数组或None, "suit": 数组或None}}}
+    """
+    try:
+        if frame is None:
+            return {"success": False, "message": "画面为空", "processed_count": 0, "crops": {}}
+        
+        # 获取裁剪计划（配置或画面尺寸不变时直接复用）
+        plan, valid_count = get_roi_plan(camera_id, frame.shape)
+        if plan is None:
+            return {"success": False, "message": "摄像头配置不存在", "processed_count": 0, "crops": {}}
+        
+        if not valid_count:
+            return {
+                "success": False,
+                "message": f"摄像头 {camera_id} 没有有效标记",
+                "processed_count": 0,
+                "crops": {}
+            }
+        
+        output_dir = None
+        if debug_dir:
+            output_dir = Path(debug_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+        
+        crops = {}
+        for position_name, crop in apply_roi_plan(frame, plan).items():
+            # 未旋转位置保持画面视图，仅横图位置旋转到新内存供后续 OpenCV 处理
+            crop = materialize_crop(crop)
+            crops[position_name] = {"main": crop["main"], "left": crop["left"], "rank": crop["rank"], "suit": crop["suit"]}
+            
+            # 调试输出
+            if output_dir is not None:
+                save_crop(
+                    crop,
+                    output_dir / f"camera_{camera_id}_{position_name}.png",
+                    output_dir / f"camera_{camera_id}_{position_name}_left.png"
+                )
+        
+        return {
+            "success": len(crops) > 0,
+            "message": f"处理完成: {len(crops)}/{valid_count} 个位置成功",
+            "processed_count": len(crops),
+            "crops": crops
+        }
+        
+    except Exception as e:
+        return {"success": False, "message": f"处理异常: {str(e)}", "processed_count": 0, "crops": {}}
+
 # ============ 命令行接口保持不变 ============
 
 def main():
@@ -27,60 +27,68 @@ def setup_project_paths():
     
     return project_root
 
-def load_camera_config(camera_id: str) -> dict:
-    """加载摄像头配置"""
+setup_project_paths()
+
+from src.core.camera_config_store import get_camera_config_store, get_camera_profile, build_rtsp_url
+
+def load_camera_profile(camera_id: str) -> dict:
+    """
+    加载摄像头预计算配置（共享配置缓存，配置文件变化时自动重新加载）
+    
+    Returns:
+        dict: {'camera', 'rtsp_url', 'enabled', ...}，摄像头不存在返回None
+    """
     try:
-        project_root = setup_project_paths()
-        config_file = project_root / "src" / "config" / "camera.json"
-        
-        if not config_file.exists():
-            print(f"❌ 配置文件不存在: {config_file}")
-            return None
-        
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # 查找指定摄像头
-        for camera in config.get('cameras', []):
-            if camera.get('id') == camera_id:
-                return camera
-        
-        print(f"❌ 摄像头 {camera_id} 配置不存在")
-        return None
+        profile = get_camera_profile(camera_id)
+        if profile is None:
+            print(f"❌ 摄像头 {camera_id} 配置不存在")
+        return profile
         
     except Exception as e:
         print(f"❌ 读取配置失败: {e}")
         return None
 
-def build_rtsp_url(camera_config: dict) -> str:
-    """构建RTSP URL"""
-    username = camera_config.get('username', 'admin')
-    password = camera_config.get('password', '')
-    ip = camera_config.get('ip', '')
-    port = camera_config.get('port', 554)
-    stream_path = camera_config.get('stream_path', '/Streaming/Channels/101')
-    
-    return f"rtsp://{username}:{password}@{ip}:{port}{stream_path}"
+def load_camera_config(camera_id: str) -> dict:
+    """加载摄像头配置（副本）"""
+    if load_camera_profile(camera_id) is None:
+        return None
+    return get_camera_config_store().get_camera(camera_id)
+
+def get_grabbed_frame(camera_id: str):
+    """
+    从常驻抓帧器获取最新帧
+    
+    Args:
+        camera_id: 摄像头ID
+        
+    Returns:
+        帧数组(BGR)，抓帧器未启动、无帧或帧过期时返回None（调用方回退到ffmpeg拍照）
+    """
+    try:
+        from src.processors.frame_grabber import get_latest_frame
+        return get_latest_frame(camera_id)
+    except Exception:
+        return None
 
 def take_photo(camera_id: str) -> bool:
     """拍照主函数"""
     print("📷 拍照工具")
     
     # 1. 加载配置
-    camera_config = load_camera_config(camera_id)
-    if not camera_config:
+    profile = load_camera_profile(camera_id)
+    if not profile:
         return False
     
     # 检查摄像头是否启用
-    if not camera_config.get('enabled', True):
+    if not profile['enabled']:
         print(f"❌ 摄像头 {camera_id} 已禁用")
         return False
     
-    camera_name = camera_config.get('name', f'摄像头{camera_id}')
+    camera_name = profile['name']
     print(f"摄像头: {camera_id} ({camera_name})")
     
     # 2. 构建RTSP URL
-    rtsp_url = build_rtsp_url(camera_config)
+    rtsp_url = profile['rtsp_url']
     
     # 3. 设置输出路径
     project_root = setup_project_paths()
@@ -162,16 +170,16 @@ def take_photo_silent(camera_id: str) -> dict:
     """
     try:
         # 1. 加载配置
-        camera_config = load_camera_config(camera_id)
-        if not camera_config:
+        profile = load_camera_profile(camera_id)
+        if not profile:
             return {"success": False, "message": "摄像头配置不存在", "file_path": ""}
         
         # 检查摄像头是否启用
-        if not camera_config.get('enabled', True):
+        if not profile['enabled']:
             return {"success": False, "message": f"摄像头 {camera_id} 已禁用", "file_path": ""}
         
         # 2. 构建RTSP URL
-        rtsp_url = build_rtsp_url(camera_config)
+        rtsp_url = profile['rtsp_url']
         
         # 3. 设置输出路径
         project_root = setup_project_paths()
@@ -181,6 +189,17 @@ def take_photo_silent(camera_id: str) -> dict:
         filename = f"camera_{camera_id}.png"
         output_path = image_dir / filename
         
+        # 优先使用常驻抓帧器的最新帧（毫秒级），不可用时回退到ffmpeg单次拍照
+        frame = get_grabbed_frame(camera_id)
+        if frame is not None:
+            import cv2
+            if cv2.imwrite(str(output_path), frame):
+                return {
+                    "success": True,
+                    "message": f"拍照成功 (常驻抓帧 {frame.shape[1]}×{frame.shape[0]})",
+                    "file_path": str(output_path)
+                }
+        
         # 4. 执行FFmpeg命令
         cmd = [
             'ffmpeg',
@@ -221,6 +240,80 @@ def take_photo_silent(camera_id: str) -> dict:
     except Exception as e:
         return {"success": False, "message": f"拍照异常: {str(e)}", "file_path": ""}
 
+def capture_frame_silent(camera_id: str) -> dict:
+    """
+    静默抓帧函数，画面直接解码到内存，不写入拍照文件
+    
+    Args:
+        camera_id: 摄像头ID
+        
+    Returns:
+        dict: 抓帧结果 {"success": bool, "message": str, "frame": numpy数组(BGR)或None}
+    """
+    try:
+        import cv2
+        import numpy as np
+        
+        # 1. 加载配置
+        profile = load_camera_profile(camera_id)
+        if not profile:
+            return {"success": False, "message": "摄像头配置不存在", "frame": None}
+        
+        # 检查摄像头是否启用
+        if not profile['enabled']:
+            return {"success": False, "message": f"摄像头 {camera_id} 已禁用", "frame": None}
+        
+        # 2. 优先使用常驻抓帧器的最新帧
+        frame = get_grabbed_frame(camera_id)
+        if frame is not None:
+            return {
+                "success": True,
+                "message": f"抓帧成功 (常驻抓帧 {frame.shape[1]}×{frame.shape[0]})",
+                "frame": frame
+            }
+        
+        # 3. 构建RTSP URL，执行FFmpeg命令，单帧以BMP格式写到标准输出（无压缩，解码开销最小）
+        rtsp_url = profile['rtsp_url']
+        
+        cmd = [
+            'ffmpeg',
+            '-rtsp_transport', 'tcp',
+            '-i', rtsp_url,
+            '-vframes', '1',
+            '-f', 'image2pipe',
+            '-vcodec', 'bmp',
+            '-loglevel', 'error',
+            '-'
+        ]
+        
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            timeout=20
+        )
+        
+        # 4. 解码画面
+        if result.returncode != 0 or not result.stdout:
+            error_msg = result.stderr.decode('utf-8', errors='ignore').strip() if result.stderr else "FFmpeg执行失败"
+            return {"success": False, "message": f"抓帧失败: {error_msg}", "frame": None}
+        
+        frame = cv2.imdecode(np.frombuffer(result.stdout, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return {"success": False, "message": "画面解码失败", "frame": None}
+        
+        return {
+            "success": True,
+            "message": f"抓帧成功 ({frame.shape[1]}×{frame.shape[0]})",
+            "frame": frame
+        }
+        
+    except subprocess.TimeoutExpired:
+        return {"success": False, "message": "抓帧超时", "frame": None}
+    except FileNotFoundError:
+        return {"success": False, "message": "ffmpeg命令不存在", "frame": None}
+    except Exception as e:
+        return {"success": False, "message": f"抓帧异常: {str(e)}", "frame": None}
+
 # ============ 命令行接口保持不变 ============
 
 def main():
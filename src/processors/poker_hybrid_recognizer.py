@@ -14,6 +14,10 @@ import os
 import sys
 import time
 import argparse
+import builtins
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
@@ -34,14 +38,108 @@ def setup_project_paths():
 
 PROJECT_ROOT = setup_project_paths()
 
+def _ocr_process_worker(image) -> Dict[str, Any]:
+    """OCR子进程入口（进程池模式下在独立进程中持有自己的OCR引擎）"""
+    from src.processors.poker_ocr_detector import detect_poker_character
+    return detect_poker_character(image)
+
 class HybridPokerRecognizer:
     """混合扑克识别器"""
     
-    def __init__(self):
-        """初始化识别器"""
+    # 执行模式: serial 逐个运行各识别方法, parallel 同时运行,
+    #          cascade 按顺序运行，结果已无法被后续方法改变时提前结束
+    EXECUTION_MODES = ('serial', 'parallel', 'cascade')
+    
+    # 结果融合的方法权重
+    METHOD_WEIGHTS = {
+        'yolo': 0.7,         # YOLO权重最高
+        'ocr_opencv': 0.5,   # OCR+OpenCV组合
+        'ocr': 0.3,          # 单独OCR
+        'opencv': 0.2        # 单独OpenCV
+    }
+    
+    # 各融合方法可能达到的最高置信度（OpenCV花色置信度上限0.9，组合置信度 = OCR×0.6 + 花色×0.4）
+    METHOD_MAX_CONFIDENCE = {
+        'yolo': 1.0,
+        'ocr_opencv': 0.96
+    }
+    
+    # 融合最小得分阈值
+    MIN_FUSION_SCORE = 0.2
+    
+    # 级联模式默认顺序（YOLO最可靠，且批量推理时结果已提前就绪）
+    DEFAULT_CASCADE_ORDER = ('yolo', 'ocr_opencv')
+    
+    def __init__(self, execution_mode: str = 'parallel', ocr_process_workers: int = 0,
+                 cascade_order: List[str] = None):
+        """
+        初始化识别器
+        
+        Args:
+            execution_mode: 执行模式 ('serial'、'parallel' 或 'cascade')
+            ocr_process_workers: OCR进程池大小，0表示OCR在线程中运行
+            cascade_order: 级联模式的阶段顺序，默认 ['yolo', 'ocr_opencv']
+        """
+        if execution_mode not in self.EXECUTION_MODES:
+            raise ValueError(f"不支持的执行模式: {execution_mode}")
+        
+        self.execution_mode = execution_mode
+        self.cascade_order = list(cascade_order or self.DEFAULT_CASCADE_ORDER)
+        for stage in self.cascade_order:
+            if stage not in self.METHOD_MAX_CONFIDENCE:
+                raise ValueError(f"不支持的级联阶段: {stage}")
+        
         self.available_methods = self._check_methods_availability()
+        
+        # 并行/级联模式线程池：YOLO推理和OpenCV处理会释放GIL，线程即可并行
+        self._thread_pool = None
+        if execution_mode in ('parallel', 'cascade'):
+            self._thread_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="card-method")
+        
+        # 可选OCR进程池：OCR后处理的Python部分较重，放到独立进程中避免争抢GIL
+        self._ocr_process_pool = None
+        if self._thread_pool is not None and ocr_process_workers > 0:
+            import multiprocessing
+            self._ocr_process_pool = ProcessPoolExecutor(
+                max_workers=ocr_process_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        
         print("🧠 混合扑克识别器初始化完成")
         self._display_methods_status()
+        mode_names = {'serial': '串行', 'parallel': '并行', 'cascade': f"级联 ({' → '.join(self.cascade_order)})"}
+        print(f"   执行模式: {mode_names[execution_mode]}"
+              f"{f' (OCR进程池 {ocr_process_workers})' if self._ocr_process_pool else ''}")
+    
+    def shutdown(self):
+        """关闭并行执行使用的线程池和进程池"""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=True)
+            self._thread_pool = None
+        if self._ocr_process_pool is not None:
+            self._ocr_process_pool.shutdown(wait=True)
+            self._ocr_process_pool = None
+    
+    def get_engine_version(self) -> str:
+        """
+        获取识别引擎/配置版本（用于识别结果缓存键）
+        
+        模型文件、点数模板库更新，可用方法或执行配置变化后版本随之变化，旧缓存自然失效
+        """
+        try:
+            from src.processors.poker_yolo_detector import get_default_model_path
+            model_mtime = int(get_default_model_path().stat().st_mtime)
+        except Exception:
+            model_mtime = 0
+        
+        try:
+            from src.processors.rank_template_matcher import get_rank_template_version
+            template_version = get_rank_template_version()
+        except Exception:
+            template_version = '0'
+        
+        methods = ''.join(method[0] for method, available in self.available_methods.items() if available)
+        return f"{model_mtime}-{template_version}-{methods}-{self.execution_mode}-{'+'.join(self.cascade_order)}"
     
     def _check_methods_availability(self) -> Dict[str, bool]:
         """检查各识别方法可用性"""
@@ -87,32 +185,67 @@ class HybridPokerRecognizer:
             status = "✅ 可用" if self.available_methods[method] else "❌ 不可用"
             print(f"   {name}: {status}")
     
-    def recognize_single_card(self, main_image_path: str, left_image_path: str = None) -> Dict[str, Any]:
+    def get_yolo_model(self):
+        """
+        借用进程内共享的YOLO模型实例（与 detect_with_yolo 使用同一个模型）
+        
+        Returns:
+            (模型实例, 模型路径)，YOLO不可用时返回 (None, None)
+        """
+        if not self.available_methods['yolo']:
+            return None, None
+        
+        try:
+            from src.processors.poker_yolo_detector import get_yolov8_model
+            return get_yolov8_model()
+        except Exception as e:
+            print(f"⚠️  获取YOLO模型失败: {e}")
+            return None, None
+    
+    def recognize_single_card(self, main_image_path: str, left_image_path: str = None,
+                              yolo_result: Dict[str, Any] = None, rank_image=None,
+                              suit_image=None) -> Dict[str, Any]:
         """
         识别单张扑克牌 - 核心方法
         
         Args:
-            main_image_path: 主图片路径
-            left_image_path: 左上角图片路径（用于OCR和花色识别）
+            main_image_path: 主图片路径，或内存中的裁剪区域numpy数组
+            left_image_path: 左上角图片路径或numpy数组（用于OCR和花色识别）
+            yolo_result: 预先完成的YOLO结果（批量推理时传入，跳过单张YOLO推理）
+            rank_image: 点数框numpy数组（可选，提供时OCR只识别该区域）
+            suit_image: 花色框numpy数组（可选，提供时花色识别只处理该区域）
             
         Returns:
             识别结果
         """
         try:
-            print(f"\n🎯 识别: {Path(main_image_path).name}")
+            print(f"\n🎯 识别: {self._describe_image(main_image_path)}")
             
             start_time = time.time()
             
             # 检查文件存在性
-            if not os.path.exists(main_image_path):
+            if not self._image_available(main_image_path):
                 return self._format_error_result(f"主图片不存在: {main_image_path}")
             
+            left_available = self._image_available(left_image_path)
+            corners = (rank_image, suit_image)
+            
+            # 运行各识别方法（串行、并行或级联）
+            skipped_methods = []
+            if self.execution_mode == 'cascade':
+                yolo_result, ocr_result, opencv_result, skipped_methods = self._run_cascade(
+                    main_image_path, left_image_path, left_available, yolo_result, corners
+                )
+            else:
+                yolo_result, ocr_result, opencv_result = self._run_methods(
+                    main_image_path, left_image_path, left_available, yolo_result, corners
+                )
+            
             # 收集各方法的识别结果
             recognition_results = {}
             
             # 1. YOLO识别（完整扑克牌）
-            if self.available_methods['yolo']:
-                yolo_result = self._recognize_with_yolo(main_image_path)
+            if yolo_result is not None:
                 if yolo_result['success']:
                     recognition_results['yolo'] = yolo_result
                     print(f"   ✅ YOLO: {yolo_result['display_name']} (置信度: {yolo_result['confidence']:.3f})")
@@ -120,21 +253,16 @@ class HybridPokerRecognizer:
                     print(f"   ❌ YOLO: {yolo_result['error']}")
             
             # 2. OCR识别（字符）
-            ocr_result = None
-            if self.available_methods['ocr'] and left_image_path and os.path.exists(left_image_path):
-                ocr_result = self._recognize_with_ocr(left_image_path)
+            if ocr_result is not None:
                 if ocr_result['success']:
                     print(f"   ✅ OCR: {ocr_result['character']} (置信度: {ocr_result['confidence']:.3f})")
                 else:
                     print(f"   ❌ OCR: {ocr_result['error']}")
-            elif not left_image_path:
+            elif left_image_path is None and rank_image is None:
                 print(f"   ⚠️  OCR: 未提供左上角图片")
             
             # 3. OpenCV花色识别
-            opencv_result = None
-            if self.available_methods['opencv']:
-                image_for_suit = left_image_path if left_image_path and os.path.exists(left_image_path) else main_image_path
-                opencv_result = self._recognize_with_opencv(image_for_suit)
+            if opencv_result is not None:
                 if opencv_result['success']:
                     print(f"   ✅ OpenCV: {opencv_result['suit_name']} {opencv_result['suit_symbol']} (置信度: {opencv_result['confidence']:.3f})")
                 else:
@@ -156,6 +284,7 @@ class HybridPokerRecognizer:
             processing_time = time.time() - start_time
             final_result['processing_time'] = processing_time
             final_result['methods_used'] = list(recognition_results.keys())
+            final_result['skipped_methods'] = skipped_methods
             final_result['recognition_details'] = recognition_results
             
             if final_result['success']:
@@ -168,6 +297,153 @@ class HybridPokerRecognizer:
         except Exception as e:
             return self._format_error_result(f"识别异常: {str(e)}")
     
+    def _run_cascade(self, main_image, left_image, left_available: bool,
+                     yolo_result: Dict[str, Any] = None, corners: tuple = (None, None)):
+        """
+        级联运行识别方法：按 cascade_order 逐阶段运行，当前最高融合得分
+        不低于剩余阶段可能达到的最高得分时，后续阶段无法改变结果，直接跳过
+        
+        Args:
+            main_image: 主图片路径或数组
+            left_image: 左上角图片路径或数组
+            left_available: 左上角图片是否可用
+            yolo_result: 预先完成的YOLO结果（提供时YOLO阶段不再推理）
+            corners: (点数框, 花色框)，未配置角标区域时为None
+            
+        Returns:
+            (YOLO结果, OCR结果, OpenCV结果, 跳过的方法列表)
+        """
+        if not self.available_methods['yolo']:
+            yolo_result = None
+        ocr_result = None
+        opencv_result = None
+        skipped_methods = []
+        best_score = 0.0
+        
+        for index, stage in enumerate(self.cascade_order):
+            # 剩余阶段（含当前阶段）可能达到的最高得分
+            remaining_bound = max(
+                self.METHOD_MAX_CONFIDENCE[remaining] * self.METHOD_WEIGHTS[remaining]
+                for remaining in self.cascade_order[index:]
+            )
+            
+            if best_score >= self.MIN_FUSION_SCORE and best_score >= remaining_bound:
+                for remaining in self.cascade_order[index:]:
+                    skipped_methods.extend(['yolo'] if remaining == 'yolo' else ['ocr', 'opencv'])
+                print(f"   ⏭️  级联提前结束: 当前得分 {best_score:.3f} ≥ 剩余上限 {remaining_bound:.3f}")
+                break
+            
+            if stage == 'yolo':
+                if yolo_result is None and self.available_methods['yolo']:
+                    yolo_result = self._recognize_with_yolo(main_image)
+                if yolo_result is not None and yolo_result['success']:
+                    best_score = max(best_score, yolo_result['confidence'] * self.METHOD_WEIGHTS['yolo'])
+            
+            elif stage == 'ocr_opencv':
+                _, ocr_result, opencv_result = self._run_methods(
+                    main_image, left_image, left_available, {'success': False, 'error': '级联阶段不运行YOLO'}, corners
+                )
+                if ocr_result and ocr_result['success'] and opencv_result and opencv_result['success']:
+                    combined = self._combine_ocr_opencv(ocr_result, opencv_result)
+                    best_score = max(best_score, combined['confidence'] * self.METHOD_WEIGHTS['ocr_opencv'])
+        
+        return yolo_result, ocr_result, opencv_result, skipped_methods
+    
+    def _run_methods(self, main_image, left_image, left_available: bool,
+                     yolo_result: Dict[str, Any] = None, corners: tuple = (None, None)):
+        """
+        运行YOLO、OCR、OpenCV三种识别方法（三者在融合前相互独立）
+        
+        Args:
+            main_image: 主图片路径或数组
+            left_image: 左上角图片路径或数组
+            left_available: 左上角图片是否可用
+            yolo_result: 预先完成的YOLO结果（提供时不再推理）
+            corners: (点数框, 花色框)，提供时OCR和花色识别只处理对应区域
+            
+        Returns:
+            (YOLO结果, OCR结果, OpenCV结果)，未运行的方法为None
+        """
+        rank_image, suit_image = corners
+        image_for_ocr = rank_image if rank_image is not None else left_image
+        if suit_image is not None:
+            image_for_suit = suit_image
+        else:
+            image_for_suit = left_image if left_available else main_image
+        
+        run_yolo = self.available_methods['yolo'] and yolo_result is None
+        run_ocr = self.available_methods['ocr'] and (rank_image is not None or left_available)
+        run_opencv = self.available_methods['opencv']
+        
+        if not self.available_methods['yolo']:
+            yolo_result = None
+        
+        # 串行模式，或只有一个方法需要运行时，直接在当前线程执行
+        if self._thread_pool is None or (run_yolo + run_ocr + run_opencv) <= 1:
+            if run_yolo:
+                yolo_result = self._recognize_with_yolo(main_image)
+            ocr_result = self._recognize_with_ocr(image_for_ocr) if run_ocr else None
+            opencv_result = self._recognize_with_opencv(image_for_suit) if run_opencv else None
+            return yolo_result, ocr_result, opencv_result
+        
+        # 并行模式：同时提交，耗时取决于最慢的方法
+        yolo_future = self._submit(self._recognize_with_yolo, main_image) if run_yolo else None
+        ocr_future = self._submit_ocr(image_for_ocr) if run_ocr else None
+        opencv_future = self._submit(self._recognize_with_opencv, image_for_suit) if run_opencv else None
+        
+        if yolo_future is not None:
+            yolo_result = yolo_future.result()
+        ocr_result = ocr_future.result() if ocr_future is not None else None
+        opencv_result = opencv_future.result() if opencv_future is not None else None
+        
+        return yolo_result, ocr_result, opencv_result
+    
+    def _submit(self, func, *args):
+        """提交到线程池，工作线程继承调用线程的静默输出状态"""
+        silent_depth = getattr(_print_state, 'depth', 0)
+        
+        def run():
+            _print_state.depth = silent_depth
+            try:
+                return func(*args)
+            finally:
+                _print_state.depth = 0
+        
+        return self._thread_pool.submit(run)
+    
+    def _submit_ocr(self, image):
+        """提交OCR识别：配置了进程池时在子进程中运行，否则在线程池中运行"""
+        if self._ocr_process_pool is None:
+            return self._submit(self._recognize_with_ocr, image)
+        
+        process_future = self._ocr_process_pool.submit(_ocr_process_worker, image)
+        return self._submit(self._collect_process_ocr, process_future)
+    
+    def _collect_process_ocr(self, process_future) -> Dict[str, Any]:
+        """等待子进程OCR结果并格式化"""
+        try:
+            return self._format_ocr_result(process_future.result())
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f"OCR进程识别异常: {str(e)}",
+                'method': 'ocr'
+            }
+    
+    def _image_available(self, image) -> bool:
+        """检查图片是否可用（内存数组直接可用，路径需存在）"""
+        if image is None:
+            return False
+        if isinstance(image, (str, Path)):
+            return os.path.exists(image)
+        return getattr(image, 'size', 0) > 0
+    
+    def _describe_image(self, image) -> str:
+        """生成图片的日志描述"""
+        if isinstance(image, (str, Path)):
+            return Path(image).name
+        return f"内存图片 {image.shape[1]}×{image.shape[0]}"
+    
     def recognize_camera_positions(self, camera_id: str, cut_image_dir: str) -> Dict[str, Any]:
         """
         识别摄像头所有位置
@@ -193,6 +469,15 @@ class HybridPokerRecognizer:
             position_results = {}
             successful_count = 0
             
+            # 所有位置的YOLO识别合并为一次批量推理
+            main_files = {
+                position: cut_dir / f"camera_{camera_id}_{position}.png"
+                for position in positions
+            }
+            yolo_results = self._batch_recognize_with_yolo({
+                position: str(main_file) for position, main_file in main_files.items() if main_file.exists()
+            })
+            
             for position in positions:
                 # 查找主图片和左上角图片
                 main_pattern = f"camera_{camera_id}_{position}.png"
@@ -204,7 +489,7 @@ class HybridPokerRecognizer:
                 if main_file.exists():
                     # 识别该位置
                     left_path = str(left_file) if left_file.exists() else None
-                    result = self.recognize_single_card(str(main_file), left_path)
+                    result = self.recognize_single_card(str(main_file), left_path, yolo_results.get(position))
                     
                     if result['success']:
                         successful_count += 1
@@ -249,24 +534,7 @@ class HybridPokerRecognizer:
             from src.processors.poker_yolo_detector import detect_with_yolo
             
             result = detect_with_yolo(image_path, 0.3)
-            
-            if result['success']:
-                return {
-                    'success': True,
-                    'suit': result['suit'],
-                    'rank': result['rank'],
-                    'suit_symbol': result['suit_symbol'],
-                    'suit_name': result['suit_name'],
-                    'display_name': result['display_name'],
-                    'confidence': result['confidence'],
-                    'method': 'yolo'
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': result['error'],
-                    'method': 'yolo'
-                }
+            return self._format_yolo_result(result)
                 
         except Exception as e:
             return {
@@ -275,26 +543,65 @@ class HybridPokerRecognizer:
                 'method': 'yolo'
             }
     
+    def _batch_recognize_with_yolo(self, images: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        使用YOLO批量识别多个位置（一次前向推理）
+        
+        Args:
+            images: {位置: 图片路径或numpy数组}
+            
+        Returns:
+            {位置: YOLO结果}，批量识别不可用时返回空字典（调用方逐张识别）
+        """
+        if not self.available_methods['yolo'] or not images:
+            return {}
+        
+        try:
+            import cv2
+            from src.processors.poker_yolo_detector import detect_with_yolo_batch
+            
+            # 裁剪图读入内存后统一送入批量推理
+            arrays = {}
+            for position, image in images.items():
+                if isinstance(image, str):
+                    image = cv2.imread(image)
+                if image is not None:
+                    arrays[position] = image
+            
+            batch_results = detect_with_yolo_batch(arrays, 0.3)
+            return {position: self._format_yolo_result(result) for position, result in batch_results.items()}
+            
+        except Exception as e:
+            print(f"   ⚠️  YOLO批量识别失败，改为逐张识别: {e}")
+            return {}
+    
+    def _format_yolo_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """格式化YOLO检测结果"""
+        if result['success']:
+            return {
+                'success': True,
+                'suit': result['suit'],
+                'rank': result['rank'],
+                'suit_symbol': result['suit_symbol'],
+                'suit_name': result['suit_name'],
+                'display_name': result['display_name'],
+                'confidence': result['confidence'],
+                'method': 'yolo'
+            }
+        else:
+            return {
+                'success': False,
+                'error': result['error'],
+                'method': 'yolo'
+            }
+    
     def _recognize_with_ocr(self, image_path: str) -> Dict[str, Any]:
         """使用OCR识别字符"""
         try:
             from src.processors.poker_ocr_detector import detect_poker_character
             
             result = detect_poker_character(image_path)
-            
-            if result['success']:
-                return {
-                    'success': True,
-                    'character': result['character'],
-                    'confidence': result['confidence'],
-                    'method': result['method']
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': result['error'],
-                    'method': result.get('method', 'ocr')
-                }
+            return self._format_ocr_result(result)
                 
         except Exception as e:
             return {
@@ -303,6 +610,22 @@ class HybridPokerRecognizer:
                 'method': 'ocr'
             }
     
+    def _format_ocr_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """格式化OCR识别结果"""
+        if result['success']:
+            return {
+                'success': True,
+                'character': result['character'],
+                'confidence': result['confidence'],
+                'method': result['method']
+            }
+        else:
+            return {
+                'success': False,
+                'error': result['error'],
+                'method': result.get('method', 'ocr')
+            }
+    
     def _recognize_with_opencv(self, image_path: str) -> Dict[str, Any]:
         """使用OpenCV识别花色"""
         try:
@@ -371,12 +694,7 @@ class HybridPokerRecognizer:
         """结果融合 - 使用加权策略"""
         try:
             # 方法权重
-            method_weights = {
-                'yolo': 0.7,         # YOLO权重最高
-                'ocr_opencv': 0.5,   # OCR+OpenCV组合
-                'ocr': 0.3,          # 单独OCR
-                'opencv': 0.2        # 单独OpenCV
-            }
+            method_weights = self.METHOD_WEIGHTS
             
             best_result = None
             best_score = 0
@@ -396,7 +714,7 @@ class HybridPokerRecognizer:
                     best_result = result.copy()
                     best_method = method
             
-            if best_result and best_score >= 0.2:  # 最小得分阈值
+            if best_result and best_score >= self.MIN_FUSION_SCORE:  # 最小得分阈值
                 best_result['fusion_method'] = 'weighted'
                 best_result['fusion_score'] = best_score
                 best_result['selected_method'] = best_method
@@ -444,27 +762,92 @@ class HybridPokerRecognizer:
 
 # 创建全局识别器实例
 _global_recognizer = None
+_global_recognizer_lock = threading.Lock()
+
+def load_recognition_config() -> Dict[str, Any]:
+    """从 camera.json 的 system.recognition 读取识别器配置"""
+    try:
+        from src.core.camera_config_store import get_camera_config_store
+        return get_camera_config_store().get_section('recognition')
+    except Exception as e:
+        print(f"⚠️  读取识别器配置失败: {e}")
+        return {}
 
 def get_recognizer():
     """获取全局识别器实例"""
     global _global_recognizer
     if _global_recognizer is None:
-        _global_recognizer = HybridPokerRecognizer()
+        with _global_recognizer_lock:
+            if _global_recognizer is None:
+                config = load_recognition_config()
+                _global_recognizer = HybridPokerRecognizer(
+                    execution_mode=config.get('execution_mode', 'parallel'),
+                    ocr_process_workers=config.get('ocr_process_workers', 0),
+                    cascade_order=config.get('cascade_order')
+                )
     return _global_recognizer
 
-def recognize_single_card_func(main_image_path: str, left_image_path: str = None) -> Dict[str, Any]:
+# 静默输出状态（按线程记录，多个摄像头并发识别时互不影响）
+_print_state = threading.local()
+_print_patch_lock = threading.Lock()
+_original_print = builtins.print
+
+def _thread_aware_print(*args, **kwargs):
+    """当前线程处于静默状态时丢弃输出，否则正常打印"""
+    if getattr(_print_state, 'depth', 0) > 0:
+        return
+    _original_print(*args, **kwargs)
+
+@contextmanager
+def silence_print():
+    """
+    静默当前线程的print输出（线程安全，可嵌套）
+    
+    只安装一次线程感知的print，其他线程的输出不受影响
+    """
+    global _original_print
+    with _print_patch_lock:
+        if builtins.print is not _thread_aware_print:
+            _original_print = builtins.print
+            builtins.print = _thread_aware_print
+    
+    _print_state.depth = getattr(_print_state, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _print_state.depth -= 1
+
+def recognize_single_card_func(main_image_path, left_image_path=None,
+                               yolo_result: Dict[str, Any] = None, rank_image=None,
+                               suit_image=None) -> Dict[str, Any]:
     """
     供其他模块调用的单张扑克牌识别函数
     
     Args:
-        main_image_path: 主图片路径
-        left_image_path: 左上角图片路径（可选）
+        main_image_path: 主图片路径或numpy数组
+        left_image_path: 左上角图片路径或numpy数组（可选）
+        yolo_result: 预先完成的YOLO批量识别结果（可选）
+        rank_image: 点数框numpy数组（可选）
+        suit_image: 花色框numpy数组（可选）
         
     Returns:
         dict: 识别结果
     """
     recognizer = get_recognizer()
-    return recognizer.recognize_single_card(main_image_path, left_image_path)
+    return recognizer.recognize_single_card(main_image_path, left_image_path, yolo_result, rank_image, suit_image)
+
+def batch_recognize_yolo_silent(images: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    静默批量YOLO识别函数，多个位置合并为一次前向推理
+    
+    Args:
+        images: {位置: 图片路径或numpy数组}
+        
+    Returns:
+        dict: {位置: YOLO结果}，可作为 yolo_result 传给单张识别函数
+    """
+    with silence_print():
+        return get_recognizer()._batch_recognize_with_yolo(images)
 
 def recognize_camera_positions_func(camera_id: str, cut_image_dir: str = None) -> Dict[str, Any]:
     """
@@ -484,38 +867,91 @@ def recognize_camera_positions_func(camera_id: str, cut_image_dir: str = None) -
     recognizer = get_recognizer()
     return recognizer.recognize_camera_positions(camera_id, cut_image_dir)
 
-def recognize_single_card_silent(main_image_path: str, left_image_path: str = None) -> Dict[str, Any]:
+# 可缓存的识别失败（由图片内容决定，重复识别结果相同；
+# "所有识别方法都失败" 可能由引擎异常引起，不缓存）
+CACHEABLE_ERRORS = ('融合后置信度不足',)
+
+def lookup_cached_recognition(main_image_path, left_image_path=None, rank_image=None,
+                              suit_image=None) -> Optional[Dict[str, Any]]:
+    """
+    查找识别结果缓存（不运行任何识别引擎）
+    
+    Args:
+        main_image_path: 主图片路径或numpy数组
+        left_image_path: 左上角图片路径或numpy数组（可选）
+        rank_image: 点数框numpy数组（可选）
+        suit_image: 花色框numpy数组（可选）
+        
+    Returns:
+        缓存的识别结果，缓存禁用或未命中返回None
+    """
+    from src.processors.recognition_cache import get_recognition_cache
+    
+    cache = get_recognition_cache()
+    if not cache.config['enabled']:
+        return None
+    
+    cached_result = cache.get(_make_cache_key(cache, main_image_path, left_image_path, rank_image, suit_image))
+    if cached_result is not None:
+        cached_result['cache_hit'] = True
+        cached_result['processing_time'] = 0.0
+    return cached_result
+
+def _make_cache_key(cache, main_image_path, left_image_path, rank_image, suit_image) -> Optional[str]:
+    """相同裁剪内容 + 相同角标区域 + 相同引擎版本 → 相同缓存键"""
+    return cache.make_key(main_image_path, left_image_path, get_recognizer().get_engine_version(),
+                          (rank_image, suit_image))
+
+def recognize_single_card_silent(main_image_path, left_image_path=None,
+                                 yolo_result: Dict[str, Any] = None, rank_image=None,
+                                 suit_image=None) -> Dict[str, Any]:
     """
     静默单张识别函数，不输出调试信息
     
     Args:
-        main_image_path: 主图片路径
-        left_image_path: 左上角图片路径（可选）
+        main_image_path: 主图片路径或numpy数组
+        left_image_path: 左上角图片路径或numpy数组（可选）
+        yolo_result: 预先完成的YOLO批量识别结果（可选）
+        rank_image: 点数框numpy数组（可选）
+        suit_image: 花色框numpy数组（可选）
         
     Returns:
         dict: 识别结果
     """
-    # 临时禁用print输出
-    import builtins
-    original_print = builtins.print
-    builtins.print = lambda *args, **kwargs: None
+    from src.processors.recognition_cache import get_recognition_cache
     
-    try:
-        result = recognize_single_card_func(main_image_path, left_image_path)
+    # 临时禁用当前线程的print输出
+    with silence_print():
+        cache = get_recognition_cache()
+        if not cache.config['enabled']:
+            return recognize_single_card_func(main_image_path, left_image_path, yolo_result, rank_image, suit_image)
+        
+        # 相同裁剪内容 + 相同角标区域 + 相同引擎版本 → 直接返回上次结果
+        cache_key = _make_cache_key(cache, main_image_path, left_image_path, rank_image, suit_image)
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            cached_result['cache_hit'] = True
+            cached_result['processing_time'] = 0.0
+            return cached_result
+        
+        result = recognize_single_card_func(main_image_path, left_image_path, yolo_result, rank_image, suit_image)
+        
+        # 只缓存由图片内容决定的结果，异常导致的失败不缓存
+        if result.get('success') or result.get('error') in CACHEABLE_ERRORS:
+            cache.put(cache_key, result)
+        
         return result
-    finally:
-        # 恢复print输出
-        builtins.print = original_print
 
 # ============ 命令行接口保持不变 ============
 
-def test_single_card(main_path: str, left_path: str = None):
+def test_single_card(main_path: str, left_path: str = None, execution_mode: str = 'parallel'):
     """测试单张扑克牌识别"""
     print("🧪 单张扑克牌识别测试")
     print("=" * 50)
     
-    recognizer = HybridPokerRecognizer()
+    recognizer = HybridPokerRecognizer(execution_mode=execution_mode)
     result = recognizer.recognize_single_card(main_path, left_path)
+    recognizer.shutdown()
     
     if result['success']:
         print(f"\n✅ 识别成功!")
@@ -607,6 +1043,8 @@ def parse_arguments():
     parser.add_argument('--batch', type=str, help='批量识别摄像头ID')
     parser.add_argument('--dir', type=str, default='src/image/cut/', help='裁剪图片目录')
     parser.add_argument('--capabilities', action='store_true', help='显示识别能力')
+    parser.add_argument('--mode', type=str, default='parallel', choices=HybridPokerRecognizer.EXECUTION_MODES,
+                        help='执行模式 (默认: parallel)')
     
     return parser.parse_args()
 
@@ -618,7 +1056,7 @@ def main():
         show_capabilities()
     elif args.main:
         # 单张识别
-        test_single_card(args.main, args.left)
+        test_single_card(args.main, args.left, args.mode)
     elif args.batch:
         # 批量识别
         test_camera_batch(args.batch, args.dir)
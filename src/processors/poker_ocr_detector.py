@@ -8,29 +8,359 @@ OCR扑克牌字符识别器 - 识别扑克牌左上角的字符
 import sys
 import os
 import re
+import time
+import queue
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import cv2
 import numpy as np
 
-def preprocess_image_for_ocr(image_path: str) -> np.ndarray:
+def get_project_root():
+    """获取项目根目录"""
+    current_dir = Path(__file__).resolve().parent
+    project_root = current_dir
+    
+    # 向上查找项目根目录（包含main.py的目录）
+    while project_root.parent != project_root:
+        if (project_root / "main.py").exists():
+            break
+        project_root = project_root.parent
+    
+    return project_root
+
+# OCR引擎池默认配置（可在 camera.json 的 system.ocr_pool 中覆盖）
+DEFAULT_OCR_POOL_CONFIG = {
+    'enabled': True,              # 启用引擎池（关闭后每次识别临时创建引擎）
+    'pool_size': 1,               # 每种引擎的最大实例数
+    'engines': ['paddle', 'easy'],  # 预热的引擎类型
+    'warmup': True,               # 启动时预热
+    'max_memory_mb': 2048,        # 引擎池内存上限(MB)
+    'checkout_timeout': 30        # 等待空闲引擎的超时时间(秒)
+}
+
+# 无法测量内存时使用的单个引擎估算内存(MB)
+ESTIMATED_ENGINE_MEMORY_MB = {
+    'paddle': 500,
+    'easy': 400
+}
+
+def create_ocr_engine(engine_type: str):
+    """
+    创建OCR引擎实例
+    
+    Args:
+        engine_type: 引擎类型 ('paddle' 或 'easy')
+        
+    Returns:
+        OCR引擎实例
+    """
+    if engine_type == 'paddle':
+        from paddleocr import PaddleOCR
+        return PaddleOCR(use_angle_cls=False, lang='en', use_gpu=False, show_log=False)
+    elif engine_type == 'easy':
+        import easyocr
+        # 仅英文，提高速度和准确性
+        return easyocr.Reader(['en'], gpu=False)
+    else:
+        raise ValueError(f"不支持的OCR引擎类型: {engine_type}")
+
+def _get_process_memory_mb() -> Optional[float]:
+    """获取当前进程内存占用(MB)，psutil不可用时返回None"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+class OCREnginePool:
+    """OCR引擎池 - 预先初始化的PaddleOCR/EasyOCR实例，按需借出和归还"""
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """初始化引擎池"""
+        self.config = DEFAULT_OCR_POOL_CONFIG.copy()
+        if config:
+            self.config.update(config)
+        
+        self._idle = {}          # {引擎类型: 空闲实例队列}
+        self._created = {}       # {引擎类型: 已创建实例数}
+        self._memory_mb = {}     # {引擎类型: 单个实例内存占用(MB)}
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'created': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'rejected_by_memory': 0
+        }
+    
+    def _get_idle_queue(self, engine_type: str) -> queue.Queue:
+        """获取引擎类型对应的空闲队列"""
+        with self._lock:
+            if engine_type not in self._idle:
+                self._idle[engine_type] = queue.Queue()
+                self._created[engine_type] = 0
+            return self._idle[engine_type]
+    
+    def _total_memory_mb(self) -> float:
+        """估算引擎池当前内存占用(MB)"""
+        return sum(
+            self._memory_mb.get(engine_type, ESTIMATED_ENGINE_MEMORY_MB.get(engine_type, 0)) * count
+            for engine_type, count in self._created.items()
+        )
+    
+    def _reserve_slot(self, engine_type: str) -> bool:
+        """在容量和内存上限允许时预留一个新实例名额"""
+        with self._lock:
+            created = self._created.get(engine_type, 0)
+            if created >= max(1, int(self.config['pool_size'])):
+                return False
+            
+            # 每种引擎至少保留一个实例，其余实例受内存上限约束
+            if created > 0:
+                per_engine = self._memory_mb.get(engine_type, ESTIMATED_ENGINE_MEMORY_MB.get(engine_type, 0))
+                if self._total_memory_mb() + per_engine > self.config['max_memory_mb']:
+                    self.stats['rejected_by_memory'] += 1
+                    return False
+            
+            self._created[engine_type] = created + 1
+            return True
+    
+    def _create(self, engine_type: str):
+        """创建新实例并记录内存占用"""
+        memory_before = _get_process_memory_mb()
+        start_time = time.time()
+        
+        try:
+            engine = create_ocr_engine(engine_type)
+        except Exception:
+            with self._lock:
+                self._created[engine_type] -= 1
+            raise
+        
+        memory_after = _get_process_memory_mb()
+        with self._lock:
+            if memory_before is not None and memory_after is not None and memory_after > memory_before:
+                self._memory_mb[engine_type] = memory_after - memory_before
+            self.stats['created'] += 1
+        
+        print(f"[OCR] 创建{engine_type}引擎实例 (耗时: {time.time() - start_time:.2f}s)")
+        return engine
+    
+    def acquire(self, engine_type: str, timeout: Optional[float] = None):
+        """
+        借出一个引擎实例
+        
+        Args:
+            engine_type: 引擎类型 ('paddle' 或 'easy')
+            timeout: 等待空闲实例的超时时间（秒），默认使用配置值
+            
+        Returns:
+            OCR引擎实例
+        """
+        idle = self._get_idle_queue(engine_type)
+        
+        try:
+            engine = idle.get_nowait()
+        except queue.Empty:
+            if self._reserve_slot(engine_type):
+                engine = self._create(engine_type)
+            else:
+                with self._lock:
+                    self.stats['waits'] += 1
+                wait_timeout = self.config['checkout_timeout'] if timeout is None else timeout
+                try:
+                    engine = idle.get(timeout=wait_timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"等待空闲{engine_type}引擎超时 ({wait_timeout}s)")
+        
+        with self._lock:
+            self.stats['checkouts'] += 1
+        return engine
+    
+    def release(self, engine_type: str, engine):
+        """归还引擎实例"""
+        self._get_idle_queue(engine_type).put(engine)
+    
+    @contextmanager
+    def checkout(self, engine_type: str, timeout: Optional[float] = None):
+        """借出引擎实例的上下文管理器，退出时自动归还"""
+        engine = self.acquire(engine_type, timeout)
+        try:
+            yield engine
+        finally:
+            self.release(engine_type, engine)
+    
+    def warmup(self, engine_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        预热引擎池：创建实例并执行一次空白图片识别，避免首次识别时的初始化开销
+        
+        Args:
+            engine_types: 需要预热的引擎类型，默认使用配置中的 engines
+            
+        Returns:
+            各引擎预热结果
+        """
+        engine_types = engine_types or self.config['engines']
+        blank_image = np.full((64, 64), 255, dtype=np.uint8)
+        warmup_results = {}
+        
+        for engine_type in engine_types:
+            start_time = time.time()
+            engines = []
+            try:
+                # 依次创建到池容量上限（受内存上限约束）
+                while self._reserve_slot(engine_type):
+                    engines.append(self._create(engine_type))
+                
+                for engine in engines:
+                    if engine_type == 'paddle':
+                        engine.ocr(blank_image, cls=False)
+                    else:
+                        engine.readtext(blank_image, detail=1, paragraph=False)
+                
+                warmup_results[engine_type] = {
+                    'success': True,
+                    'instances': self._created.get(engine_type, 0),
+                    'duration': round(time.time() - start_time, 3)
+                }
+            except Exception as e:
+                warmup_results[engine_type] = {
+                    'success': False,
+                    'error': str(e),
+                    'duration': round(time.time() - start_time, 3)
+                }
+            finally:
+                idle = self._get_idle_queue(engine_type)
+                for engine in engines:
+                    idle.put(engine)
+        
+        return warmup_results
+    
+    def get_status(self) -> Dict[str, Any]:
+        """获取引擎池状态"""
+        with self._lock:
+            return {
+                'config': self.config.copy(),
+                'engines': {
+                    engine_type: {
+                        'created': self._created.get(engine_type, 0),
+                        'idle': self._idle[engine_type].qsize(),
+                        'memory_mb': round(self._memory_mb.get(
+                            engine_type, ESTIMATED_ENGINE_MEMORY_MB.get(engine_type, 0)), 1)
+                    }
+                    for engine_type in self._idle
+                },
+                'total_memory_mb': round(self._total_memory_mb(), 1),
+                'stats': self.stats.copy()
+            }
+
+def load_ocr_pool_config() -> Dict[str, Any]:
+    """从 camera.json 的 system.ocr_pool 读取引擎池配置"""
+    try:
+        from src.core.camera_config_store import get_camera_config_store
+        return get_camera_config_store().get_section('ocr_pool')
+    except Exception as e:
+        print(f"[OCR] 读取引擎池配置失败: {e}")
+        return {}
+
+# 全局引擎池（首次使用时创建）
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+def get_ocr_pool() -> OCREnginePool:
+    """获取全局OCR引擎池"""
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                _ocr_pool = OCREnginePool(load_ocr_pool_config())
+    return _ocr_pool
+
+@contextmanager
+def checkout_ocr_engine(engine_type: str):
+    """借出OCR引擎：启用引擎池时从池中借出，否则临时创建"""
+    pool = get_ocr_pool()
+    if pool.config.get('enabled', True):
+        with pool.checkout(engine_type) as engine:
+            yield engine
+    else:
+        yield create_ocr_engine(engine_type)
+
+def warmup_ocr_pool(engine_types: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    启动时预热OCR引擎池
+    
+    Args:
+        engine_types: 需要预热的引擎类型，默认使用配置
+        
+    Returns:
+        各引擎预热结果，引擎池禁用或未开启预热时返回空字典
+    """
+    pool = get_ocr_pool()
+    if not pool.config.get('enabled', True) or not pool.config.get('warmup', True):
+        return {}
+    return pool.warmup(engine_types)
+
+def get_ocr_pool_status() -> Dict[str, Any]:
+    """获取OCR引擎池状态"""
+    return get_ocr_pool().get_status()
+
+# OCR放大参数：按实际字符高度选择放大倍数，使字符高度接近目标值
+OCR_TARGET_GLYPH_HEIGHT = 48  # 放大后的目标字符高度（像素）
+OCR_MAX_SCALE = 4.0           # 最大放大倍数
+OCR_FALLBACK_SCALE = 3        # 未找到字符时的放大倍数（与原固定倍数一致）
+
+def estimate_glyph_height(binary: np.ndarray) -> Optional[int]:
+    """
+    估计二值图中字符的高度
+    
+    Args:
+        binary: 二值图（白底黑字）
+        
+    Returns:
+        最高字符连通域的高度（像素），未找到字符返回None
+    """
+    height, width = binary.shape
+    count, _, stats, _ = cv2.connectedComponentsWithStats(cv2.bitwise_not(binary), connectivity=8)
+    
+    min_area = max(4, binary.size // 500)
+    glyph_height = 0
+    for label in range(1, count):
+        _, _, w, h, area = stats[label]
+        # 跳过噪点，以及几乎贯穿整图的边框/桌面区域
+        if area < min_area or h >= height * 0.9 or w >= width * 0.9:
+            continue
+        glyph_height = max(glyph_height, int(h))
+    
+    return glyph_height or None
+
+def choose_ocr_scale(binary: np.ndarray) -> float:
+    """根据字符高度选择放大倍数（字符已足够大时不放大）"""
+    glyph_height = estimate_glyph_height(binary)
+    if glyph_height is None:
+        return OCR_FALLBACK_SCALE
+    return min(OCR_MAX_SCALE, max(1.0, OCR_TARGET_GLYPH_HEIGHT / glyph_height))
+
+def preprocess_image_for_ocr(image_path) -> np.ndarray:
     """
     预处理图片以提高OCR识别率
     
     Args:
-        image_path: 图片路径
+        image_path: 图片路径，或内存中的numpy数组(BGR/灰度)，可为左上角区域或点数框
         
     Returns:
         预处理后的图片数组
     """
     try:
-        # 读取图片
-        image = cv2.imread(image_path)
+        # 读取图片（内存数组直接使用）
+        image = image_path if isinstance(image_path, np.ndarray) else cv2.imread(image_path)
         if image is None:
             raise ValueError(f"无法读取图片: {image_path}")
         
         # 转换为灰度图
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
         
         # 图像增强
         # 1. 高斯模糊去噪
@@ -64,10 +394,13 @@ def preprocess_image_for_ocr(image_path: str) -> np.ndarray:
         kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
         cleaned = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
         
-        # 5. 尺寸调整（放大以提高识别率）
+        # 5. 尺寸调整（按字符高度放大到OCR合适的尺寸）
+        scale_factor = choose_ocr_scale(cleaned)
+        if scale_factor <= 1.0:
+            return cleaned
+        
         height, width = cleaned.shape
-        scale_factor = 3
-        enlarged = cv2.resize(cleaned, (width * scale_factor, height * scale_factor), 
+        enlarged = cv2.resize(cleaned, (int(round(width * scale_factor)), int(round(height * scale_factor))),
                             interpolation=cv2.INTER_CUBIC)
         
         return enlarged
@@ -76,6 +409,8 @@ def preprocess_image_for_ocr(image_path: str) -> np.ndarray:
         print(f"[OCR] 图片预处理失败: {e}")
         # 返回原始灰度图作为备选
         try:
+            if isinstance(image_path, np.ndarray):
+                return cv2.cvtColor(image_path, cv2.COLOR_BGR2GRAY) if image_path.ndim == 3 else image_path
             image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
             return image if image is not None else np.zeros((100, 100), dtype=np.uint8)
         except:
@@ -152,19 +487,15 @@ def normalize_poker_character(raw_text: str) -> Optional[str]:
         print(f"[OCR] 字符标准化失败: {e}")
         return None
 
-def detect_with_easyocr(image_path: str) -> Dict[str, Any]:
+def detect_with_easyocr(image_path) -> Dict[str, Any]:
     """使用EasyOCR识别字符"""
     try:
-        import easyocr
-        
-        # 创建EasyOCR读取器（仅英文，提高速度和准确性）
-        reader = easyocr.Reader(['en'], gpu=False)
-        
         # 预处理图片
         processed_image = preprocess_image_for_ocr(image_path)
         
-        # OCR识别
-        results = reader.readtext(processed_image, detail=1, paragraph=False)
+        # OCR识别（从引擎池借出EasyOCR读取器）
+        with checkout_ocr_engine('easy') as reader:
+            results = reader.readtext(processed_image, detail=1, paragraph=False)
         
         if not results:
             return {
@@ -213,19 +544,15 @@ def detect_with_easyocr(image_path: str) -> Dict[str, Any]:
             "method": "easyocr"
         }
 
-def detect_with_paddleocr(image_path: str) -> Dict[str, Any]:
+def detect_with_paddleocr(image_path) -> Dict[str, Any]:
     """使用PaddleOCR识别字符"""
     try:
-        from paddleocr import PaddleOCR
-        
-        # 创建PaddleOCR实例
-        ocr = PaddleOCR(use_angle_cls=False, lang='en', use_gpu=False, show_log=False)
-        
         # 预处理图片
         processed_image = preprocess_image_for_ocr(image_path)
         
-        # OCR识别
-        results = ocr.ocr(processed_image, cls=False)
+        # OCR识别（从引擎池借出PaddleOCR实例）
+        with checkout_ocr_engine('paddle') as ocr:
+            results = ocr.ocr(processed_image, cls=False)
         
         if not results or not results[0]:
             return {
@@ -275,34 +602,51 @@ def detect_with_paddleocr(image_path: str) -> Dict[str, Any]:
             "method": "paddleocr"
         }
 
-def detect_poker_character(image_path: str, use_paddle: bool = True) -> Dict[str, Any]:
+def detect_poker_character(image_path, use_paddle: bool = True) -> Dict[str, Any]:
     """
     识别扑克牌字符 - 主要接口
     
+    先用点数模板匹配（约1毫秒），匹配结果不确定或模板库不可用时再使用OCR
+    
     Args:
-        image_path: 图片路径（应该是_left.png文件）
+        image_path: 图片路径（应该是_left.png文件），或内存中的左上角区域/点数框numpy数组
         use_paddle: 是否优先使用PaddleOCR
         
     Returns:
         识别结果字典
     """
     try:
-        print(f"[OCR] 开始字符识别: {image_path}")
-        
-        # 检查文件是否存在
-        if not os.path.exists(image_path):
-            return {
-                "success": False,
-                "error": f"图片文件不存在: {image_path}",
-                "method": "ocr"
-            }
-        
-        # 验证是否是左上角图片
-        if not image_path.endswith('_left.png'):
-            print(f"[OCR] 警告: 建议使用左上角图片(_left.png)进行字符识别")
+        if isinstance(image_path, np.ndarray):
+            print(f"[OCR] 开始字符识别: 内存图片 {image_path.shape[1]}×{image_path.shape[0]}")
+        else:
+            print(f"[OCR] 开始字符识别: {image_path}")
+            
+            # 检查文件是否存在
+            if not os.path.exists(image_path):
+                return {
+                    "success": False,
+                    "error": f"图片文件不存在: {image_path}",
+                    "method": "ocr"
+                }
+            
+            # 验证是否是左上角图片
+            if not image_path.endswith('_left.png'):
+                print(f"[OCR] 警告: 建议使用左上角图片(_left.png)进行字符识别")
         
         results = []
         
+        # 快速路径：点数模板匹配
+        from src.processors.rank_template_matcher import match_rank_template
+        template_result = match_rank_template(image_path)
+        if template_result is not None:
+            if template_result["success"] and not template_result["ambiguous"]:
+                print(f"[OCR] 模板匹配成功: {template_result['character']} (分数: {template_result['confidence']:.3f})")
+                return template_result
+            if template_result["success"]:
+                print(f"[OCR] 模板匹配不确定: {template_result['candidates']}，改用OCR")
+            else:
+                results.append(template_result)
+        
         # 尝试PaddleOCR
         if use_paddle:
             print("[OCR] 尝试PaddleOCR...")
@@ -323,9 +667,9 @@ def detect_poker_character(image_path: str, use_paddle: bool = True) -> Dict[str
             return easy_result
         
         # 如果PaddleOCR有结果但置信度较低，返回它
-        if use_paddle and results and results[0]["success"]:
-            print(f"[OCR] 使用PaddleOCR低置信度结果: {results[0]['character']}")
-            return results[0]
+        if use_paddle and paddle_result["success"]:
+            print(f"[OCR] 使用PaddleOCR低置信度结果: {paddle_result['character']}")
+            return paddle_result
         
         # 所有方法都失败
         error_messages = [r.get("error", "未知错误") for r in results]
@@ -12,19 +12,19 @@ from typing import Dict, Any, Optional, Tuple, List
 import cv2
 import numpy as np
 
-def preprocess_image_for_suit(image_path: str) -> Tuple[np.ndarray, np.ndarray]:
+def preprocess_image_for_suit(image_path) -> Tuple[np.ndarray, np.ndarray]:
     """
     预处理图片以提取花色信息
     
     Args:
-        image_path: 图片路径
+        image_path: 图片路径，或内存中的numpy数组(BGR)，配置角标区域时只传入花色框
         
     Returns:
         (原图, HSV图)
     """
     try:
-        # 读取图片
-        image = cv2.imread(image_path)
+        # 读取图片（内存数组直接使用）
+        image = image_path if isinstance(image_path, np.ndarray) else cv2.imread(image_path)
         if image is None:
             raise ValueError(f"无法读取图片: {image_path}")
         
@@ -282,26 +282,29 @@ def classify_black_suit(shape_features: Dict[str, float]) -> str:
         print(f"[SUIT] 黑色花色分类失败: {e}")
         return "spades"  # 默认返回黑桃
 
-def detect_poker_suit(image_path: str) -> Dict[str, Any]:
+def detect_poker_suit(image_path) -> Dict[str, Any]:
     """
     识别扑克牌花色 - 主要接口
     
     Args:
-        image_path: 图片路径（建议使用_left.png文件）
+        image_path: 图片路径（建议使用_left.png文件），或内存中的左上角区域/花色框numpy数组(BGR)
         
     Returns:
         识别结果字典
     """
     try:
-        print(f"[SUIT] 开始花色识别: {image_path}")
-        
-        # 检查文件是否存在
-        if not os.path.exists(image_path):
-            return {
-                "success": False,
-                "error": f"图片文件不存在: {image_path}",
-                "method": "opencv_suit"
-            }
+        if isinstance(image_path, np.ndarray):
+            print(f"[SUIT] 开始花色识别: 内存图片 {image_path.shape[1]}×{image_path.shape[0]}")
+        else:
+            print(f"[SUIT] 开始花色识别: {image_path}")
+            
+            # 检查文件是否存在
+            if not os.path.exists(image_path):
+                return {
+                    "success": False,
+                    "error": f"图片文件不存在: {image_path}",
+                    "method": "opencv_suit"
+                }
         
         # 预处理图片
         original, hsv = preprocess_image_for_suit(image_path)
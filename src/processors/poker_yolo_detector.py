@@ -7,8 +7,11 @@ YOLO扑克牌识别器 - 基于YOLOv8的扑克牌识别
 
 import sys
 import os
+import time
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
+import numpy as np
 
 def get_project_root():
     """获取项目根目录"""
@@ -23,13 +26,16 @@ def get_project_root():
     
     return project_root
 
-def load_yolov8_model():
-    """加载YOLOv8模型"""
+def get_default_model_path() -> Path:
+    """获取默认YOLO模型路径"""
+    return get_project_root() / "src" / "config" / "yolov8" / "best.pt"
+
+def load_yolov8_model(model_path: Optional[str] = None):
+    """加载YOLOv8模型（每次调用都会重新加载，常规识别请使用 get_yolov8_model）"""
     try:
         from ultralytics import YOLO
         
-        project_root = get_project_root()
-        model_path = project_root / "src" / "config" / "yolov8" / "best.pt"
+        model_path = Path(model_path) if model_path else get_default_model_path()
         
         if not model_path.exists():
             raise FileNotFoundError(f"模型文件不存在: {model_path}")
@@ -44,6 +50,102 @@ def load_yolov8_model():
     except Exception as e:
         raise Exception(f"YOLO模型加载失败: {str(e)}")
 
+class YOLOModelRegistry:
+    """YOLO模型注册表 - 进程内每个权重文件只加载一次，文件修改时间变化时自动重新加载"""
+    
+    def __init__(self):
+        """初始化模型注册表"""
+        # {模型绝对路径: {'model': 模型实例, 'mtime': 文件修改时间, 'loaded_at': 加载时间, 'load_time': 加载耗时}}
+        self._models = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'loads': 0,
+            'reloads': 0,
+            'hits': 0
+        }
+    
+    def get_model(self, model_path: Optional[str] = None):
+        """
+        获取模型实例（首次调用或权重文件更新时加载）
+        
+        Args:
+            model_path: 模型路径，默认为 src/config/yolov8/best.pt
+            
+        Returns:
+            (模型实例, 模型路径)
+        """
+        model_path = Path(model_path) if model_path else get_default_model_path()
+        key = str(model_path.resolve())
+        
+        if not model_path.exists():
+            raise FileNotFoundError(f"模型文件不存在: {model_path}")
+        
+        mtime = model_path.stat().st_mtime
+        
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and entry['mtime'] == mtime:
+                self.stats['hits'] += 1
+                return entry['model'], key
+            
+            # 首次加载或权重文件已更新，在锁内加载，避免并发重复加载
+            if entry is not None:
+                print(f"[YOLO] 模型文件已更新，重新加载: {key}")
+            
+            start_time = time.time()
+            model, _ = load_yolov8_model(key)
+            load_time = time.time() - start_time
+            
+            self._models[key] = {
+                'model': model,
+                'mtime': mtime,
+                'loaded_at': time.time(),
+                'load_time': load_time
+            }
+            
+            if entry is None:
+                self.stats['loads'] += 1
+            else:
+                self.stats['reloads'] += 1
+            
+            print(f"[YOLO] 模型加载完成 (耗时: {load_time:.3f}s)")
+            return model, key
+    
+    def unload(self, model_path: Optional[str] = None) -> bool:
+        """卸载指定模型，未指定时卸载全部模型"""
+        with self._lock:
+            if model_path is None:
+                self._models.clear()
+                return True
+            
+            key = str(Path(model_path).resolve())
+            return self._models.pop(key, None) is not None
+    
+    def get_info(self) -> Dict[str, Any]:
+        """获取注册表状态信息"""
+        with self._lock:
+            return {
+                'models': {
+                    key: {
+                        'mtime': entry['mtime'],
+                        'loaded_at': entry['loaded_at'],
+                        'load_time': entry['load_time']
+                    }
+                    for key, entry in self._models.items()
+                },
+                'stats': self.stats.copy()
+            }
+
+# 全局模型注册表
+model_registry = YOLOModelRegistry()
+
+# 推理锁：ultralytics 的预测器内部状态不是线程安全的，多个摄像头并发识别时串行推理
+yolo_inference_lock = threading.Lock()
+
+def get_yolov8_model(model_path: Optional[str] = None):
+    """获取共享的YOLOv8模型实例（进程内复用）"""
+    return model_registry.get_model(model_path)
+
 def parse_yolo_results(results):
     """解析YOLO识别结果"""
     try:
@@ -162,32 +264,82 @@ def parse_card_name(class_name):
             "parsed": False
         }
 
-def detect_with_yolo(image_path: str, confidence_threshold: float = 0.3) -> Dict[str, Any]:
+def build_yolo_result(yolo_result: Dict[str, Any], confidence_threshold: float, model_path: str) -> Dict[str, Any]:
+    """
+    根据 parse_yolo_results 的解析结果构建检测结果字典
+    
+    Args:
+        yolo_result: parse_yolo_results 返回的解析结果
+        confidence_threshold: 置信度阈值
+        model_path: 模型路径
+        
+    Returns:
+        检测结果字典（与 detect_with_yolo 返回格式一致）
+    """
+    # 检查置信度
+    confidence = yolo_result["confidence"]
+    print(f"[YOLO] 检测置信度: {confidence:.3f}")
+    
+    if confidence < confidence_threshold:
+        return {
+            "success": False,
+            "error": f"置信度过低: {confidence:.3f} < {confidence_threshold}",
+            "confidence": confidence,
+            "method": "yolo",
+            "raw_class_name": yolo_result["class_name"]
+        }
+    
+    # 解析扑克牌信息
+    card_info = parse_card_name(yolo_result["class_name"])
+    
+    # 构建成功结果
+    return {
+        "success": True,
+        "suit": card_info["suit"],
+        "rank": card_info["rank"],
+        "suit_symbol": card_info["suit_symbol"],
+        "suit_name": card_info["suit_name"],
+        "display_name": card_info["display_name"],
+        "confidence": confidence,
+        "method": "yolo",
+        "model_info": {
+            "model_path": model_path,
+            "class_id": yolo_result["class_id"],
+            "class_name": yolo_result["class_name"],
+            "total_detections": yolo_result["total_detections"],
+            "parsed_successfully": card_info["parsed"]
+        }
+    }
+
+def detect_with_yolo(image_path, confidence_threshold: float = 0.3) -> Dict[str, Any]:
     """
     使用YOLO检测扑克牌
     
     Args:
-        image_path: 图片路径
+        image_path: 图片路径，或内存中的numpy数组(BGR)
         confidence_threshold: 置信度阈值，默认0.3 (30%)
         
     Returns:
         检测结果字典
     """
     try:
-        print(f"[YOLO] 开始识别: {image_path}")
-        
-        # 检查文件是否存在
-        if not os.path.exists(image_path):
-            return {
-                "success": False,
-                "error": f"图片文件不存在: {image_path}",
-                "confidence": 0.0,
-                "method": "yolo"
-            }
+        if isinstance(image_path, np.ndarray):
+            print(f"[YOLO] 开始识别: 内存图片 {image_path.shape[1]}×{image_path.shape[0]}")
+        else:
+            print(f"[YOLO] 开始识别: {image_path}")
+            
+            # 检查文件是否存在
+            if not os.path.exists(image_path):
+                return {
+                    "success": False,
+                    "error": f"图片文件不存在: {image_path}",
+                    "confidence": 0.0,
+                    "method": "yolo"
+                }
         
-        # 加载YOLO模型
+        # 获取YOLO模型（进程内共享，仅首次或权重更新时加载）
         try:
-            model, model_path = load_yolov8_model()
+            model, model_path = get_yolov8_model()
         except Exception as e:
             return {
                 "success": False,
@@ -199,7 +351,8 @@ def detect_with_yolo(image_path: str, confidence_threshold: float = 0.3) -> Dict
         # 执行推理
         try:
             print("[YOLO] 执行推理...")
-            results = model(image_path, verbose=False)
+            with yolo_inference_lock:
+                results = model(image_path, verbose=False)
         except Exception as e:
             return {
                 "success": False,
@@ -226,42 +379,10 @@ def detect_with_yolo(image_path: str, confidence_threshold: float = 0.3) -> Dict
                 "method": "yolo"
             }
         
-        # 检查置信度
-        confidence = yolo_result["confidence"]
-        print(f"[YOLO] 检测置信度: {confidence:.3f}")
-        
-        if confidence < confidence_threshold:
-            return {
-                "success": False,
-                "error": f"置信度过低: {confidence:.3f} < {confidence_threshold}",
-                "confidence": confidence,
-                "method": "yolo",
-                "raw_class_name": yolo_result["class_name"]
-            }
-        
-        # 解析扑克牌信息
-        card_info = parse_card_name(yolo_result["class_name"])
-        
-        # 构建成功结果
-        result = {
-            "success": True,
-            "suit": card_info["suit"],
-            "rank": card_info["rank"],
-            "suit_symbol": card_info["suit_symbol"],
-            "suit_name": card_info["suit_name"],
-            "display_name": card_info["display_name"],
-            "confidence": confidence,
-            "method": "yolo",
-            "model_info": {
-                "model_path": model_path,
-                "class_id": yolo_result["class_id"],
-                "class_name": yolo_result["class_name"],
-                "total_detections": yolo_result["total_detections"],
-                "parsed_successfully": card_info["parsed"]
-            }
-        }
+        result = build_yolo_result(yolo_result, confidence_threshold, model_path)
         
-        print(f"[YOLO] 识别成功: {result['display_name']} (置信度: {confidence:.3f})")
+        if result["success"]:
+            print(f"[YOLO] 识别成功: {result['display_name']} (置信度: {result['confidence']:.3f})")
         return result
         
     except Exception as e:
@@ -272,6 +393,108 @@ def detect_with_yolo(image_path: str, confidence_threshold: float = 0.3) -> Dict
             "method": "yolo"
         }
 
+def detect_with_yolo_batch(images: Dict[str, Any], confidence_threshold: float = 0.3) -> Dict[str, Dict[str, Any]]:
+    """
+    批量YOLO检测 - 一次前向推理处理多个裁剪图
+    
+    Args:
+        images: {键: 图片}，图片可以是内存中的numpy数组(BGR)或图片路径，
+                键通常为位置名称，如 {"zhuang_1": crop, "xian_1": crop}
+        confidence_threshold: 置信度阈值，默认0.3 (30%)
+        
+    Returns:
+        {键: 检测结果字典}，每个结果与 detect_with_yolo 返回格式一致
+    """
+    def error_results(error_message: str) -> Dict[str, Dict[str, Any]]:
+        return {
+            key: {
+                "success": False,
+                "error": error_message,
+                "confidence": 0.0,
+                "method": "yolo"
+            }
+            for key in images
+        }
+    
+    try:
+        if not images:
+            return {}
+        
+        keys = list(images.keys())
+        sources = [images[key] for key in keys]
+        
+        print(f"[YOLO] 批量识别: {len(keys)} 张图片")
+        
+        # 获取YOLO模型
+        try:
+            model, model_path = get_yolov8_model()
+        except Exception as e:
+            return error_results(f"YOLO模型加载失败: {str(e)}")
+        
+        # 单次批量推理
+        try:
+            with yolo_inference_lock:
+                results = model(sources, verbose=False)
+        except Exception as e:
+            return error_results(f"YOLO批量推理失败: {str(e)}")
+        
+        if results is None or len(results) != len(keys):
+            return error_results("YOLO批量推理结果数量不匹配")
+        
+        # 按顺序拆分每张图片的结果
+        batch_results = {}
+        for key, single_result in zip(keys, results):
+            try:
+                yolo_result = parse_yolo_results([single_result])
+                if yolo_result is None:
+                    batch_results[key] = {
+                        "success": False,
+                        "error": "未检测到扑克牌",
+                        "confidence": 0.0,
+                        "method": "yolo"
+                    }
+                else:
+                    batch_results[key] = build_yolo_result(yolo_result, confidence_threshold, model_path)
+            except Exception as e:
+                batch_results[key] = {
+                    "success": False,
+                    "error": f"结果解析失败: {str(e)}",
+                    "confidence": 0.0,
+                    "method": "yolo"
+                }
+        
+        success_count = sum(1 for r in batch_results.values() if r["success"])
+        print(f"[YOLO] 批量识别完成: {success_count}/{len(keys)} 成功")
+        return batch_results
+        
+    except Exception as e:
+        return error_results(f"YOLO批量识别异常: {str(e)}")
+
+def detect_cameras_with_yolo_batch(camera_images: Dict[str, Dict[str, Any]], 
+                                   confidence_threshold: float = 0.3) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    多摄像头批量YOLO检测 - 所有摄像头的所有位置合并为一次推理
+    
+    Args:
+        camera_images: {摄像头ID: {位置: 图片}}
+        confidence_threshold: 置信度阈值
+        
+    Returns:
+        {摄像头ID: {位置: 检测结果字典}}
+    """
+    flat_images = {}
+    for camera_id, position_images in camera_images.items():
+        for position, image in position_images.items():
+            flat_images[(camera_id, position)] = image
+    
+    flat_results = detect_with_yolo_batch(flat_images, confidence_threshold)
+    
+    camera_results = {camera_id: {} for camera_id in camera_images}
+    for (camera_id, position), result in flat_results.items():
+        camera_results[camera_id][position] = result
+    
+    return camera_results
+
 def test_yolo_detector():
     """测试YOLO检测器"""
     print("🧪 测试YOLO扑克牌检测器")
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扑克牌点数模板匹配器 - OCR之前的快速点数识别
+功能:
+1. 按牌面样式(deck style)从已标注的角标裁剪图构建模板库，保存为 src/config/rank_templates/<样式>.npz
+2. 识别时提取点数字符、缩放到模板尺寸，与全部模板做一次矩阵乘法得到归一化互相关分数
+3. 分数足够高且与第二名拉开差距时直接返回点数，否则交给OCR
+用法: python rank_template_matcher.py build <标注目录> [样式]
+     python rank_template_matcher.py match <图片路径>
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Iterable
+import cv2
+import numpy as np
+
+def setup_project_paths():
+    """设置项目路径"""
+    current_file = Path(__file__).resolve()
+    project_root = current_file
+    while project_root.parent != project_root:
+        if (project_root / "main.py").exists():
+            break
+        project_root = project_root.parent
+    
+    project_root_str = str(project_root)
+    if project_root_str not in sys.path:
+        sys.path.insert(0, project_root_str)
+    
+    return project_root
+
+PROJECT_ROOT = setup_project_paths()
+
+# 模板库目录
+TEMPLATE_DIR = PROJECT_ROOT / "src" / "config" / "rank_templates"
+
+# 13种点数（与OCR标准化后的字符一致）
+RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+
+# 模板匹配默认配置（可在 camera.json 的 system.rank_templates 中覆盖）
+DEFAULT_TEMPLATE_CONFIG = {
+    'enabled': True,
+    'style': 'default',          # 牌面样式，对应模板库文件名
+    'template_width': 24,        # 构建模板库时的模板尺寸（像素）
+    'template_height': 32,
+    'max_templates_per_rank': 20,  # 每种点数最多保留的样本模板数
+    'min_score': 0.7,            # 最高分低于该值视为不确定，交给OCR
+    'min_margin': 0.05           # 最高分与其他点数最高分的差距小于该值视为不确定
+}
+
+def extract_rank_glyph(image) -> Optional[np.ndarray]:
+    """
+    提取点数字符区域
+    
+    Args:
+        image: 点数框或左上角区域 numpy数组(BGR/灰度) 或图片路径
+    
+    Returns:
+        字符区域二值图（字符为255），未找到字符返回None
+    """
+    if isinstance(image, (str, Path)):
+        image = cv2.imread(str(image))
+    if image is None or image.size == 0:
+        return None
+    
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+    _, ink = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    
+    height, width = ink.shape
+    count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    
+    # 跳过噪点，以及几乎贯穿整图的边框/桌面区域
+    min_area = max(4, ink.size // 500)
+    components = [
+        stats[label] for label in range(1, count)
+        if stats[label][4] >= min_area and stats[label][3] < height * 0.9 and stats[label][2] < width * 0.9
+    ]
+    if not components:
+        return None
+    
+    # 点数在角标最上方：取足够高的连通域中最靠上的一个
+    max_height = max(component[3] for component in components)
+    anchor = min((c for c in components if c[3] >= max_height * 0.5), key=lambda c: c[1])
+    x0, y0, x1, y1 = anchor[0], anchor[1], anchor[0] + anchor[2], anchor[1] + anchor[3]
+    
+    # 合并同一行相邻的连通域（"10" 由两个字符组成）
+    for x, y, w, h, _ in components:
+        overlap = min(y1, y + h) - max(y0, y)
+        gap = max(x - x1, x0 - (x + w))
+        if overlap >= min(h, anchor[3]) * 0.5 and gap <= anchor[3]:
+            x0, y0, x1, y1 = min(x0, x), min(y0, y), max(x1, x + w), max(y1, y + h)
+    
+    return ink[y0:y1, x0:x1]
+
+def glyph_vector(glyph: np.ndarray, template_size: Tuple[int, int]) -> Optional[np.ndarray]:
+    """
+    字符缩放到模板尺寸并归一化为零均值单位长度向量（点积即归一化互相关）
+    
+    Args:
+        glyph: extract_rank_glyph 的结果
+        template_size: (宽, 高)
+    
+    Returns:
+        一维float32向量，字符为空或无变化时返回None
+    """
+    resized = cv2.resize(glyph, template_size, interpolation=cv2.INTER_AREA)
+    vector = resized.astype(np.float32).ravel()
+    vector -= vector.mean()
+    norm = float(np.linalg.norm(vector))
+    if norm < 1e-6:
+        return None
+    return vector / norm
+
+class RankTemplateMatcher:
+    """点数模板匹配器"""
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """初始化匹配器（模板库首次匹配时加载）"""
+        self.config = DEFAULT_TEMPLATE_CONFIG.copy()
+        if config:
+            self.config.update(config)
+        
+        self._bank = None        # {'templates': (N, D), 'label_index': (N,), 'size': (宽, 高), 'mtime'}
+        self._bank_signature = None  # 已加载模板库文件的 (修改时间ns, 大小)，文件不存在为None
+        self._loaded = False
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'matched': 0,
+            'ambiguous': 0,
+            'no_glyph': 0
+        }
+    
+    @property
+    def bank_path(self) -> Path:
+        """当前样式的模板库文件"""
+        return TEMPLATE_DIR / f"{self.config['style']}.npz"
+    
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """模板库文件的 (修改时间ns, 大小)，文件不存在返回None"""
+        try:
+            stat_result = self.bank_path.stat()
+        except OSError:
+            return None
+        return (stat_result.st_mtime_ns, stat_result.st_size)
+    
+    def _ensure_bank(self) -> Optional[Dict[str, Any]]:
+        """加载模板库（文件重建、出现或删除后自动重新加载），文件不存在或格式无效返回None"""
+        signature = self._file_signature()
+        if self._loaded and signature == self._bank_signature:
+            return self._bank
+        
+        with self._lock:
+            if self._loaded and signature == self._bank_signature:
+                return self._bank
+            
+            bank = None
+            if signature is not None:
+                try:
+                    with np.load(self.bank_path) as data:
+                        labels = [str(label) for label in data['labels']]
+                        bank = {
+                            'templates': data['templates'].astype(np.float32),
+                            'label_index': np.array([RANKS.index(label) for label in labels], dtype=np.intp),
+                            'size': (int(data['size'][0]), int(data['size'][1])),
+                            'mtime': signature[0]
+                        }
+                    print(f"✅ 点数模板库加载完成: {self.bank_path.name} ({len(labels)} 个模板)")
+                except Exception as e:
+                    print(f"⚠️  点数模板库加载失败: {e}")
+                    bank = None
+            
+            self._bank = bank
+            self._bank_signature = signature
+            self._loaded = True
+            return bank
+    
+    def reload(self):
+        """丢弃已加载的模板库，下次匹配时重新读取"""
+        with self._lock:
+            self._bank = None
+            self._loaded = False
+    
+    def is_available(self) -> bool:
+        """模板匹配是否可用（已启用且模板库存在）"""
+        return bool(self.config['enabled']) and self._ensure_bank() is not None
+    
+    def get_version(self) -> str:
+        """模板库版本（用于识别结果缓存键，模板库文件变化时随之变化），不可用时为 '0'"""
+        bank = self._ensure_bank() if self.config['enabled'] else None
+        if bank is None:
+            return '0'
+        return f"{self.config['style']}@{bank['mtime']}"
+    
+    def match(self, image) -> Optional[Dict[str, Any]]:
+        """
+        匹配点数
+        
+        Args:
+            image: 点数框或左上角区域 numpy数组(BGR/灰度) 或图片路径
+        
+        Returns:
+            {'success', 'character', 'confidence', 'margin', 'ambiguous', 'candidates', 'method'}，
+            模板匹配不可用时返回None
+        """
+        bank = self._ensure_bank() if self.config['enabled'] else None
+        if bank is None:
+            return None
+        
+        glyph = extract_rank_glyph(image)
+        vector = glyph_vector(glyph, bank['size']) if glyph is not None and glyph.size else None
+        if vector is None:
+            self.stats['no_glyph'] += 1
+            return {"success": False, "error": "模板匹配未找到点数字符", "method": "template"}
+        
+        # 每种点数取其所有模板中的最高分
+        scores = bank['templates'] @ vector
+        rank_scores = np.full(len(RANKS), -1.0, dtype=np.float32)
+        np.maximum.at(rank_scores, bank['label_index'], scores)
+        
+        order = np.argsort(rank_scores)[::-1]
+        best, second = float(rank_scores[order[0]]), float(rank_scores[order[1]])
+        margin = best - second
+        ambiguous = best < self.config['min_score'] or margin < self.config['min_margin']
+        self.stats['ambiguous' if ambiguous else 'matched'] += 1
+        
+        return {
+            "success": True,
+            "character": RANKS[order[0]],
+            "confidence": max(0.0, best),
+            "margin": margin,
+            "ambiguous": ambiguous,
+            "candidates": [(RANKS[index], round(float(rank_scores[index]), 3)) for index in order[:3]],
+            "method": "template"
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取匹配统计"""
+        bank = self._bank
+        total = self.stats['matched'] + self.stats['ambiguous'] + self.stats['no_glyph']
+        return {
+            'config': self.config.copy(),
+            'bank': self.bank_path.name if bank is not None else None,
+            'templates': int(bank['templates'].shape[0]) if bank is not None else 0,
+            'matched': self.stats['matched'],
+            'ambiguous': self.stats['ambiguous'],
+            'no_glyph': self.stats['no_glyph'],
+            'fast_path_rate': round(self.stats['matched'] / total * 100, 1) if total > 0 else 0.0
+        }
+
+def build_template_bank(samples: Iterable[Tuple[str, Any]], style: str,
+                        config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    由已标注样本构建模板库并保存
+    
+    Args:
+        samples: [(点数, 点数框/左上角图片数组或路径), ...]
+        style: 牌面样式（模板库文件名）
+        config: 模板配置（默认读取 camera.json）
+    
+    Returns:
+        {'success', 'path', 'templates', 'per_rank', 'skipped'}
+    """
+    config = dict(DEFAULT_TEMPLATE_CONFIG, **(config if config is not None else load_template_config()))
+    size = (int(config['template_width']), int(config['template_height']))
+    limit = int(config['max_templates_per_rank'])
+    
+    per_rank = {rank: [] for rank in RANKS}
+    skipped = 0
+    for rank, image in samples:
+        if rank not in per_rank:
+            skipped += 1
+            continue
+        glyph = extract_rank_glyph(image)
+        vector = glyph_vector(glyph, size) if glyph is not None and glyph.size else None
+        if vector is None or len(per_rank[rank]) >= limit:
+            skipped += 1
+            continue
+        per_rank[rank].append(vector)
+    
+    labels = [rank for rank in RANKS for _ in per_rank[rank]]
+    if not labels:
+        return {"success": False, "error": "没有可用的标注样本", "skipped": skipped}
+    
+    TEMPLATE_DIR.mkdir(parents=True, exist_ok=True)
+    path = TEMPLATE_DIR / f"{style}.npz"
+    np.savez_compressed(
+        path,
+        templates=np.stack([vector for rank in RANKS for vector in per_rank[rank]]).astype(np.float32),
+        labels=np.array(labels),
+        size=np.array(size)
+    )
+    
+    return {
+        "success": True,
+        "path": str(path),
+        "templates": len(labels),
+        "per_rank": {rank: len(vectors) for rank, vectors in per_rank.items()},
+        "skipped": skipped
+    }
+
+def iter_labelled_dir(labelled_dir: str) -> Iterable[Tuple[str, Path]]:
+    """遍历标注目录（<目录>/<点数>/*.png），子目录名即点数"""
+    for rank_dir in sorted(Path(labelled_dir).iterdir()):
+        if rank_dir.is_dir():
+            for image_path in sorted(rank_dir.glob('*.png')) + sorted(rank_dir.glob('*.jpg')):
+                yield rank_dir.name.upper(), image_path
+
+def load_template_config() -> Dict[str, Any]:
+    """从 camera.json 的 system.rank_templates 读取配置"""
+    try:
+        from src.core.camera_config_store import get_camera_config_store
+        return get_camera_config_store().get_section('rank_templates')
+    except Exception as e:
+        print(f"⚠️  读取模板匹配配置失败: {e}")
+        return {}
+
+# ============ 供其他模块调用的函数接口 ============
+
+# 全局匹配器（首次使用时创建）
+_rank_matcher = None
+_rank_matcher_lock = threading.Lock()
+
+def get_rank_matcher() -> RankTemplateMatcher:
+    """获取全局点数模板匹配器"""
+    global _rank_matcher
+    if _rank_matcher is None:
+        with _rank_matcher_lock:
+            if _rank_matcher is None:
+                _rank_matcher = RankTemplateMatcher(load_template_config())
+    return _rank_matcher
+
+def match_rank_template(image) -> Optional[Dict[str, Any]]:
+    """模板匹配点数，模板匹配不可用时返回None"""
+    return get_rank_matcher().match(image)
+
+def get_rank_template_version() -> str:
+    """模板库版本"""
+    return get_rank_matcher().get_version()
+
+def build_rank_templates(labelled_dir: str, style: Optional[str] = None) -> Dict[str, Any]:
+    """
+    由标注目录构建模板库，构建后全局匹配器重新加载
+    
+    Args:
+        labelled_dir: 标注目录（<目录>/<点数>/*.png）
+        style: 牌面样式，默认使用配置中的样式
+    """
+    config = load_template_config()
+    style = style or config.get('style', DEFAULT_TEMPLATE_CONFIG['style'])
+    result = build_template_bank(iter_labelled_dir(labelled_dir), style, config)
+    get_rank_matcher().reload()
+    return result
+
+def get_rank_template_stats() -> Dict[str, Any]:
+    """获取模板匹配统计"""
+    return get_rank_matcher().get_stats()
+
+def main():
+    """命令行入口"""
+    if len(sys.argv) >= 3 and sys.argv[1] == 'build':
+        result = build_rank_templates(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        if result['success']:
+            print(f"✅ 模板库已保存: {result['path']} ({result['templates']} 个模板, 跳过 {result['skipped']} 个样本)")
+            for rank, count in result['per_rank'].items():
+                print(f"   {rank}: {count}")
+        else:
+            print(f"❌ 构建失败: {result['error']}")
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'match':
+        result = match_rank_template(sys.argv[2])
+        if result is None:
+            print(f"❌ 模板库不可用: {get_rank_matcher().bank_path}")
+        elif result['success']:
+            status = "⚠️  不确定" if result['ambiguous'] else "✅"
+            print(f"{status} 点数: {result['character']} (分数: {result['confidence']:.3f}, 差距: {result['margin']:.3f})")
+            print(f"   候选: {result['candidates']}")
+        else:
+            print(f"❌ {result['error']}")
+    else:
+        print("用法: python rank_template_matcher.py build <标注目录> [样式]")
+        print("     python rank_template_matcher.py match <图片路径>")
+
+if __name__ == "__main__":
+    main()
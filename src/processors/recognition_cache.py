@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+识别结果缓存 - 以裁剪图内容哈希为键的LRU缓存
+功能:
+1. 键 = 裁剪图像素哈希(blake2b) + 尺寸 + 识别引擎/配置版本
+2. 按条目数(LRU)和存活时间(TTL)淘汰
+3. 命中率统计，定期写出快照供HTTP接口查询（识别进程与Web服务进程分离）
+"""
+
+import sys
+import json
+import time
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+import numpy as np
+
+def setup_project_paths():
+    """设置项目路径"""
+    current_file = Path(__file__).resolve()
+    project_root = current_file
+    while project_root.parent != project_root:
+        if (project_root / "main.py").exists():
+            break
+        project_root = project_root.parent
+    
+    project_root_str = str(project_root)
+    if project_root_str not in sys.path:
+        sys.path.insert(0, project_root_str)
+    
+    return project_root
+
+PROJECT_ROOT = setup_project_paths()
+
+# 缓存格式版本，识别逻辑变化导致旧结果失效时递增
+CACHE_FORMAT_VERSION = 1
+
+# 缓存默认配置（可在 camera.json 的 system.recognition_cache 中覆盖）
+DEFAULT_CACHE_CONFIG = {
+    'enabled': True,
+    'max_entries': 2048,       # 最大条目数
+    'ttl': 300.0,              # 条目存活时间(秒)
+    'stats_interval': 5.0      # 统计快照写出间隔(秒)
+}
+
+# 统计快照文件
+STATS_SNAPSHOT_FILE = PROJECT_ROOT / "src" / "result" / "recognition_cache_stats.json"
+
+def hash_image(image) -> Optional[bytes]:
+    """
+    计算图片内容哈希
+    
+    Args:
+        image: numpy数组（按像素和尺寸哈希）或图片路径（按文件内容哈希）
+    
+    Returns:
+        16字节摘要，图片不可用时返回None
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    
+    if image is None:
+        return None
+    
+    if isinstance(image, np.ndarray):
+        hasher.update(str(image.shape).encode())
+        hasher.update(image.dtype.str.encode())
+        # 非连续视图（如旋转后的切片）先转为连续内存再哈希
+        hasher.update(np.ascontiguousarray(image).data)
+        return hasher.digest()
+    
+    try:
+        with open(image, 'rb') as f:
+            hasher.update(f.read())
+        return hasher.digest()
+    except OSError:
+        return None
+
+class RecognitionCache:
+    """识别结果LRU缓存"""
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """初始化缓存"""
+        self.config = DEFAULT_CACHE_CONFIG.copy()
+        if config:
+            self.config.update(config)
+        
+        self._entries = OrderedDict()  # {键: (写入时间, 结果)}
+        self._lock = threading.Lock()
+        self._last_snapshot = 0.0
+        
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'evicted': 0,
+            'stores': 0
+        }
+    
+    def make_key(self, main_image, left_image, engine_version: str,
+                 corner_images: tuple = ()) -> Optional[str]:
+        """
+        生成缓存键
+        
+        Args:
+            main_image: 主图片（数组或路径）
+            left_image: 左上角图片（数组或路径，可为None）
+            engine_version: 识别引擎/配置版本
+            corner_images: 点数框/花色框数组（角标区域配置不同时识别输入不同）
+        
+        Returns:
+            缓存键，主图片不可用时返回None
+        """
+        main_digest = hash_image(main_image)
+        if main_digest is None:
+            return None
+        
+        left_digest = hash_image(left_image) if left_image is not None else b''
+        key = f"{CACHE_FORMAT_VERSION}:{engine_version}:{main_digest.hex()}:{(left_digest or b'').hex()}"
+        
+        corner_digests = [hash_image(image) for image in corner_images if image is not None]
+        if corner_digests:
+            key += ':' + ':'.join(digest.hex() for digest in corner_digests)
+        return key
+    
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """查找缓存结果（返回副本），未命中或已过期返回None"""
+        if key is None:
+            return None
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                result = None
+            elif time.time() - entry[0] > self.config['ttl']:
+                del self._entries[key]
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                result = None
+            else:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                result = entry[1]
+        
+        self._maybe_save_snapshot()
+        return copy.deepcopy(result) if result is not None else None
+    
+    def put(self, key: Optional[str], result: Dict[str, Any]):
+        """写入缓存结果，超过容量时淘汰最久未使用的条目"""
+        if key is None:
+            return
+        
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            self.stats['stores'] += 1
+            
+            while len(self._entries) > self.config['max_entries']:
+                self._entries.popitem(last=False)
+                self.stats['evicted'] += 1
+    
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                'enabled': self.config['enabled'],
+                'entries': len(self._entries),
+                'max_entries': self.config['max_entries'],
+                'ttl': self.config['ttl'],
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'expired': self.stats['expired'],
+                'evicted': self.stats['evicted'],
+                'stores': self.stats['stores'],
+                'hit_rate': round(self.stats['hits'] / lookups * 100, 1) if lookups > 0 else 0.0,
+                'updated_at': time.strftime('%Y-%m-%d %H:%M:%S')
+            }
+    
+    def _maybe_save_snapshot(self):
+        """按间隔写出统计快照"""
+        now = time.time()
+        if now - self._last_snapshot < self.config['stats_interval']:
+            return
+        self._last_snapshot = now
+        
+        try:
+            STATS_SNAPSHOT_FILE.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = STATS_SNAPSHOT_FILE.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.get_stats(), f, ensure_ascii=False, indent=2)
+            temp_file.replace(STATS_SNAPSHOT_FILE)
+        except Exception:
+            pass
+
+def load_cache_config() -> Dict[str, Any]:
+    """从 camera.json 的 system.recognition_cache 读取配置"""
+    try:
+        from src.core.camera_config_store import get_camera_config_store
+        return get_camera_config_store().get_section('recognition_cache')
+    except Exception as e:
+        print(f"⚠️  读取识别缓存配置失败: {e}")
+        return {}
+
+# ============ 供其他模块调用的函数接口 ============
+
+# 全局识别缓存（首次使用时创建）
+_recognition_cache = None
+_recognition_cache_lock = threading.Lock()
+
+def get_recognition_cache() -> RecognitionCache:
+    """获取全局识别缓存"""
+    global _recognition_cache
+    if _recognition_cache is None:
+        with _recognition_cache_lock:
+            if _recognition_cache is None:
+                _recognition_cache = RecognitionCache(load_cache_config())
+    return _recognition_cache
+
+def get_recognition_cache_stats() -> Dict[str, Any]:
+    """
+    获取识别缓存统计
+    
+    当前进程有缓存访问时返回实时统计，否则读取识别进程写出的快照
+    
+    Returns:
+        dict: 统计数据，附带 source 字段 ('live' 或 'snapshot')
+    """
+    stats = get_recognition_cache().get_stats()
+    if stats['hits'] + stats['misses'] > 0:
+        stats['source'] = 'live'
+        return stats
+    
+    try:
+        if STATS_SNAPSHOT_FILE.exists():
+            with open(STATS_SNAPSHOT_FILE, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            snapshot['source'] = 'snapshot'
+            return snapshot
+    except Exception:
+        pass
+    
+    stats['source'] = 'live'
+    return stats
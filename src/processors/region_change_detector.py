@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+区域变化检测器 - 在切图和识别之间判断扑克牌区域是否变化
+功能:
+1. 每个摄像头每个标记位置保留一个低分辨率灰度指纹
+2. 指纹平均差异低于阈值时视为未变化，直接复用上次识别结果
+3. 复用结果有最长有效期，到期后强制重新识别
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+import cv2
+import numpy as np
+
+def setup_project_paths():
+    """设置项目路径"""
+    current_file = Path(__file__).resolve()
+    project_root = current_file
+    while project_root.parent != project_root:
+        if (project_root / "main.py").exists():
+            break
+        project_root = project_root.parent
+    
+    project_root_str = str(project_root)
+    if project_root_str not in sys.path:
+        sys.path.insert(0, project_root_str)
+    
+    return project_root
+
+PROJECT_ROOT = setup_project_paths()
+
+# 变化检测默认配置（可在 camera.json 的 system.change_detection 中覆盖）
+DEFAULT_CHANGE_DETECTION_CONFIG = {
+    'enabled': True,        # 启用变化检测
+    'fingerprint_size': 16, # 指纹边长（像素）
+    'threshold': 4.0,       # 平均灰度差阈值（0-255），低于该值视为未变化
+    'max_age': 30.0         # 复用结果的最长有效期(秒)
+}
+
+class RegionChangeDetector:
+    """区域变化检测器"""
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """初始化检测器"""
+        self.config = DEFAULT_CHANGE_DETECTION_CONFIG.copy()
+        if config:
+            self.config.update(config)
+        
+        self._regions = {}  # {(摄像头ID, 位置): {'fingerprint', 'result', 'updated_at', 'crop_rect'}}
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'unchanged': 0,
+            'changed': 0,
+            'expired': 0
+        }
+    
+    def fingerprint(self, image) -> Optional[Dict[str, Any]]:
+        """
+        计算区域指纹：灰度化后缩小到 fingerprint_size × fingerprint_size
+        
+        Args:
+            image: 区域图片 numpy数组(BGR/灰度) 或图片路径
+        
+        Returns:
+            指纹 {'pixels': 缩小后的灰度数组(float32), 'shape': 原区域尺寸}，读取失败返回None
+        """
+        if isinstance(image, (str, Path)):
+            image = cv2.imread(str(image))
+        if image is None or image.size == 0:
+            return None
+        
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        size = int(self.config['fingerprint_size'])
+        # INTER_AREA 取区域均值，对噪点和轻微抖动不敏感
+        small = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA)
+        # 记录原区域尺寸，标记位置调整后尺寸变化即视为区域变化
+        return {'pixels': small.astype(np.float32), 'shape': gray.shape[:2]}
+    
+    def _current_crop_rect(self, camera_id: str, position: str) -> Optional[tuple]:
+        """标记位置当前的裁剪矩形（标记移动或调整大小后与指纹记录的不同，视为区域变化）"""
+        try:
+            from src.core.camera_config_store import get_crop_rect
+            return get_crop_rect(camera_id, position)
+        except Exception:
+            return None
+    
+    def lookup(self, camera_id: str, position: str, fingerprint: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        查找未变化区域的上次识别结果
+        
+        Args:
+            camera_id: 摄像头ID
+            position: 位置名称
+            fingerprint: 当前区域指纹
+        
+        Returns:
+            上次识别结果（区域未变化且未过期），否则返回None
+        """
+        if fingerprint is None:
+            return None
+        
+        crop_rect = self._current_crop_rect(camera_id, position)
+        with self._lock:
+            region = self._regions.get((camera_id, position))
+            if (region is None or region['crop_rect'] != crop_rect
+                    or region['fingerprint']['shape'] != fingerprint['shape']):
+                self.stats['changed'] += 1
+                return None
+            
+            if time.time() - region['updated_at'] > self.config['max_age']:
+                self.stats['expired'] += 1
+                return None
+            
+            difference = float(np.mean(np.abs(region['fingerprint']['pixels'] - fingerprint['pixels'])))
+            if difference >= self.config['threshold']:
+                self.stats['changed'] += 1
+                return None
+            
+            self.stats['unchanged'] += 1
+            return region['result']
+    
+    def update(self, camera_id: str, position: str, fingerprint: Optional[Dict[str, Any]], result: Dict[str, Any]):
+        """记录区域指纹和识别结果"""
+        if fingerprint is None:
+            return
+        
+        crop_rect = self._current_crop_rect(camera_id, position)
+        with self._lock:
+            self._regions[(camera_id, position)] = {
+                'fingerprint': fingerprint,
+                'result': result,
+                'updated_at': time.time(),
+                'crop_rect': crop_rect
+            }
+    
+    def reset(self, camera_id: Optional[str] = None):
+        """清除指纹记录（指定摄像头或全部）；标记位置调整后旧指纹会自动作废，无需调用"""
+        with self._lock:
+            if camera_id is None:
+                self._regions.clear()
+            else:
+                for key in [key for key in self._regions if key[0] == camera_id]:
+                    del self._regions[key]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取检测统计"""
+        with self._lock:
+            total = self.stats['unchanged'] + self.stats['changed'] + self.stats['expired']
+            return {
+                'config': self.config.copy(),
+                'regions': len(self._regions),
+                'unchanged': self.stats['unchanged'],
+                'changed': self.stats['changed'],
+                'expired': self.stats['expired'],
+                'reuse_rate': round(self.stats['unchanged'] / total * 100, 1) if total > 0 else 0.0
+            }
+
+def load_change_detection_config() -> Dict[str, Any]:
+    """从 camera.json 的 system.change_detection 读取配置"""
+    try:
+        from src.core.camera_config_store import get_camera_config_store
+        return get_camera_config_store().get_section('change_detection')
+    except Exception as e:
+        print(f"⚠️  读取变化检测配置失败: {e}")
+        return {}
+
+# ============ 供其他模块调用的函数接口 ============
+
+# 全局变化检测器（首次使用时创建）
+_change_detector = None
+_change_detector_lock = threading.Lock()
+
+def get_change_detector() -> RegionChangeDetector:
+    """获取全局变化检测器"""
+    global _change_detector
+    if _change_detector is None:
+        with _change_detector_lock:
+            if _change_detector is None:
+                _change_detector = RegionChangeDetector(load_change_detection_config())
+    return _change_detector
+
+def reset_change_detector(camera_id: Optional[str] = None):
+    """清除变化检测记录"""
+    get_change_detector().reset(camera_id)
+
+def get_change_detection_stats() -> Dict[str, Any]:
+    """获取变化检测统计"""
+    return get_change_detector().get_stats()
@@ -10,6 +10,7 @@ import sys
 import json
 import time
 import argparse
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
 
@@ -20,8 +21,10 @@ def parse_args():
     """解析命令行参数"""
     parser = argparse.ArgumentParser(description='极简扑克识别工具')
     parser.add_argument('--camera', type=str, required=True, help='摄像头ID (如: 001)')
+    parser.add_argument('--in-memory', action='store_true', help='内存模式: 抓帧、切图、识别全程不写中间图片')
+    parser.add_argument('--debug-dir', type=str, default=None, help='内存模式下的调试输出目录（可选）')
     args = parser.parse_args()
-    return args.camera
+    return args
 
 def print_error_and_exit(error_msg, details=None):
     """输出错误JSON并退出"""
@@ -87,7 +90,52 @@ def cut_image(camera_id):
     except Exception as e:
         print_error_and_exit("切图异常", str(e))
 
-def recognize_single_position(camera_id, position):
+def format_position_result(result):
+    """识别器结果转换为位置结果"""
+    if result["success"]:
+        return {
+            "success": True,
+            "card": result.get("display_name", "未知"),
+            "confidence": result.get("confidence", 0.0)
+        }
+    else:
+        return {
+            "success": False,
+            "error": result.get("error", "识别失败")
+        }
+
+def load_corner_images(camera_id, position, main_image):
+    """
+    配置了角标区域时，从切图文件切出点数框和花色框（与内存切图一致）
+    
+    Args:
+        camera_id: 摄像头ID
+        position: 位置名称
+        main_image: 切图文件路径
+        
+    Returns:
+        (主图片, 点数框, 花色框)，配置了角标区域时主图片为已读取的数组，否则为 (路径, None, None)
+    """
+    try:
+        from src.core.camera_config_store import get_camera_profile
+        
+        profile = get_camera_profile(camera_id)
+        if not profile or position not in profile.get('corner_rois', {}):
+            return str(main_image), None, None
+        
+        import cv2
+        from src.processors.image_cutter import cut_corner_views
+        
+        main = cv2.imread(str(main_image))
+        if main is None:
+            return str(main_image), None, None
+        rank, suit = cut_corner_views(camera_id, position, main)
+        return main, rank, suit
+        
+    except Exception:
+        return str(main_image), None, None
+
+def recognize_single_position(camera_id, position, yolo_result=None):
     """识别单个位置 - 直接调用函数"""
     try:
         from src.processors.poker_hybrid_recognizer import recognize_single_card_silent
@@ -103,21 +151,94 @@ def recognize_single_position(camera_id, position):
                 "error": "图片不存在"
             }
         
-        # 调用识别函数
+        # 调用识别函数（配置了角标区域时，OCR/花色识别只处理点数框和花色框）
         left_path = str(left_image) if left_image.exists() else None
-        result = recognize_single_card_silent(str(main_image), left_path)
+        main, rank, suit = load_corner_images(camera_id, position, main_image)
+        result = recognize_single_card_silent(main, left_path, yolo_result, rank_image=rank, suit_image=suit)
         
-        if result["success"]:
-            return {
-                "success": True,
-                "card": result.get("display_name", "未知"),
-                "confidence": result.get("confidence", 0.0)
-            }
-        else:
+        return format_position_result(result)
+            
+    except ImportError as e:
+        return {
+            "success": False,
+            "error": f"识别模块导入失败: {str(e)}"
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+def batch_recognize_yolo(camera_id, positions=None):
+    """批量YOLO识别所有位置（或指定位置） - 失败时返回空字典，由单张识别兜底"""
+    try:
+        from src.processors.poker_hybrid_recognizer import batch_recognize_yolo_silent
+        
+        images = {}
+        for position in (POSITIONS if positions is None else positions):
+            main_image = PROJECT_ROOT / "src" / "image" / "cut" / f"camera_{camera_id}_{position}.png"
+            if main_image.exists():
+                images[position] = str(main_image)
+        
+        return batch_recognize_yolo_silent(images)
+        
+    except Exception:
+        return {}
+
+def capture_and_cut_in_memory(camera_id, debug_dir=None):
+    """
+    内存模式拍照+切图 - 画面与裁剪区域都保留在内存中
+    
+    Args:
+        camera_id: 摄像头ID
+        debug_dir: 调试输出目录（可选），提供时写出整帧画面和裁剪图
+        
+    Returns:
+        dict: {"success": bool, "error": str, "crops": {位置: {"main": 数组, "left": 数组}}}
+    """
+    try:
+        from src.processors.photo_controller import capture_frame_silent
+        from src.processors.image_cutter import cut_frame_silent
+        
+        capture_result = capture_frame_silent(camera_id)
+        if not capture_result["success"]:
+            return {"success": False, "error": "拍照失败", "crops": {}}
+        
+        frame = capture_result["frame"]
+        if debug_dir:
+            import cv2
+            Path(debug_dir).mkdir(parents=True, exist_ok=True)
+            cv2.imwrite(str(Path(debug_dir) / f"camera_{camera_id}.png"), frame)
+        
+        cut_result = cut_frame_silent(frame, camera_id, debug_dir)
+        if not cut_result["success"]:
+            return {"success": False, "error": "切图失败", "crops": {}}
+        
+        return {"success": True, "error": "", "crops": cut_result["crops"]}
+        
+    except ImportError as e:
+        return {"success": False, "error": f"模块导入失败: {str(e)}", "crops": {}}
+    except Exception as e:
+        return {"success": False, "error": f"内存切图异常: {str(e)}", "crops": {}}
+
+def recognize_crop(crop, yolo_result=None):
+    """识别内存中的单个位置裁剪区域"""
+    try:
+        from src.processors.poker_hybrid_recognizer import recognize_single_card_silent
+        
+        if crop is None:
             return {
                 "success": False,
-                "error": result.get("error", "识别失败")
+                "error": "图片不存在"
             }
+        
+        # 配置了角标区域时，OCR/花色识别只处理点数框和花色框
+        result = recognize_single_card_silent(
+            crop["main"], crop["left"], yolo_result,
+            rank_image=crop.get("rank"), suit_image=crop.get("suit")
+        )
+        
+        return format_position_result(result)
             
     except ImportError as e:
         return {
@@ -130,14 +251,224 @@ def recognize_single_position(camera_id, position):
             "error": str(e)
         }
 
-def recognize_all_positions(camera_id):
-    """识别所有位置"""
+def batch_recognize_yolo_crops(crops):
+    """批量YOLO识别内存中的裁剪区域 - 失败时返回空字典，由单张识别兜底"""
+    try:
+        from src.processors.poker_hybrid_recognizer import batch_recognize_yolo_silent
+        
+        return batch_recognize_yolo_silent({position: crop["main"] for position, crop in crops.items()})
+        
+    except Exception:
+        return {}
+
+def detect_unchanged_positions(camera_id, crops=None):
+    """
+    变化检测 - 计算各位置区域指纹，找出画面未变化、可直接复用上次结果的位置
+    
+    Args:
+        camera_id: 摄像头ID
+        crops: 内存切图结果（为None时读取切图文件）
+        
+    Returns:
+        (复用结果 {位置: 上次结果}, 指纹 {位置: 指纹})，变化检测禁用或失败时返回两个空字典
+    """
+    try:
+        from src.processors.region_change_detector import get_change_detector
+        
+        detector = get_change_detector()
+        if not detector.config.get('enabled', True):
+            return {}, {}
+        
+        reused = {}
+        fingerprints = {}
+        for position in POSITIONS:
+            if crops is None:
+                image = PROJECT_ROOT / "src" / "image" / "cut" / f"camera_{camera_id}_{position}.png"
+                if not image.exists():
+                    continue
+            else:
+                if position not in crops:
+                    continue
+                image = crops[position]["main"]
+            
+            fingerprint = detector.fingerprint(image)
+            fingerprints[position] = fingerprint
+            
+            previous = detector.lookup(camera_id, position, fingerprint)
+            if previous is not None:
+                reused[position] = dict(previous, unchanged=True)
+        
+        return reused, fingerprints
+        
+    except Exception:
+        return {}, {}
+
+def detect_empty_positions(camera_id, positions, crops=None):
+    """
+    存在检测 - 在识别引擎之前找出没有牌的位置
+    
+    Args:
+        camera_id: 摄像头ID
+        positions: 待检测的位置列表
+        crops: 内存切图结果（为None时读取切图文件）
+        
+    Returns:
+        (空位结果 {位置: 识别失败结果}, 不确定位置 {位置: 图片})，存在检测禁用或失败时返回两个空字典
+    """
+    try:
+        from src.processors.card_presence_detector import get_presence_detector
+        
+        detector = get_presence_detector()
+        if not detector.config.get('enabled', True):
+            return {}, {}
+        
+        empty = {}
+        uncertain = {}
+        for position in positions:
+            if crops is None:
+                image = PROJECT_ROOT / "src" / "image" / "cut" / f"camera_{camera_id}_{position}.png"
+                if not image.exists():
+                    continue
+            else:
+                if position not in crops:
+                    continue
+                image = crops[position]["main"]
+            
+            presence = detector.check(camera_id, position, image)
+            if not presence["present"]:
+                empty[position] = {
+                    "success": False,
+                    "error": "未检测到扑克牌",
+                    "empty": True
+                }
+            elif presence["state"] == "uncertain":
+                uncertain[position] = image
+        
+        return empty, uncertain
+        
+    except Exception:
+        return {}, {}
+
+def learn_empty_positions(camera_id, uncertain, results):
+    """
+    存在检测不确定、识别引擎也未识别出牌的位置，画面记为空桌背景
+    
+    只采用由画面内容决定的识别失败，OCR引擎超时、识别异常等临时失败不学习
+    """
+    try:
+        from src.processors.card_presence_detector import get_presence_detector
+        from src.processors.poker_hybrid_recognizer import CACHEABLE_ERRORS
+        
+        detector = get_presence_detector()
+        for position, image in uncertain.items():
+            result = results.get(position)
+            if result is not None and not result["success"] and result.get("error") in CACHEABLE_ERRORS:
+                detector.learn_empty(camera_id, position, image)
+    except Exception:
+        pass
+
+def lookup_cached_positions(camera_id, positions, crops=None):
+    """
+    识别结果缓存查找 - 在YOLO批量推理之前找出裁剪内容已识别过的位置
+    
+    Args:
+        camera_id: 摄像头ID
+        positions: 待识别的位置列表
+        crops: 内存切图结果（为None时读取切图文件）
+        
+    Returns:
+        命中结果 {位置: 识别结果}，缓存禁用或失败时返回空字典
+    """
+    try:
+        from src.processors.poker_hybrid_recognizer import lookup_cached_recognition
+        
+        cached = {}
+        for position in positions:
+            if crops is None:
+                main_image = PROJECT_ROOT / "src" / "image" / "cut" / f"camera_{camera_id}_{position}.png"
+                left_image = main_image.with_name(f"camera_{camera_id}_{position}_left.png")
+                if not main_image.exists():
+                    continue
+                main, rank, suit = load_corner_images(camera_id, position, main_image)
+                result = lookup_cached_recognition(main, str(left_image) if left_image.exists() else None, rank, suit)
+            else:
+                crop = crops.get(position)
+                if crop is None:
+                    continue
+                result = lookup_cached_recognition(crop["main"], crop["left"], crop.get("rank"), crop.get("suit"))
+            
+            if result is not None:
+                cached[position] = format_position_result(result)
+        
+        return cached
+        
+    except Exception:
+        return {}
+
+def record_position_results(camera_id, results, fingerprints):
+    """
+    记录重新识别位置的指纹和结果，供下一轮变化检测复用
+    
+    只记录由画面内容决定的结果（识别成功、空位、可缓存的识别失败），
+    OCR引擎超时、识别异常等临时失败不复用，下一轮重新识别
+    """
+    try:
+        from src.processors.region_change_detector import get_change_detector
+        from src.processors.poker_hybrid_recognizer import CACHEABLE_ERRORS
+        
+        detector = get_change_detector()
+        for position, fingerprint in fingerprints.items():
+            result = results.get(position)
+            if result is None:
+                continue
+            if result["success"] or result.get("empty") or result.get("error") in CACHEABLE_ERRORS:
+                detector.update(camera_id, position, fingerprint, result)
+    except Exception:
+        pass
+
+def recognize_all_positions(camera_id, crops=None):
+    """识别所有位置（画面未变化的位置复用上次结果）"""
     results = {}
     successful_cards = []
     successful_count = 0
     
+    # 变化检测：未变化的位置跳过识别
+    reused, fingerprints = detect_unchanged_positions(camera_id, crops)
+    
+    # 存在检测：没有牌的位置不运行识别引擎
+    empty, uncertain = detect_empty_positions(camera_id, [position for position in POSITIONS if position not in reused], crops)
+    changed_positions = [position for position in POSITIONS if position not in reused and position not in empty]
+    
+    # 识别结果缓存：裁剪内容已识别过的位置不进入YOLO批量推理
+    cached = lookup_cached_positions(camera_id, changed_positions, crops)
+    changed_positions = [position for position in changed_positions if position not in cached]
+    
+    # 需要识别的位置的YOLO识别合并为一次批量推理
+    if not changed_positions:
+        yolo_results = {}
+    elif crops is None:
+        yolo_results = batch_recognize_yolo(camera_id, changed_positions)
+    else:
+        yolo_results = batch_recognize_yolo_crops({
+            position: crop for position, crop in crops.items() if position in changed_positions
+        })
+    
+    recognized = {}
     for position in POSITIONS:
-        result = recognize_single_position(camera_id, position)
+        if position in reused:
+            result = reused[position]
+        elif position in empty:
+            result = empty[position]
+            recognized[position] = result
+        elif position in cached:
+            result = cached[position]
+            recognized[position] = result
+        elif crops is None:
+            result = recognize_single_position(camera_id, position, yolo_results.get(position))
+            recognized[position] = result
+        else:
+            result = recognize_crop(crops.get(position), yolo_results.get(position))
+            recognized[position] = result
         results[position] = result
         
         if result["success"]:
@@ -145,6 +476,12 @@ def recognize_all_positions(camera_id):
             if result["card"] != "未知":
                 successful_cards.append(result["card"])
     
+    # 记录本轮重新识别位置的指纹
+    record_position_results(camera_id, recognized, fingerprints)
+    
+    # 识别引擎确认无牌的位置更新空桌背景
+    learn_empty_positions(camera_id, uncertain, recognized)
+    
     # 计算成功率
     success_rate = (successful_count / len(POSITIONS)) * 100
     
@@ -158,16 +495,23 @@ def recognize_all_positions(camera_id):
             "successful": successful_count,
             "failed": len(POSITIONS) - successful_count,
             "success_rate": f"{success_rate:.1f}%",
-            "cards": successful_cards
+            "cards": successful_cards,
+            "unchanged": len(reused),
+            "empty": len(empty),
+            "cached": len(cached)
         }
     }
 
-def recognize_camera(camera_id):
+def recognize_camera(camera_id, in_memory=False, debug_dir=None, recognition_slot=None):
     """
     供其他模块调用的摄像头识别函数
     
     Args:
         camera_id: 摄像头ID (如: "001")
+        in_memory: 内存模式，画面和裁剪区域以numpy数组在各步骤间传递，不写中间图片
+        debug_dir: 内存模式下的调试输出目录（可选）
+        recognition_slot: 返回上下文管理器的函数（可选），只包裹识别步骤，
+                          拍照和切图不占用识别引擎名额，多摄像头可同时抓帧
         
     Returns:
         dict: 识别结果字典
@@ -175,6 +519,23 @@ def recognize_camera(camera_id):
     start_time = time.time()
     
     try:
+        if in_memory:
+            # 步骤1+2: 内存抓帧和切图
+            cut_result = capture_and_cut_in_memory(camera_id, debug_dir)
+            if not cut_result["success"]:
+                return {
+                    "success": False,
+                    "error": cut_result["error"],
+                    "timestamp": datetime.now().isoformat()
+                }
+            
+            # 步骤3: 识别所有位置
+            with recognition_slot() if recognition_slot else nullcontext():
+                results = recognize_all_positions(camera_id, cut_result["crops"])
+            results["processing_time"] = round(time.time() - start_time, 1)
+            
+            return results
+        
         # 步骤1: 拍照
         if not take_photo(camera_id):
             return {
@@ -192,7 +553,8 @@ def recognize_camera(camera_id):
             }
         
         # 步骤3: 识别所有位置
-        results = recognize_all_positions(camera_id)
+        with recognition_slot() if recognition_slot else nullcontext():
+            results = recognize_all_positions(camera_id)
         
         # 添加处理时间
         processing_time = time.time() - start_time
@@ -207,17 +569,19 @@ def recognize_camera(camera_id):
             "timestamp": datetime.now().isoformat()
         }
 
-def recognize_camera_json(camera_id):
+def recognize_camera_json(camera_id, in_memory=False, debug_dir=None):
     """
     供其他模块调用的JSON字符串版本
     
     Args:
         camera_id: 摄像头ID (如: "001")
+        in_memory: 内存模式（不写中间图片）
+        debug_dir: 内存模式下的调试输出目录（可选）
         
     Returns:
         str: JSON格式的识别结果
     """
-    result = recognize_camera(camera_id)
+    result = recognize_camera(camera_id, in_memory, debug_dir)
     return json.dumps(result, ensure_ascii=False)
 
 def main():
@@ -225,7 +589,17 @@ def main():
     start_time = time.time()
     
     # 解析参数
-    camera_id = parse_args()
+    args = parse_args()
+    camera_id = args.camera
+    
+    # 内存模式: 抓帧 → 切图 → 识别，全程不写中间图片
+    if args.in_memory:
+        results = recognize_camera(camera_id, in_memory=True, debug_dir=args.debug_dir)
+        if not results["success"] and "error" in results:
+            print_error_and_exit(results["error"])
+        
+        print(json.dumps(results, ensure_ascii=False))
+        sys.exit(0 if results["success"] else 1)
     
     # 步骤1: 拍照
     if not take_photo(camera_id):
@@ -134,7 +134,11 @@ class SafeModuleInterface:
                 return photo_controller.cleanup_old_photos(*args, **kwargs)
             
             elif func_name == 'get_latest_recognition' and recognition_manager_available:
-                return recognition_manager.get_latest_recognition()
+                return recognition_manager.get_latest_recognition(*args)
+            elif func_name == 'get_recognition_events' and recognition_manager_available:
+                return recognition_manager.get_recognition_events(*args)
+            elif func_name == 'query_history' and recognition_manager_available:
+                return recognition_manager.query_history(*args)
             elif func_name == 'receive_recognition_data' and recognition_manager_available:
                 return recognition_manager.receive_recognition_data(*args)
             elif func_name == 'manual_push_recognition_result' and recognition_manager_available:
@@ -177,6 +181,8 @@ class APIHandler:
                 '/api/cameras': self._handle_get_all_cameras,
                 '/api/camera/{id}': self._handle_get_camera_by_id,
                 '/api/recognition_result': self._handle_get_recognition_result,
+                '/api/recognition_events': self._handle_get_recognition_events,
+                '/api/history': self._handle_query_history,
                 '/api/photo/status': self._handle_get_photo_status,
                 '/api/photo/status/{id}': self._handle_get_camera_photo_status,
                 '/api/photos': self._handle_list_photos,
@@ -185,6 +191,7 @@ class APIHandler:
                 '/api/config/status': self._handle_get_config_status,
                 '/api/system/info': self._handle_get_system_info,
                 '/api/system/statistics': self._handle_get_system_statistics,
+                '/api/recognition/cache/stats': self._handle_get_recognition_cache_stats,
                 # WebSocket推送相关GET接口
                 '/api/push/config': self._handle_get_push_config,
                 '/api/push/status': self._handle_get_push_status,
@@ -218,8 +225,50 @@ class APIHandler:
             }
         }
         
+        # 启动时编译路由表，请求分发不再逐个遍历路由模式
+        self._compiled_routes = self._compile_routes()
+        
         log_info("API处理器初始化完成", "API")
     
+    def _compile_routes(self) -> Dict[str, Dict[str, Any]]:
+        """
+        编译路由表
+        
+        Returns:
+            {方法: {'static': {路径: 路由}, 'trie': 参数路由的路径段前缀树}}
+            前缀树节点: {'children': {路径段: 节点}, 'param': (参数名, 节点) 或 None, 'route': 路由 或 None}
+        """
+        compiled = {}
+        
+        for method, method_routes in self.routes.items():
+            static_routes = {}
+            trie = self._new_route_node()
+            
+            for pattern, func in method_routes.items():
+                route = {'func': func, 'pattern': pattern}
+                if '{' not in pattern:
+                    static_routes[pattern] = route
+                    continue
+                
+                node = trie
+                for segment in pattern.split('/'):
+                    if segment.startswith('{') and segment.endswith('}'):
+                        if node['param'] is None:
+                            node['param'] = (segment[1:-1], self._new_route_node())
+                        node = node['param'][1]
+                    else:
+                        node = node['children'].setdefault(segment, self._new_route_node())
+                node['route'] = route
+            
+            compiled[method] = {'static': static_routes, 'trie': trie}
+        
+        return compiled
+    
+    @staticmethod
+    def _new_route_node() -> Dict[str, Any]:
+        """创建路由前缀树节点"""
+        return {'children': {}, 'param': None, 'route': None}
+    
     def handle_request(self, method: str, path: str, query_params: Dict[str, Any] = None, 
                       post_data: bytes = None) -> Dict[str, Any]:
         """
@@ -247,8 +296,8 @@ class APIHandler:
                     "API_NOT_FOUND"
                 )
             
-            # 解析路径参数
-            path_params = self._extract_path_params(handler['pattern'], path)
+            # 路径参数在匹配时已提取
+            path_params = handler['params']
             
             # 处理POST数据
             request_data = None
@@ -276,58 +325,51 @@ class APIHandler:
             )
     
     def _find_route_handler(self, method: str, path: str) -> Optional[Dict[str, Any]]:
-        """查找路由处理器"""
-        if method not in self.routes:
-            return None
+        """
+        查找路由处理器
         
-        method_routes = self.routes[method]
+        Returns:
+            {'func': 处理函数, 'pattern': 路由模式, 'params': 路径参数}，未找到返回None
+        """
+        compiled = self._compiled_routes.get(method)
+        if compiled is None:
+            return None
         
         # 精确匹配
-        if path in method_routes:
-            return {
-                'func': method_routes[path],
-                'pattern': path
-            }
+        route = compiled['static'].get(path)
+        if route is not None:
+            return {'func': route['func'], 'pattern': route['pattern'], 'params': {}}
         
-        # 参数匹配 (例如 /api/camera/{id})
-        for pattern, handler in method_routes.items():
-            if self._match_pattern(pattern, path):
-                return {
-                    'func': handler,
-                    'pattern': pattern
-                }
+        # 参数匹配 (例如 /api/camera/{id})，一次遍历同时提取参数
+        params = {}
+        route = self._match_route_node(compiled['trie'], path.split('/'), 0, params)
+        if route is None:
+            return None
         
-        return None
+        return {'func': route['func'], 'pattern': route['pattern'], 'params': params}
     
-    def _match_pattern(self, pattern: str, path: str) -> bool:
-        """匹配路由模式"""
-        pattern_parts = pattern.split('/')
-        path_parts = path.split('/')
-        
-        if len(pattern_parts) != len(path_parts):
-            return False
+    def _match_route_node(self, node: Dict[str, Any], segments: list, index: int,
+                          params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """在前缀树中匹配路径段（固定段优先于参数段）"""
+        if index == len(segments):
+            return node['route']
         
-        for pattern_part, path_part in zip(pattern_parts, path_parts):
-            if pattern_part.startswith('{') and pattern_part.endswith('}'):
-                # 参数占位符，跳过检查
-                continue
-            elif pattern_part != path_part:
-                return False
+        segment = segments[index]
         
-        return True
-    
-    def _extract_path_params(self, pattern: str, path: str) -> Dict[str, str]:
-        """提取路径参数"""
-        params = {}
-        pattern_parts = pattern.split('/')
-        path_parts = path.split('/')
+        child = node['children'].get(segment)
+        if child is not None:
+            route = self._match_route_node(child, segments, index + 1, params)
+            if route is not None:
+                return route
         
-        for pattern_part, path_part in zip(pattern_parts, path_parts):
-            if pattern_part.startswith('{') and pattern_part.endswith('}'):
-                param_name = pattern_part[1:-1]  # 移除大括号
-                params[param_name] = path_part
+        if node['param'] is not None:
+            param_name, param_node = node['param']
+            route = self._match_route_node(param_node, segments, index + 1, params)
+            if route is not None:
+                params[param_name] = segment
+                return route
         
-        return params
+        return None
     
     # ==================== GET 路由处理器 ====================
     
@@ -343,9 +385,41 @@ class APIHandler:
         
         return safe_interface.safe_call(config_manager_available, 'get_camera_by_id', camera_id)
     
-    def _handle_get_recognition_result(self, **kwargs) -> Dict[str, Any]:
-        """获取最新识别结果"""
-        return safe_interface.safe_call(recognition_manager_available, 'get_latest_recognition')
+    def _handle_get_recognition_result(self, query_params: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """获取最新识别结果（可用 ?camera=摄像头ID 指定摄像头）"""
+        camera_id = query_params.get('camera', [None])[0] if 'camera' in query_params else None
+        return safe_interface.safe_call(recognition_manager_available, 'get_latest_recognition', camera_id)
+    
+    def _handle_get_recognition_events(self, query_params: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """长轮询获取识别结果事件"""
+        try:
+            since = int(query_params['since'][0]) if 'since' in query_params else None
+            timeout = float(query_params['timeout'][0]) if 'timeout' in query_params else 25.0
+        except (ValueError, IndexError):
+            return format_error_response("since/timeout 参数格式错误", "INVALID_PARAMS")
+        
+        camera_id = query_params.get('camera', [None])[0] if 'camera' in query_params else None
+        # 限制最长等待，避免长期占用HTTP工作线程
+        timeout = max(0.0, min(timeout, 30.0))
+        
+        return safe_interface.safe_call(recognition_manager_available, 'get_recognition_events',
+                                        since, camera_id, timeout)
+    
+    def _handle_query_history(self, query_params: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """按摄像头、时间范围、牌面分页查询历史识别结果"""
+        try:
+            page = int(query_params.get('page', ['1'])[0])
+            page_size = int(query_params.get('page_size', ['50'])[0])
+        except (ValueError, IndexError):
+            return format_error_response("page/page_size 参数格式错误", "INVALID_PARAMS")
+        
+        camera_id = query_params.get('camera', [None])[0]
+        start = query_params.get('from', [None])[0]
+        end = query_params.get('to', [None])[0]
+        card = query_params.get('card', [None])[0]
+        
+        return safe_interface.safe_call(recognition_manager_available, 'query_history',
+                                        camera_id, start, end, card, page, page_size)
     
     def _handle_get_photo_status(self, **kwargs) -> Dict[str, Any]:
         """获取所有摄像头拍照状态"""
@@ -407,6 +481,14 @@ class APIHandler:
         """获取系统统计信息"""
         return safe_interface.safe_call(recognition_manager_available, 'get_system_statistics')
     
+    def _handle_get_recognition_cache_stats(self, **kwargs) -> Dict[str, Any]:
+        """获取识别结果缓存统计"""
+        try:
+            from src.processors.recognition_cache import get_recognition_cache_stats
+            return format_success_response("获取识别缓存统计成功", data=get_recognition_cache_stats())
+        except Exception as e:
+            return format_error_response(f"获取识别缓存统计失败: {str(e)}", "GET_CACHE_STATS_ERROR")
+    
     # ==================== WebSocket推送相关GET路由处理器 ====================
     
     def _handle_get_push_config(self, **kwargs) -> Dict[str, Any]:
@@ -587,7 +669,11 @@ class APIHandler:
             # GET接口
             'GET /api/cameras': '获取所有摄像头配置',
             'GET /api/camera/{id}': '获取指定摄像头配置',
-            'GET /api/recognition_result': '获取最新识别结果',
+            'GET /api/recognition_result': '获取最新识别结果 (?camera=摄像头ID 可选)',
+            'GET /api/recognition_events': '长轮询获取识别结果事件 (?since=序号&camera=摄像头ID&timeout=秒，同时等待数受 max_long_poll_clients 限制)',
+            'GET /api/recognition_stream': 'SSE实时推送识别结果 (?since=序号&camera=摄像头ID)',
+            'GET /api/history': '分页查询历史识别结果 (?camera=摄像头ID&from=起始时间&to=结束时间&card=花色:点数或点数&page=1&page_size=50)',
+            'GET /api/history/export': '流式导出历史识别结果 NDJSON (?camera=&from=&to=&card=)',
             'GET /api/photo/status': '获取所有摄像头拍照状态',
             'GET /api/photo/status/{id}': '获取指定摄像头拍照状态',
             'GET /api/photos': '列出所有图片文件',
@@ -596,6 +682,7 @@ class APIHandler:
             'GET /api/config/status': '获取配置文件状态',
             'GET /api/system/info': '获取系统信息',
             'GET /api/system/statistics': '获取系统统计信息',
+            'GET /api/recognition/cache/stats': '获取识别结果缓存命中统计',
             
             # WebSocket推送相关GET接口
             'GET /api/push/config': '获取推送配置',
@@ -657,6 +744,53 @@ def list_api_routes() -> Dict[str, Any]:
         }
     )
 
+def benchmark_route_dispatch(iterations: int = 10000) -> Dict[str, Any]:
+    """
+    路由分发微基准测试 - 对路由表中的每条路由测量查找耗时
+    
+    Args:
+        iterations: 每条路由的查找次数
+    
+    Returns:
+        每条路由的平均查找耗时(微秒)和总体平均值
+    """
+    import time
+    
+    results = {}
+    total_time = 0.0
+    total_lookups = 0
+    
+    for method, method_routes in api_handler.routes.items():
+        for pattern in method_routes:
+            # 参数段替换为示例值
+            path = '/'.join(
+                '001' if part.startswith('{') and part.endswith('}') else part
+                for part in pattern.split('/')
+            )
+            
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                api_handler._find_route_handler(method, path)
+            elapsed = time.perf_counter() - start_time
+            
+            results[f"{method} {pattern}"] = round(elapsed / iterations * 1e6, 3)
+            total_time += elapsed
+            total_lookups += iterations
+    
+    # 未命中路由（最坏情况：遍历完仍找不到）
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        api_handler._find_route_handler('GET', '/api/camera/001/not_found')
+    miss_time = time.perf_counter() - start_time
+    
+    return {
+        'routes': results,
+        'total_routes': len(results),
+        'iterations': iterations,
+        'avg_us': round(total_time / total_lookups * 1e6, 3) if total_lookups else 0.0,
+        'miss_us': round(miss_time / iterations * 1e6, 3)
+    }
+
 if __name__ == "__main__":
     # 测试API处理器
     print("🧪 测试API处理器（WebSocket推送版）")
@@ -740,4 +874,9 @@ if __name__ == "__main__":
     if routes['status'] == 'success':
         print(f"   总计路由数: {routes['data']['total_routes']}")
     
+    # 路由分发基准
+    print("\n⏱️  路由分发基准")
+    benchmark = benchmark_route_dispatch()
+    print(f"   路由数: {benchmark['total_routes']}, 平均查找: {benchmark['avg_us']}μs, 未命中: {benchmark['miss_us']}μs")
+    
     print("✅ API处理器测试完成")
\ No newline at end of file
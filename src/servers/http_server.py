@@ -9,6 +9,10 @@ HTTP服务器核心模块 - 基于BaseHTTPRequestHandler的HTTP服务器
 4. API接口服务集成
 5. 错误处理和日志记录
 6. CORS支持和编码处理
+7. 有界线程池并发处理请求，支持HTTP/1.1长连接和请求超时
+8. 静态文件Range请求，大文件sendfile零拷贝发送
+9. SSE实时推送识别结果 (/api/recognition_stream)
+10. 历史识别结果流式导出 (/api/history/export)
 """
 
 import sys
@@ -40,6 +44,7 @@ import json
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from typing import Dict, Any, Optional
@@ -101,21 +106,25 @@ except ImportError as e:
 
 # 导入静态文件处理器
 try:
-    from src.servers.static_handler import serve_html_file, serve_static_file, generate_directory_listing
+    from src.servers.static_handler import (
+        serve_html_file, serve_static_file, generate_directory_listing, make_file_validators
+    )
 except ImportError:
     # 创建临时的静态文件处理函数
-    def serve_html_file(filename):
+    def serve_html_file(filename, request_headers=None):
         return {
             'success': False,
             'error': 'Static handler not available',
             'status_code': 500
         }
-    def serve_static_file(path):
+    def serve_static_file(path, request_headers=None):
         return {
             'success': False,
             'error': 'Static handler not available',
             'status_code': 500
         }
+    def make_file_validators(stat_result):
+        return {}
     def generate_directory_listing(directory_path):
         return f"""
         <html>
@@ -128,6 +137,132 @@ except ImportError:
         </html>
         """
 
+# HTTP服务器默认配置（可在 camera.json 的 system.http_server 中覆盖）
+DEFAULT_HTTP_SERVER_CONFIG = {
+    'concurrent': True,          # 使用线程池并发处理请求
+    'max_workers': 8,            # 工作线程数
+    'max_pending': 32,           # 等待工作线程的最大连接数，超出返回503
+    'keep_alive': True,          # 启用HTTP/1.1长连接
+    'keep_alive_timeout': 5.0,   # 长连接空闲超时(秒)
+    'request_timeout': 30.0,     # 单个请求读取超时(秒)
+    'max_stream_clients': 4,     # SSE推送连接数上限（每个连接占用一个工作线程）
+    'max_long_poll_clients': 2,  # 同时等待的长轮询请求数上限（等待期间占用一个工作线程）
+    'stream_heartbeat': 15.0     # SSE心跳间隔(秒)
+}
+
+def load_http_server_config() -> Dict[str, Any]:
+    """读取HTTP服务器配置（camera.json 的 system.http_server 覆盖默认值）"""
+    config = DEFAULT_HTTP_SERVER_CONFIG.copy()
+    try:
+        from src.core.camera_config_store import get_camera_config_store
+        config.update(get_camera_config_store().get_section('http_server'))
+    except Exception as e:
+        log_warning(f"读取HTTP服务器配置失败，使用默认配置: {e}", "HTTP")
+    return config
+
+class PooledHTTPServer(HTTPServer):
+    """线程池HTTP服务器 - 请求交给有界工作线程池处理，慢请求不阻塞其他请求"""
+    
+    def __init__(self, server_address, handler_class, config: Dict[str, Any] = None):
+        """
+        初始化服务器
+        
+        Args:
+            server_address: (主机, 端口)
+            handler_class: 请求处理器类
+            config: 服务器配置，默认使用 DEFAULT_HTTP_SERVER_CONFIG
+        """
+        self.config = DEFAULT_HTTP_SERVER_CONFIG.copy()
+        if config:
+            self.config.update(config)
+        
+        max_workers = max(1, int(self.config['max_workers']))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http-worker")
+        # 处理中 + 排队中的连接总数上限
+        self._slots = threading.BoundedSemaphore(max_workers + max(0, int(self.config['max_pending'])))
+        
+        super().__init__(server_address, handler_class)
+    
+    def process_request(self, request, client_address):
+        """把连接交给工作线程，线程池和等待队列都满时直接返回503"""
+        if not self._slots.acquire(blocking=False):
+            self._reject_request(request)
+            return
+        
+        try:
+            self._executor.submit(self._process_request_worker, request, client_address)
+        except RuntimeError:
+            # 服务器关闭中
+            self._slots.release()
+            self.shutdown_request(request)
+    
+    def _process_request_worker(self, request, client_address):
+        """工作线程中处理连接（长连接会在同一线程内处理多个请求）"""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+    
+    def _reject_request(self, request):
+        """服务器繁忙，返回503并关闭连接"""
+        try:
+            body = safe_encode('{"status": "error", "message": "服务器繁忙，请稍后重试"}')
+            request.sendall(
+                b"HTTP/1.1 503 Service Unavailable\r\n"
+                b"Content-Type: application/json; charset=utf-8\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Retry-After: 1\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+        log_warning("HTTP工作线程已满，拒绝请求", "HTTP")
+    
+    def server_close(self):
+        """关闭监听端口和工作线程池"""
+        self.closing = True
+        super().server_close()
+        self._executor.shutdown(wait=False)
+
+def create_http_server(host: str, port: int, config: Dict[str, Any] = None) -> HTTPServer:
+    """
+    按配置创建HTTP服务器
+    
+    Args:
+        host: 监听地址
+        port: 监听端口
+        config: 服务器配置，默认读取 camera.json
+    
+    Returns:
+        并发模式返回 PooledHTTPServer，否则返回单线程 HTTPServer
+    """
+    if config is None:
+        config = load_http_server_config()
+    
+    if config.get('concurrent', True):
+        server = PooledHTTPServer((host, port), HTTPRequestHandler, config)
+    else:
+        server = HTTPServer((host, port), HTTPRequestHandler)
+        server.config = config
+    
+    server.closing = False
+    # 单线程服务器不支持长时间占用连接的请求（推送、长轮询会阻塞所有其他请求）
+    server.stream_slots = None
+    server.long_poll_slots = None
+    if isinstance(server, PooledHTTPServer):
+        server.stream_slots = threading.BoundedSemaphore(
+            max(1, int(server.config.get('max_stream_clients', DEFAULT_HTTP_SERVER_CONFIG['max_stream_clients'])))
+        )
+        server.long_poll_slots = threading.BoundedSemaphore(
+            max(1, int(server.config.get('max_long_poll_clients', DEFAULT_HTTP_SERVER_CONFIG['max_long_poll_clients'])))
+        )
+    return server
+
 class HTTPRequestHandler(BaseHTTPRequestHandler):
     """HTTP请求处理器"""
     
@@ -135,6 +270,30 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
         """初始化请求处理器"""
         super().__init__(*args, **kwargs)
     
+    def setup(self):
+        """按服务器配置设置协议版本和连接超时"""
+        config = getattr(self.server, 'config', DEFAULT_HTTP_SERVER_CONFIG)
+        self._request_timeout = config.get('request_timeout', 30.0)
+        self._keep_alive_timeout = config.get('keep_alive_timeout', 5.0)
+        
+        # HTTP/1.1 默认保持连接，所有响应都带 Content-Length
+        self.protocol_version = 'HTTP/1.1' if config.get('keep_alive', True) else 'HTTP/1.0'
+        self.timeout = self._request_timeout
+        super().setup()
+    
+    def handle(self):
+        """处理连接上的请求，长连接空闲等待使用较短的超时"""
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            self.connection.settimeout(self._keep_alive_timeout)
+            self.handle_one_request()
+    
+    def parse_request(self):
+        """收到请求行后恢复请求读取超时"""
+        self.connection.settimeout(self._request_timeout)
+        return super().parse_request()
+    
     def do_GET(self):
         """处理GET请求"""
         try:
@@ -151,6 +310,15 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
             elif path in ['/biaoji.html', '/simple_biaoji.html']:
                 # HTML页面
                 self._serve_html_page(path[1:])  # 移除开头的斜杠
+            elif path == '/api/recognition_stream':
+                # SSE识别结果推送
+                self._serve_recognition_stream(query_params)
+            elif path == '/api/history/export':
+                # 历史记录流式导出
+                self._serve_history_export(query_params)
+            elif path == '/api/recognition_events':
+                # 识别结果长轮询
+                self._serve_recognition_events(path, query_params)
             elif path.startswith('/api/'):
                 # API接口
                 self._handle_api_request('GET', path, query_params)
@@ -244,8 +412,9 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
     
     def do_OPTIONS(self):
         """处理CORS预检请求"""
+        self.send_response(204)
         self._send_cors_headers()
-        self.send_response(200)
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def _handle_api_request(self, method: str, path: str, query_params: Dict[str, Any] = None, 
@@ -267,6 +436,184 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
             }
             self._send_json_response(error_response, 500)
     
+    def _serve_recognition_stream(self, query_params: Dict[str, Any]):
+        """
+        SSE推送识别结果
+        
+        查询参数: camera=摄像头ID（可选过滤）, since=序号（从该序号之后回放，也可用 Last-Event-ID 头）
+        """
+        stream_slots = getattr(self.server, 'stream_slots', None)
+        if stream_slots is None:
+            self._send_json_response({
+                'status': 'error',
+                'message': '单线程模式不支持实时推送，请使用 /api/recognition_events',
+                'timestamp': get_timestamp()
+            }, 503)
+            return
+        if not stream_slots.acquire(blocking=False):
+            self._send_json_response({
+                'status': 'error',
+                'message': '实时推送连接数已达上限',
+                'timestamp': get_timestamp()
+            }, 503)
+            return
+        
+        try:
+            from src.core.recognition_manager import recognition_manager
+            
+            camera_id = query_params.get('camera', [None])[0]
+            since_text = query_params.get('since', [None])[0] or self.headers.get('Last-Event-ID')
+            try:
+                since = int(since_text) if since_text is not None else None
+            except ValueError:
+                since = None
+            
+            heartbeat = getattr(self.server, 'config', DEFAULT_HTTP_SERVER_CONFIG).get(
+                'stream_heartbeat', DEFAULT_HTTP_SERVER_CONFIG['stream_heartbeat']
+            )
+            
+            # 流式响应没有 Content-Length，结束后关闭连接
+            self.close_connection = True
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.send_header('X-Accel-Buffering', 'no')
+            self._send_cors_headers()
+            self.end_headers()
+            
+            # 推送连接不受请求读取超时限制
+            self.connection.settimeout(None)
+            self.wfile.write(b"retry: 3000\n\n")
+            
+            log_info(f"SSE订阅开始 camera={camera_id or '全部'} since={since}", "HTTP")
+            
+            while not getattr(self.server, 'closing', False):
+                result = recognition_manager.event_broker.wait_for_events(since, camera_id, heartbeat)
+                
+                if result['gap']:
+                    self.wfile.write(safe_encode(
+                        f"event: gap\ndata: {json.dumps({'last_sequence': result['last_sequence']})}\n\n"
+                    ))
+                
+                for event in result['events']:
+                    payload = json.dumps(event, ensure_ascii=False)
+                    self.wfile.write(safe_encode(
+                        f"id: {event['sequence']}\nevent: recognition\ndata: {payload}\n\n"
+                    ))
+                
+                if not result['events'] and not result['gap']:
+                    # 心跳注释行，保持连接并及时发现断开的客户端
+                    self.wfile.write(b": heartbeat\n\n")
+                
+                since = result['last_sequence']
+        
+        except (BrokenPipeError, ConnectionResetError):
+            log_info("SSE订阅客户端已断开", "HTTP")
+        except Exception as e:
+            log_error(f"SSE推送失败: {e}", "HTTP")
+        finally:
+            stream_slots.release()
+    
+    def _serve_recognition_events(self, path: str, query_params: Dict[str, Any]):
+        """
+        长轮询获取识别结果（等待期间占用工作线程，同时等待的请求数受 max_long_poll_clients 限制）
+        
+        单线程服务器不等待，立即返回已有事件
+        """
+        long_poll_slots = getattr(self.server, 'long_poll_slots', None)
+        if long_poll_slots is None:
+            self._handle_api_request('GET', path, dict(query_params, timeout=['0']))
+            return
+        
+        if not long_poll_slots.acquire(blocking=False):
+            self._send_json_response({
+                'status': 'error',
+                'message': '长轮询连接数已达上限',
+                'timestamp': get_timestamp()
+            }, 503)
+            return
+        
+        try:
+            self._handle_api_request('GET', path, query_params)
+        finally:
+            long_poll_slots.release()
+    
+    def _serve_history_export(self, query_params: Dict[str, Any]):
+        """
+        流式导出历史识别结果（NDJSON，每行一条）
+        
+        HTTP/1.1 连接使用分块传输；HTTP/1.0（客户端请求或关闭长连接时）不分块，以关闭连接结束响应
+        
+        查询参数: camera, from, to, card（同 /api/history）
+        """
+        try:
+            from src.core.recognition_manager import recognition_manager
+            
+            records = recognition_manager.iter_history(
+                query_params.get('camera', [None])[0],
+                query_params.get('from', [None])[0],
+                query_params.get('to', [None])[0],
+                query_params.get('card', [None])[0]
+            )
+        except ValueError as e:
+            self._send_json_response({
+                'status': 'error',
+                'message': f'时间格式错误: {str(e)}',
+                'timestamp': get_timestamp()
+            }, 400)
+            return
+        except Exception as e:
+            log_error(f"历史记录导出失败: {e}", "HTTP")
+            self._send_500_error(f"历史记录导出失败: {str(e)}")
+            return
+        
+        chunked = self.request_version == 'HTTP/1.1' and self.protocol_version == 'HTTP/1.1'
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            self.close_connection = True
+            self.send_header('Connection', 'close')
+        self.send_header('Cache-Control', 'no-cache')
+        self._send_cors_headers()
+        self.end_headers()
+        
+        exported = 0
+        try:
+            # 按批组成一个分块发送，减少系统调用
+            buffer = []
+            for record in records:
+                buffer.append(json.dumps(record, ensure_ascii=False))
+                if len(buffer) >= 200:
+                    self._write_chunk(safe_encode('\n'.join(buffer) + '\n'), chunked)
+                    exported += len(buffer)
+                    buffer = []
+            if buffer:
+                self._write_chunk(safe_encode('\n'.join(buffer) + '\n'), chunked)
+                exported += len(buffer)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+            log_info(f"历史记录导出完成: {exported} 条", "HTTP")
+        except (BrokenPipeError, ConnectionResetError):
+            log_info("历史记录导出客户端已断开", "HTTP")
+            self.close_connection = True
+        except Exception as e:
+            # 响应头已发出，只能中断连接
+            log_error(f"历史记录导出失败: {e}", "HTTP")
+            self.close_connection = True
+        finally:
+            records.close()
+    
+    def _write_chunk(self, data: bytes, chunked: bool = True):
+        """写出一个HTTP分块（不分块时直接写出数据）"""
+        if not chunked:
+            self.wfile.write(data)
+            return
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+    
     def _serve_index_page(self):
         """服务主页"""
         try:
@@ -280,10 +627,12 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
     def _serve_html_page(self, filename: str):
         """服务HTML页面"""
         try:
-            result = serve_html_file(filename)
+            result = serve_html_file(filename, self.headers)
             
-            if result['success']:
-                self._send_html_response(result['content'])
+            if result.get('not_modified'):
+                self._send_not_modified(result)
+            elif result['success']:
+                self._send_html_response(result['content'], extra_headers=self._validator_headers(result))
             else:
                 status_code = result.get('status_code', 404)
                 if status_code == 404:
@@ -296,28 +645,71 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
             self._send_500_error(f"无法加载页面: {filename}")
     
     def _serve_static_file(self, path: str):
-        """服务静态文件"""
+        """服务静态文件（支持Range请求，大文件通过sendfile零拷贝发送）"""
+        headers_sent = False
         try:
-            result = serve_static_file(path)
+            result = serve_static_file(path, self.headers)
             
-            if result['success']:
-                content = result['content']
-                content_type = result['content_type']
-                is_binary = result.get('is_binary', False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', content_type)
-                self.send_header('Content-Length', str(len(content)))
-                self.send_header('Cache-Control', result.get('cache_control', 'no-cache'))
-                self._send_cors_headers()
-                self.end_headers()
-                
-                if is_binary:
-                    self.wfile.write(content)
-                else:
-                    self.wfile.write(safe_encode(content))
+            if result.get('not_modified'):
+                self._send_not_modified(result)
+            elif result['success']:
+                file_obj = None
+                try:
+                    if result.get('stream'):
+                        # 大文件：不读入内存，直接从文件发送
+                        # 文件可能被原地重写，长度和缓存校验头都取自实际发送的这个文件
+                        try:
+                            file_obj = open(result['file_path'], 'rb')
+                        except FileNotFoundError:
+                            # 文件在检查之后被删除
+                            self._send_404_error(f"文件不存在: {path}")
+                            return
+                        body = None
+                        stat_result = os.fstat(file_obj.fileno())
+                        total_size = stat_result.st_size
+                        result = dict(result, **make_file_validators(stat_result))
+                    else:
+                        content = result['content']
+                        body = content if result.get('is_binary', False) else safe_encode(content)
+                        total_size = len(body)
+                    
+                    byte_range = self._parse_range_header(result, total_size)
+                    if byte_range == 'unsatisfiable':
+                        self._send_range_not_satisfiable(total_size)
+                        return
+                    
+                    start, end = byte_range if byte_range else (0, total_size - 1)
+                    length = max(0, end - start + 1)
                     
-                log_success(f"静态文件服务成功: {path}", "HTTP")
+                    self.send_response(206 if byte_range else 200)
+                    self.send_header('Content-Type', result['content_type'])
+                    self.send_header('Content-Length', str(length))
+                    self.send_header('Accept-Ranges', 'bytes')
+                    if byte_range:
+                        self.send_header('Content-Range', f"bytes {start}-{end}/{total_size}")
+                    self.send_header('Cache-Control', result.get('cache_control', 'no-cache'))
+                    for header, value in self._validator_headers(result).items():
+                        self.send_header(header, value)
+                    self._send_cors_headers()
+                    self.end_headers()
+                    headers_sent = True
+                    
+                    if length == 0:
+                        pass
+                    elif file_obj is not None:
+                        # socket.sendfile 在支持的平台上使用 os.sendfile，否则自动退回分块读写
+                        sent = self.connection.sendfile(file_obj, start, length)
+                        if sent < length:
+                            # 发送期间文件被截短，响应短于 Content-Length，只能关闭连接
+                            self.close_connection = True
+                            log_warning(f"文件发送不完整 {path}: {sent}/{length} 字节", "HTTP")
+                    else:
+                        self.wfile.write(memoryview(body)[start:end + 1])
+                finally:
+                    if file_obj is not None:
+                        file_obj.close()
+                
+                log_success(f"静态文件服务成功: {path}" + (f" (bytes {start}-{end})" if byte_range else ""), "HTTP")
             else:
                 status_code = result.get('status_code', 404)
                 if status_code == 404:
@@ -325,9 +717,71 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
                 else:
                     self._send_500_error(result['error'])
                     
+        except (BrokenPipeError, ConnectionResetError) as e:
+            # 客户端中途断开（如视频/图片下载取消），响应已部分发送，只能关闭连接
+            self.close_connection = True
+            log_warning(f"客户端断开连接 {path}: {e}", "HTTP")
         except Exception as e:
             log_error(f"服务静态文件失败 {path}: {e}", "HTTP")
-            self._send_500_error(f"无法加载文件: {path}")
+            if headers_sent:
+                # 响应头已发出，不能再发送错误响应
+                self.close_connection = True
+            else:
+                self._send_500_error(f"无法加载文件: {path}")
+    
+    def _parse_range_header(self, result: Dict[str, Any], total_size: int):
+        """
+        解析Range请求头（只支持单个字节范围）
+        
+        Args:
+            result: 文件服务结果（用于If-Range校验）
+            total_size: 文件总大小
+        
+        Returns:
+            (起始, 结束) 闭区间；无Range或应返回完整文件时返回None；范围无效时返回 'unsatisfiable'
+        """
+        range_header = self.headers.get('Range')
+        if not range_header or not range_header.startswith('bytes='):
+            return None
+        
+        # If-Range 与当前文件不一致时返回完整文件
+        if_range = self.headers.get('If-Range')
+        if if_range and if_range not in (result.get('etag'), result.get('last_modified')):
+            return None
+        
+        ranges = range_header[6:].strip()
+        if ',' in ranges:
+            # 多范围请求不常用，按规范可直接返回完整文件
+            return None
+        
+        start_text, _, end_text = ranges.partition('-')
+        try:
+            if start_text == '':
+                # 后缀范围: bytes=-N 表示最后N个字节
+                suffix_length = int(end_text)
+                if suffix_length <= 0:
+                    return 'unsatisfiable'
+                start = max(0, total_size - suffix_length)
+                end = total_size - 1
+            else:
+                start = int(start_text)
+                end = int(end_text) if end_text else total_size - 1
+                end = min(end, total_size - 1)
+        except ValueError:
+            return None
+        
+        if start >= total_size or start > end:
+            return 'unsatisfiable'
+        
+        return start, end
+    
+    def _send_range_not_satisfiable(self, total_size: int):
+        """发送416响应"""
+        self.send_response(416)
+        self.send_header('Content-Range', f"bytes */{total_size}")
+        self.send_header('Content-Length', '0')
+        self._send_cors_headers()
+        self.end_headers()
     
     def _serve_directory_listing(self, directory_path: str):
         """服务目录列表"""
@@ -372,7 +826,8 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
         except Exception as e:
             log_error(f"发送JSON响应失败: {e}", "HTTP")
     
-    def _send_html_response(self, html_content: str, status_code: int = 200):
+    def _send_html_response(self, html_content: str, status_code: int = 200,
+                            extra_headers: Dict[str, str] = None):
         """发送HTML响应"""
         try:
             html_bytes = safe_encode(html_content)
@@ -380,6 +835,8 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
             self.send_response(status_code)
             self.send_header('Content-Type', 'text/html; charset=utf-8')
             self.send_header('Content-Length', str(len(html_bytes)))
+            for header, value in (extra_headers or {}).items():
+                self.send_header(header, value)
             self._send_cors_headers()
             self.end_headers()
             
@@ -388,6 +845,28 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
         except Exception as e:
             log_error(f"发送HTML响应失败: {e}", "HTTP")
     
+    def _validator_headers(self, result: Dict[str, Any]) -> Dict[str, str]:
+        """从文件服务结果中取出缓存校验响应头"""
+        headers = {}
+        if result.get('etag'):
+            headers['ETag'] = result['etag']
+        if result.get('last_modified'):
+            headers['Last-Modified'] = result['last_modified']
+        return headers
+    
+    def _send_not_modified(self, result: Dict[str, Any]):
+        """发送304响应（无响应体）"""
+        try:
+            self.send_response(304)
+            self.send_header('Cache-Control', result.get('cache_control', 'no-cache'))
+            for header, value in self._validator_headers(result).items():
+                self.send_header(header, value)
+            self._send_cors_headers()
+            self.end_headers()
+        
+        except Exception as e:
+            log_error(f"发送304响应失败: {e}", "HTTP")
+    
     def _send_cors_headers(self):
         """发送CORS头"""
         self.send_header('Access-Control-Allow-Origin', '*')
@@ -691,10 +1170,11 @@ class HTTPRequestHandler(BaseHTTPRequestHandler):
 class HTTPServerManager:
     """HTTP服务器管理器"""
     
-    def __init__(self, host: str = 'localhost', port: int = 8000):
+    def __init__(self, host: str = 'localhost', port: int = 8000, config: Dict[str, Any] = None):
         """初始化HTTP服务器管理器"""
         self.host = host
         self.port = port
+        self.config = config
         self.server = None
         self.server_thread = None
         self.running = False
@@ -705,14 +1185,15 @@ class HTTPServerManager:
         """启动HTTP服务器"""
         try:
             # 创建服务器实例
-            self.server = HTTPServer((self.host, self.port), HTTPRequestHandler)
+            self.server = create_http_server(self.host, self.port, self.config)
+            self.config = self.server.config
             
             # 在单独线程中运行服务器
             self.server_thread = threading.Thread(target=self._run_server, daemon=True)
             self.running = True
             self.server_thread.start()
             
-            log_success(f"HTTP服务器启动成功: http://{self.host}:{self.port}", "HTTP")
+            log_success(f"HTTP服务器启动成功: http://{self.host}:{self.port} ({self._describe_mode()})", "HTTP")
             return True
             
         except Exception as e:
@@ -744,6 +1225,13 @@ class HTTPServerManager:
             log_error(f"停止HTTP服务器失败: {e}", "HTTP")
             return False
     
+    def _describe_mode(self) -> str:
+        """描述服务模式"""
+        config = self.config or DEFAULT_HTTP_SERVER_CONFIG
+        if not config.get('concurrent', True):
+            return "单线程"
+        return f"线程池 {config['max_workers']} 线程{', 长连接' if config.get('keep_alive', True) else ''}"
+    
     def get_server_info(self) -> Dict[str, Any]:
         """获取服务器信息"""
         return {
@@ -751,6 +1239,8 @@ class HTTPServerManager:
             'port': self.port,
             'running': self.running,
             'url': f"http://{self.host}:{self.port}",
+            'mode': self._describe_mode(),
+            'config': dict(self.config or {}),
             'thread_alive': self.server_thread.is_alive() if self.server_thread else False
         }
 
@@ -758,10 +1248,17 @@ class HTTPServerManager:
 http_server_manager = HTTPServerManager()
 
 # 导出主要函数
-def start_http_server(host: str = 'localhost', port: int = 8000) -> bool:
-    """启动HTTP服务器"""
+def start_http_server(host: str = 'localhost', port: int = 8000, config: Dict[str, Any] = None) -> bool:
+    """
+    启动HTTP服务器
+    
+    Args:
+        host: 监听地址
+        port: 监听端口
+        config: 服务器配置（并发、线程数、长连接、超时），默认读取 camera.json 的 system.http_server
+    """
     global http_server_manager
-    http_server_manager = HTTPServerManager(host, port)
+    http_server_manager = HTTPServerManager(host, port, config)
     return http_server_manager.start_server()
 
 def stop_http_server() -> bool:
@@ -775,7 +1272,7 @@ def get_server_info() -> Dict[str, Any]:
 def run_server_blocking(host: str = 'localhost', port: int = 8000):
     """以阻塞模式运行服务器"""
     try:
-        server = HTTPServer((host, port), HTTPRequestHandler)
+        server = create_http_server(host, port)
         
         print("🚀 扑克识别系统 HTTP 服务器")
         print("=" * 50)
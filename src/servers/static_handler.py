@@ -8,6 +8,8 @@
 3. 文件类型识别和Content-Type设置
 4. 缓存控制和文件流传输
 5. 文件权限和安全检查
+6. ETag/Last-Modified条件请求(304)和热点文件内存LRU缓存
+7. 大文件返回文件路径，由HTTP服务器流式发送（支持Range）
 """
 
 
@@ -38,6 +40,9 @@ PROJECT_ROOT = setup_project_paths()
 
 
 import os
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
 from src.core.utils import (
@@ -64,17 +69,134 @@ class StaticHandler:
         # 图片文件扩展名
         self.image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico'}
         
+        # 热点文件内存缓存（按 mtime+size 校验，文件更新后自动重新读取）
+        self.cache_max_bytes = 64 * 1024 * 1024      # 缓存总大小上限
+        self.cache_max_file_size = 1024 * 1024       # 单个文件缓存上限
+        
+        # 超过该大小的图片不读入内存，由HTTP服务器直接从文件发送(sendfile)
+        self.stream_threshold = 1024 * 1024
+        self._file_cache = OrderedDict()             # {路径: 缓存条目}
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+        self.cache_stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'evicted': 0}
+        
         log_info("静态文件处理器初始化完成", "STATIC")
     
-    def serve_html_file(self, filename: str) -> Dict[str, Any]:
+    def _make_validators(self, stat_result: os.stat_result) -> Dict[str, str]:
+        """根据文件修改时间和大小生成 ETag 和 Last-Modified"""
+        return {
+            'etag': f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+            'last_modified': formatdate(stat_result.st_mtime, usegmt=True)
+        }
+    
+    def _is_not_modified(self, request_headers: Optional[Dict[str, str]], etag: str, mtime: float) -> bool:
+        """
+        判断条件请求是否可以返回304
+        
+        Args:
+            request_headers: 请求头（If-None-Match / If-Modified-Since）
+            etag: 当前文件ETag
+            mtime: 当前文件修改时间
+        
+        Returns:
+            客户端缓存仍然有效时返回True
+        """
+        if not request_headers:
+            return False
+        
+        # If-None-Match 优先于 If-Modified-Since
+        if_none_match = request_headers.get('If-None-Match')
+        if if_none_match:
+            candidates = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in candidates or any(
+                (tag[2:] if tag.startswith('W/') else tag) == etag for tag in candidates
+            )
+        
+        if_modified_since = request_headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+        
+        return False
+    
+    def _read_file_cached(self, file_path: Path, stat_result: os.stat_result) -> Tuple[bytes, bool]:
+        """
+        读取文件内容，命中内存缓存且文件未变化时不再读盘
+        
+        Args:
+            file_path: 文件路径
+            stat_result: 文件当前状态
+        
+        Returns:
+            (文件内容, 是否命中缓存)
+        """
+        key = str(file_path)
+        version = (stat_result.st_mtime_ns, stat_result.st_size)
+        
+        with self._cache_lock:
+            entry = self._file_cache.get(key)
+            if entry is not None and entry['version'] == version:
+                self._file_cache.move_to_end(key)
+                self.cache_stats['hits'] += 1
+                return entry['content'], True
+            self.cache_stats['misses'] += 1
+        
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        
+        if len(content) <= self.cache_max_file_size:
+            with self._cache_lock:
+                old_entry = self._file_cache.pop(key, None)
+                if old_entry is not None:
+                    self._cache_bytes -= len(old_entry['content'])
+                
+                self._file_cache[key] = {'version': version, 'content': content}
+                self._cache_bytes += len(content)
+                
+                # 超出总大小时淘汰最久未访问的文件
+                while self._cache_bytes > self.cache_max_bytes and len(self._file_cache) > 1:
+                    _, evicted = self._file_cache.popitem(last=False)
+                    self._cache_bytes -= len(evicted['content'])
+                    self.cache_stats['evicted'] += 1
+        
+        return content, False
+    
+    def _not_modified_result(self, filename: str, validators: Dict[str, str], cache_control: str) -> Dict[str, Any]:
+        """构建304结果"""
+        with self._cache_lock:
+            self.cache_stats['not_modified'] += 1
+        
+        return {
+            'success': True,
+            'not_modified': True,
+            'status_code': 304,
+            'cache_control': cache_control,
+            'filename': filename,
+            **validators
+        }
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """获取文件缓存统计"""
+        with self._cache_lock:
+            return {
+                'files': len(self._file_cache),
+                'bytes': self._cache_bytes,
+                'max_bytes': self.cache_max_bytes,
+                **self.cache_stats
+            }
+    
+    def serve_html_file(self, filename: str, request_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         服务HTML文件
         
         Args:
             filename: HTML文件名
+            request_headers: 请求头（用于条件请求判断）
             
         Returns:
-            文件服务结果
+            文件服务结果（客户端缓存有效时 not_modified 为True）
         """
         try:
             # 安全检查：只允许特定的HTML文件
@@ -98,14 +220,22 @@ class StaticHandler:
                     'status_code': 404
                 }
             
+            stat_result = file_path.stat()
+            validators = self._make_validators(stat_result)
+            
+            # 条件请求：文件未变化直接返回304
+            if self._is_not_modified(request_headers, validators['etag'], stat_result.st_mtime):
+                return self._not_modified_result(filename, validators, 'no-cache')
+            
             # 读取文件内容
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                raw_content, cache_hit = self._read_file_cached(file_path, stat_result)
+                content = raw_content.decode('utf-8')
                 
-                file_size = len(content.encode('utf-8'))
+                file_size = len(raw_content)
                 
-                log_success(f"HTML文件服务成功: {filename} ({file_size} bytes)", "STATIC")
+                if not cache_hit:
+                    log_success(f"HTML文件服务成功: {filename} ({file_size} bytes)", "STATIC")
                 
                 return {
                     'success': True,
@@ -113,7 +243,8 @@ class StaticHandler:
                     'content_type': 'text/html; charset=utf-8',
                     'file_size': file_size,
                     'cache_control': 'no-cache',
-                    'filename': filename
+                    'filename': filename,
+                    **validators
                 }
                 
             except UnicodeDecodeError as e:
@@ -132,15 +263,16 @@ class StaticHandler:
                 'status_code': 500
             }
     
-    def serve_image_file(self, filename: str) -> Dict[str, Any]:
+    def serve_image_file(self, filename: str, request_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         服务图片文件
         
         Args:
             filename: 图片文件名
+            request_headers: 请求头（用于条件请求判断）
             
         Returns:
-            文件服务结果
+            文件服务结果（客户端缓存有效时 not_modified 为True）
         """
         try:
             # 安全检查：验证文件名
@@ -170,8 +302,10 @@ class StaticHandler:
                 }
             
             # 获取文件信息
-            file_size = get_file_size(file_path)
+            stat_result = file_path.stat()
+            file_size = stat_result.st_size
             content_type = get_content_type(file_path)
+            validators = self._make_validators(stat_result)
             
             # 验证文件大小
             if file_size == 0:
@@ -182,10 +316,28 @@ class StaticHandler:
                     'status_code': 500
                 }
             
+            # 条件请求：图片未更新直接返回304，浏览器轮询不再重复下载
+            # （no-cache 保证每次都会重新验证，拍照更新后立即取到新图）
+            if self._is_not_modified(request_headers, validators['etag'], stat_result.st_mtime):
+                return self._not_modified_result(filename, validators, 'no-cache')
+            
+            # 大文件（整幅摄像头画面）直接返回文件路径，由HTTP服务器零拷贝发送
+            if file_size > self.stream_threshold:
+                return {
+                    'success': True,
+                    'stream': True,
+                    'file_path': str(file_path),
+                    'content_type': content_type,
+                    'file_size': file_size,
+                    'cache_control': 'no-cache',
+                    'filename': filename,
+                    'is_binary': True,
+                    **validators
+                }
+            
             # 读取文件内容（二进制模式）
             try:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
+                content, cache_hit = self._read_file_cached(file_path, stat_result)
                 
                 # 验证读取的内容
                 if len(content) == 0:
@@ -196,21 +348,23 @@ class StaticHandler:
                         'status_code': 500
                     }
                 
-                # 简单验证PNG文件格式
-                if filename.lower().endswith('.png') and not content.startswith(b'\x89PNG'):
+                # 简单验证PNG文件格式（仅在重新读盘时检查）
+                if not cache_hit and filename.lower().endswith('.png') and not content.startswith(b'\x89PNG'):
                     log_warning(f"可能不是有效的PNG文件: {filename}", "STATIC")
                     # 但仍然尝试发送，让浏览器处理
                 
-                log_success(f"图片文件服务成功: {filename} ({file_size} bytes)", "STATIC")
+                if not cache_hit:
+                    log_success(f"图片文件服务成功: {filename} ({file_size} bytes)", "STATIC")
                 
                 return {
                     'success': True,
                     'content': content,
                     'content_type': content_type,
-                    'file_size': file_size,
-                    'cache_control': 'no-cache, no-store, must-revalidate',
+                    'file_size': len(content),
+                    'cache_control': 'no-cache',
                     'filename': filename,
-                    'is_binary': True
+                    'is_binary': True,
+                    **validators
                 }
                 
             except IOError as e:
@@ -229,12 +383,13 @@ class StaticHandler:
                 'status_code': 500
             }
     
-    def serve_static_file(self, file_path: str) -> Dict[str, Any]:
+    def serve_static_file(self, file_path: str, request_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         通用静态文件服务
         
         Args:
             file_path: 文件路径（如 /image/xxx.png）
+            request_headers: 请求头（用于条件请求判断）
             
         Returns:
             文件服务结果
@@ -258,7 +413,7 @@ class StaticHandler:
             
             # 根据目录类型分发处理
             if directory == 'image':
-                return self.serve_image_file(filename)
+                return self.serve_image_file(filename, request_headers)
             else:
                 return {
                     'success': False,
@@ -516,17 +671,25 @@ class StaticHandler:
 static_handler = StaticHandler()
 
 # 导出主要函数
-def serve_html_file(filename: str) -> Dict[str, Any]:
+def serve_html_file(filename: str, request_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """服务HTML文件"""
-    return static_handler.serve_html_file(filename)
+    return static_handler.serve_html_file(filename, request_headers)
 
-def serve_image_file(filename: str) -> Dict[str, Any]:
+def serve_image_file(filename: str, request_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """服务图片文件"""
-    return static_handler.serve_image_file(filename)
+    return static_handler.serve_image_file(filename, request_headers)
 
-def serve_static_file(file_path: str) -> Dict[str, Any]:
+def serve_static_file(file_path: str, request_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """服务静态文件"""
-    return static_handler.serve_static_file(file_path)
+    return static_handler.serve_static_file(file_path, request_headers)
+
+def make_file_validators(stat_result: os.stat_result) -> Dict[str, str]:
+    """根据文件状态生成 ETag 和 Last-Modified"""
+    return static_handler._make_validators(stat_result)
+
+def get_static_cache_stats() -> Dict[str, Any]:
+    """获取静态文件缓存统计"""
+    return static_handler.get_cache_stats()
 
 def get_file_info(file_path: str) -> Dict[str, Any]:
     """获取文件信息"""
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多摄像头并发调度器 - 每轮并发处理所有摄像头的拍照、识别和数据库写入
+功能:
+1. 有界工作线程池，所有摄像头同时开始处理
+2. 每个摄像头独立的截止时间，超时不拖慢整轮循环
+3. 识别引擎公平共享（FIFO名额，按到达顺序分配，轮换启动顺序）
+4. 每个摄像头的循环延迟统计
+"""
+
+import sys
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Optional
+
+def setup_project_paths():
+    """设置项目路径"""
+    current_file = Path(__file__).resolve()
+    project_root = current_file
+    while project_root.parent != project_root:
+        if (project_root / "main.py").exists():
+            break
+        project_root = project_root.parent
+    
+    project_root_str = str(project_root)
+    if project_root_str not in sys.path:
+        sys.path.insert(0, project_root_str)
+    
+    return project_root
+
+PROJECT_ROOT = setup_project_paths()
+
+class FairSemaphore:
+    """公平信号量 - 按请求到达顺序分配名额，避免某个摄像头长期抢不到识别引擎"""
+    
+    def __init__(self, slots: int):
+        """
+        初始化信号量
+        
+        Args:
+            slots: 同时可用的名额数
+        """
+        self.slots = max(1, int(slots))
+        self._available = self.slots
+        self._waiters = deque()
+        self._condition = threading.Condition()
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """按FIFO顺序获取名额，超时返回False"""
+        ticket = object()
+        deadline = None if timeout is None else time.time() + timeout
+        
+        with self._condition:
+            self._waiters.append(ticket)
+            try:
+                while not (self._available > 0 and self._waiters[0] is ticket):
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+                
+                self._available -= 1
+                return True
+            finally:
+                self._waiters.remove(ticket)
+                # 队首变化后唤醒其他等待者
+                self._condition.notify_all()
+    
+    def release(self):
+        """归还名额"""
+        with self._condition:
+            self._available = min(self.slots, self._available + 1)
+            self._condition.notify_all()
+    
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None):
+        """获取名额的上下文管理器"""
+        if not self.acquire(timeout):
+            raise TimeoutError(f"等待识别引擎名额超时 ({timeout}s)")
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def get_status(self) -> Dict[str, Any]:
+        """获取名额使用情况"""
+        with self._condition:
+            return {
+                'slots': self.slots,
+                'in_use': self.slots - self._available,
+                'waiting': len(self._waiters)
+            }
+
+class CameraScheduler:
+    """多摄像头并发调度器"""
+    
+    def __init__(self, worker: Callable[[str], bool], max_workers: int = 4,
+                 camera_deadline: float = 20.0, recognition_slots: int = 2,
+                 latency_window: int = 100):
+        """
+        初始化调度器
+        
+        Args:
+            worker: 单个摄像头的处理函数，参数为摄像头ID，返回是否成功
+            max_workers: 工作线程数上限
+            camera_deadline: 每个摄像头单轮处理的截止时间(秒)
+            recognition_slots: 同时进行识别的摄像头数（识别引擎名额）
+            latency_window: 延迟统计保留的最近样本数
+        """
+        self.worker = worker
+        self.max_workers = max(1, int(max_workers))
+        self.camera_deadline = camera_deadline
+        self.recognition_slots = FairSemaphore(recognition_slots)
+        self.latency_window = latency_window
+        
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="camera-worker")
+        self._in_flight = {}     # {摄像头ID: (future, 开始时间)}
+        self._lock = threading.Lock()
+        self._rotation = 0
+        
+        self.camera_stats = {}   # {摄像头ID: 延迟统计}
+    
+    def _get_camera_stats(self, camera_id: str) -> Dict[str, Any]:
+        """获取（必要时创建）摄像头统计"""
+        if camera_id not in self.camera_stats:
+            self.camera_stats[camera_id] = {
+                'cycles': 0,
+                'successes': 0,
+                'failures': 0,
+                'timeouts': 0,
+                'skipped': 0,
+                'last_latency': 0.0,
+                'max_latency': 0.0,
+                'latencies': deque(maxlen=self.latency_window)
+            }
+        return self.camera_stats[camera_id]
+    
+    def _run_camera(self, camera_id: str) -> Dict[str, Any]:
+        """在工作线程中执行单个摄像头的处理并记录延迟"""
+        start_time = time.time()
+        success = False
+        error = ''
+        
+        try:
+            success = bool(self.worker(camera_id))
+        except Exception as e:
+            error = str(e)
+        
+        latency = time.time() - start_time
+        
+        with self._lock:
+            stats = self._get_camera_stats(camera_id)
+            stats['cycles'] += 1
+            stats['last_latency'] = latency
+            stats['max_latency'] = max(stats['max_latency'], latency)
+            stats['latencies'].append(latency)
+            if success:
+                stats['successes'] += 1
+            else:
+                stats['failures'] += 1
+            self._in_flight.pop(camera_id, None)
+        
+        return {'camera_id': camera_id, 'success': success, 'latency': latency, 'error': error}
+    
+    def run_cycle(self, camera_ids: List[str]) -> Dict[str, Any]:
+        """
+        并发执行一轮所有摄像头的处理
+        
+        Args:
+            camera_ids: 本轮需要处理的摄像头ID列表
+        
+        Returns:
+            本轮结果 {'results': {摄像头ID: 结果}, 'timeouts': [...], 'skipped': [...], 'duration': 秒}
+        """
+        cycle_start = time.time()
+        
+        # 轮换启动顺序，让每个摄像头轮流排在识别名额队列的前面
+        if camera_ids:
+            offset = self._rotation % len(camera_ids)
+            ordered_ids = camera_ids[offset:] + camera_ids[:offset]
+            self._rotation += 1
+        else:
+            ordered_ids = []
+        
+        futures = {}
+        skipped = []
+        
+        with self._lock:
+            for camera_id in ordered_ids:
+                # 上一轮仍未完成的摄像头本轮跳过，避免同一摄像头任务堆积
+                if camera_id in self._in_flight:
+                    self._get_camera_stats(camera_id)['skipped'] += 1
+                    skipped.append(camera_id)
+                    continue
+                
+                future = self._executor.submit(self._run_camera, camera_id)
+                self._in_flight[camera_id] = (future, time.time())
+                futures[future] = camera_id
+        
+        # 所有摄像头同时开始，统一等待到截止时间
+        done, not_done = wait(futures.keys(), timeout=self.camera_deadline)
+        
+        results = {}
+        for future in done:
+            result = future.result()
+            results[result['camera_id']] = result
+        
+        timeouts = []
+        with self._lock:
+            for future in not_done:
+                camera_id = futures[future]
+                self._get_camera_stats(camera_id)['timeouts'] += 1
+                timeouts.append(camera_id)
+        
+        return {
+            'results': results,
+            'timeouts': timeouts,
+            'skipped': skipped,
+            'duration': time.time() - cycle_start
+        }
+    
+    @contextmanager
+    def recognition_slot(self):
+        """识别引擎名额（在工作函数中包裹识别步骤），超过截止时间仍未分到名额则放弃"""
+        with self.recognition_slots.slot(timeout=self.camera_deadline):
+            yield
+    
+    def get_latency_summary(self) -> Dict[str, Dict[str, Any]]:
+        """获取每个摄像头的延迟统计"""
+        summary = {}
+        with self._lock:
+            for camera_id, stats in self.camera_stats.items():
+                samples = sorted(stats['latencies'])
+                p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+                
+                summary[camera_id] = {
+                    'cycles': stats['cycles'],
+                    'successes': stats['successes'],
+                    'failures': stats['failures'],
+                    'timeouts': stats['timeouts'],
+                    'skipped': stats['skipped'],
+                    'last_latency': round(stats['last_latency'], 3),
+                    'avg_latency': round(sum(samples) / len(samples), 3) if samples else 0.0,
+                    'p95_latency': round(p95, 3),
+                    'max_latency': round(stats['max_latency'], 3),
+                    'in_flight': camera_id in self._in_flight
+                }
+        return summary
+    
+    def shutdown(self, wait_running: bool = True):
+        """关闭工作线程池"""
+        self._executor.shutdown(wait=wait_running)
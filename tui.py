@@ -15,6 +15,7 @@ import signal
 import argparse
 import threading
 import pymysql
+from pymysql.constants import CLIENT
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
@@ -47,6 +48,11 @@ class SimplifiedTuiSystem:
             'max_retry_times': 3,       # 最大重试次数
             'retry_delay': 2,           # 重试延迟(秒)
             'enable_database': True,    # 启用数据库写入
+            'in_memory_pipeline': True, # 内存识别流水线（不写中间图片）
+            'concurrent_cameras': True, # 多摄像头并发处理
+            'max_workers': 4,           # 并发工作线程数上限
+            'recognition_slots': 2,     # 同时识别的摄像头数（识别引擎名额）
+            'camera_deadline': 20,      # 单个摄像头每轮处理截止时间(秒)
         }
         
         # 数据库配置
@@ -60,7 +66,9 @@ class SimplifiedTuiSystem:
             'connect_timeout': 10,
             'read_timeout': 10,
             'write_timeout': 10,
-            'autocommit': True
+            'autocommit': True,
+            # UPDATE 返回匹配的行数（而非实际改变的行数），用于发现被删除的记录
+            'client_flag': CLIENT.FOUND_ROWS
         }
         
         # 位置映射配置 (系统格式 -> 数据库格式)
@@ -89,6 +97,7 @@ class SimplifiedTuiSystem:
                 'successful_writes': 0,
                 'failed_writes': 0,
                 'connection_errors': 0,
+                'batch_flushes': 0,
                 'last_write_time': None
             },
             'recognition_stats': {
@@ -103,8 +112,78 @@ class SimplifiedTuiSystem:
         # 显示状态
         self.display_lock = threading.Lock()
         
+        # 并发处理时的共享资源锁
+        self.db_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        
+        # 数据库批量写入：待写结果按摄像头合并，持有数据库锁的线程一次写出所有摄像头
+        self._pending_db_writes = {}     # {摄像头ID: 写入任务}
+        self._pending_db_lock = threading.Lock()
+        # 已确认存在初始记录的 (摄像头ID, tableId)，重连后重新确认
+        self._initialized_cameras = set()
+        
+        # 多摄像头并发调度器（主循环启动时创建）
+        self.scheduler = None
+        
         print("🚀 简化版数据库推送系统初始化完成")
     
+    def warmup_recognition_engines(self) -> bool:
+        """启动时预热OCR引擎池，避免首轮识别承担引擎初始化开销"""
+        try:
+            from src.processors.poker_ocr_detector import warmup_ocr_pool
+            
+            print("🔥 预热OCR引擎池...")
+            warmup_results = warmup_ocr_pool()
+            
+            if not warmup_results:
+                print("   OCR引擎池预热已禁用")
+                return True
+            
+            for engine_type, result in warmup_results.items():
+                if result['success']:
+                    print(f"   ✅ {engine_type}: {result['instances']} 个实例 ({result['duration']:.2f}s)")
+                else:
+                    print(f"   ⚠️  {engine_type}: 预热失败 - {result['error']}")
+            
+            return True
+            
+        except Exception as e:
+            print(f"⚠️  OCR引擎池预热异常: {e}")
+            return False
+    
+    def start_frame_grabbers(self) -> bool:
+        """为启用的摄像头启动常驻RTSP抓帧器，拍照时直接取最新帧"""
+        try:
+            from src.processors.frame_grabber import start_frame_grabbers
+            
+            camera_ids = [camera['id'] for camera in self.enabled_cameras]
+            print("🎥 启动常驻抓帧器...")
+            
+            result = start_frame_grabbers(camera_ids)
+            if not result['success']:
+                print(f"   ⚠️  {result['message']}，使用ffmpeg单次拍照")
+                return False
+            
+            ready = result.get('ready', [])
+            print(f"   ✅ {len(ready)}/{len(result['started'])} 个摄像头已取到首帧")
+            for camera_id in result['started']:
+                if camera_id not in ready:
+                    print(f"   ⚠️  摄像头 {camera_id} 暂无画面，拍照时回退到ffmpeg")
+            
+            return True
+            
+        except Exception as e:
+            print(f"⚠️  启动常驻抓帧器异常: {e}")
+            return False
+    
+    def stop_frame_grabbers(self):
+        """停止常驻抓帧器"""
+        try:
+            from src.processors.frame_grabber import stop_frame_grabbers
+            stop_frame_grabbers()
+        except Exception as e:
+            print(f"⚠️  停止常驻抓帧器异常: {e}")
+    
     def _init_database_connection(self) -> bool:
         """初始化数据库连接"""
         try:
@@ -114,6 +193,7 @@ class SimplifiedTuiSystem:
             print(f"   用户: {self.db_config['user']}")
             
             self.db_connection = pymysql.connect(**self.db_config)
+            self._initialized_cameras.clear()
             
             # 测试连接
             with self.db_connection.cursor() as cursor:
@@ -134,8 +214,12 @@ class SimplifiedTuiSystem:
             if self.db_connection is None:
                 return self._init_database_connection()
             
-            # 测试连接是否有效
+            # 测试连接是否有效（断线时 ping 会静默重连，服务器线程ID随之变化）
+            thread_id = self.db_connection.thread_id()
             self.db_connection.ping(reconnect=True)
+            if self.db_connection.thread_id() != thread_id:
+                print("⚠️  数据库连接已自动重连，重新确认摄像头初始记录")
+                self._initialized_cameras.clear()
             return True
             
         except Exception as e:
@@ -207,7 +291,12 @@ class SimplifiedTuiSystem:
             start_time = time.time()
             
             # 一行代码完成：拍照 → 切图 → 混合识别 → 结果汇总
-            result = recognize_camera(camera_id)
+            # 并发模式下按公平名额使用识别引擎（只包裹识别步骤，各摄像头拍照切图互不等待）
+            result = recognize_camera(
+                camera_id,
+                in_memory=self.config['in_memory_pipeline'],
+                recognition_slot=self.scheduler.recognition_slot if self.scheduler is not None else None
+            )
             
             # 计算耗时
             duration = time.time() - start_time
@@ -267,63 +356,104 @@ class SimplifiedTuiSystem:
             }
     
     def step4_write_to_database(self, camera_id: str, db_data: Dict[str, Any]) -> Dict[str, Any]:
-        """步骤4: 写入数据库"""
+        """步骤4: 写入数据库（与同时完成的其他摄像头合并为一次批量写入）"""
         try:
             if not self.config['enable_database']:
                 return {'success': True, 'message': '数据库写入已禁用', 'updated_count': 0}
             
             start_time = time.time()
             
-            # 确保数据库连接有效
-            if not self._ensure_database_connection():
-                return {
-                    'success': False, 
-                    'message': '数据库连接失败',
-                    'updated_count': 0
-                }
-            
             # 获取tableId
             table_id = self._get_table_id_from_config(camera_id)
             
-            # 检查并初始化摄像头数据
-            if not self._camera_data_exists(camera_id, table_id):
-                if not self._insert_initial_camera_data(camera_id, table_id):
-                    return {
-                        'success': False,
-                        'message': '初始化摄像头数据失败',
-                        'updated_count': 0
-                    }
-            
             # 显示识别结果
             self._display_recognition_results(camera_id, db_data, table_id)
             
-            # 更新数据库
-            update_result = self._update_camera_results(camera_id, table_id, db_data)
+            # 登记待写结果（同一摄像头未写出的旧结果被新结果取代）
+            task = {
+                'camera_id': camera_id,
+                'table_id': table_id,
+                'positions': db_data.get('positions', {}),
+                'result': None
+            }
+            with self._pending_db_lock:
+                superseded = self._pending_db_writes.get(camera_id)
+                if superseded is not None:
+                    superseded['result'] = {'success': True, 'message': '已被新结果取代', 'updated_count': 0}
+                self._pending_db_writes[camera_id] = task
+            
+            # 数据库连接不是线程安全的，串行访问；取得锁时若结果已被其他线程一并写出则直接返回
+            with self.db_lock:
+                if task['result'] is None:
+                    self._flush_pending_db_writes()
+            
+            update_result = task['result']
             
             # 更新统计
             duration = time.time() - start_time
-            self.stats['database_stats']['total_writes'] += 1
-            
-            if update_result['success']:
-                self.stats['database_stats']['successful_writes'] += 1
-                self.stats['database_stats']['last_write_time'] = datetime.now().strftime('%H:%M:%S')
-                self.stats['camera_stats'][camera_id]['successful_writes'] += 1
-            else:
-                self.stats['database_stats']['failed_writes'] += 1
-                self.stats['camera_stats'][camera_id]['failed_writes'] += 1
+            with self.stats_lock:
+                self.stats['database_stats']['total_writes'] += 1
+                
+                if update_result['success']:
+                    self.stats['database_stats']['successful_writes'] += 1
+                    self.stats['database_stats']['last_write_time'] = datetime.now().strftime('%H:%M:%S')
+                    self.stats['camera_stats'][camera_id]['successful_writes'] += 1
+                else:
+                    self.stats['database_stats']['failed_writes'] += 1
+                    self.stats['camera_stats'][camera_id]['failed_writes'] += 1
             
             update_result['duration'] = duration
             return update_result
             
         except Exception as e:
-            self.stats['database_stats']['failed_writes'] += 1
-            self.stats['camera_stats'][camera_id]['failed_writes'] += 1
+            with self.stats_lock:
+                self.stats['database_stats']['failed_writes'] += 1
+                self.stats['camera_stats'][camera_id]['failed_writes'] += 1
             return {
                 'success': False,
                 'message': str(e),
                 'updated_count': 0
             }
     
+    def _flush_pending_db_writes(self):
+        """写出所有待写结果（调用方持有 db_lock）"""
+        with self._pending_db_lock:
+            tasks = list(self._pending_db_writes.values())
+            self._pending_db_writes = {}
+        
+        if not tasks:
+            return
+        
+        # 确保数据库连接有效
+        if not self._ensure_database_connection():
+            for task in tasks:
+                task['result'] = {'success': False, 'message': '数据库连接失败', 'updated_count': 0}
+            return
+        
+        # 检查并初始化摄像头数据
+        failed_cameras = self._ensure_cameras_initialized({(task['camera_id'], task['table_id']) for task in tasks})
+        for task in tasks:
+            if (task['camera_id'], task['table_id']) in failed_cameras:
+                task['result'] = {'success': False, 'message': '初始化摄像头数据失败', 'updated_count': 0}
+        
+        # 更新数据库
+        tasks = [task for task in tasks if task['result'] is None]
+        if not tasks:
+            return
+        
+        batch_result = self._batch_update_results(tasks)
+        for task in tasks:
+            if batch_result['success']:
+                updated_count = batch_result['matched'].get((task['camera_id'], task['table_id']), 0)
+                task['result'] = {
+                    'success': True,
+                    'message': f"成功更新 {updated_count} 条记录" +
+                               (f" (批量 {len(tasks)} 个摄像头)" if len(tasks) > 1 else ""),
+                    'updated_count': updated_count
+                }
+            else:
+                task['result'] = {'success': False, 'message': batch_result['message'], 'updated_count': 0}
+    
     def _parse_card_info(self, card_str: str) -> tuple:
         """解析卡牌字符串，返回花色和点数的数字编码"""
         try:
@@ -374,16 +504,42 @@ class SimplifiedTuiSystem:
         except Exception:
             return 1
     
-    def _camera_data_exists(self, camera_id: str, table_id: int) -> bool:
-        """检查摄像头数据是否存在"""
+    def _ensure_cameras_initialized(self, camera_keys: set) -> set:
+        """
+        确保摄像头的初始记录存在（已确认的摄像头不再查询）
+        
+        Args:
+            camera_keys: {(摄像头ID, tableId), ...}
+        
+        Returns:
+            初始化失败的 (摄像头ID, tableId) 集合
+        """
+        unknown = sorted(camera_keys - self._initialized_cameras)
+        if not unknown:
+            return set()
+        
+        failed = set()
+        for camera_id, table_id in unknown:
+            exists = self._camera_data_exists(camera_id, table_id)
+            # 查询失败时不插入，避免产生重复的初始记录
+            if exists is None:
+                failed.add((camera_id, table_id))
+            elif exists or self._insert_initial_camera_data(camera_id, table_id):
+                self._initialized_cameras.add((camera_id, table_id))
+            else:
+                failed.add((camera_id, table_id))
+        return failed
+    
+    def _camera_data_exists(self, camera_id: str, table_id: int) -> Optional[bool]:
+        """检查摄像头数据是否存在，查询失败返回None"""
         try:
             with self.db_connection.cursor() as cursor:
                 sql = "SELECT COUNT(*) FROM tu_bjl_result WHERE camera_id = %s AND tableId = %s"
                 cursor.execute(sql, (camera_id, table_id))
-                count = cursor.fetchone()[0]
-                return count > 0
-        except Exception:
-            return False
+                return cursor.fetchone()[0] > 0
+        except Exception as e:
+            print(f"      ⚠️  查询摄像头数据失败: {e}")
+            return None
     
     def _insert_initial_camera_data(self, camera_id: str, table_id: int) -> bool:
         """插入摄像头的初始6条记录"""
@@ -413,45 +569,103 @@ class SimplifiedTuiSystem:
             print(f"      ❌ 初始化摄像头数据失败: {e}")
             return False
     
-    def _update_camera_results(self, camera_id: str, table_id: int, db_data: Dict[str, Any]) -> Dict[str, Any]:
-        """更新摄像头识别结果到数据库"""
+    def _batch_update_results(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        用一条 UPDATE ... CASE 语句更新所有摄像头所有位置的识别结果
+        
+        Args:
+            tasks: 写入任务列表 [{'camera_id', 'table_id', 'positions'}, ...]
+        
+        Returns:
+            {'success', 'message', 'row_count', 'matched': {(摄像头ID, tableId): 匹配的记录数}}
+        """
         try:
-            positions = db_data.get('positions', {})
-            updated_count = 0
+            cases = []
+            case_params = []
+            keys = []
+            key_params = []
             
-            with self.db_connection.cursor() as cursor:
-                for db_position, position_data in positions.items():
+            for task in tasks:
+                for db_position, position_data in task['positions'].items():
                     # 构建JSON字符串
                     result_json = json.dumps({
                         "rank": position_data.get('rank', '0'),
                         "suit": position_data.get('suit', '0')
                     })
-                    
-                    # 执行更新
-                    sql = "UPDATE tu_bjl_result SET result = %s WHERE camera_id = %s AND tableId = %s AND position = %s"
-                    cursor.execute(sql, (result_json, camera_id, table_id, db_position))
-                    
-                    if cursor.rowcount > 0:
-                        updated_count += 1
+                    cases.append("WHEN camera_id = %s AND tableId = %s AND position = %s THEN %s")
+                    case_params.extend([task['camera_id'], task['table_id'], db_position, result_json])
+                    keys.append("(%s, %s, %s)")
+                    key_params.extend([task['camera_id'], task['table_id'], db_position])
+            
+            if not keys:
+                return {'success': True, 'message': '没有需要更新的记录', 'row_count': 0, 'matched': {}}
+            
+            sql = (f"UPDATE tu_bjl_result SET result = CASE {' '.join(cases)} ELSE result END "
+                   f"WHERE (camera_id, tableId, position) IN ({', '.join(keys)})")
+            
+            with self.db_connection.cursor() as cursor:
+                cursor.execute(sql, case_params + key_params)
+                row_count = cursor.rowcount
             
             self.db_connection.commit()
             
+            with self.stats_lock:
+                self.stats['database_stats']['batch_flushes'] += 1
+            
+            # 连接使用 FOUND_ROWS，匹配行数少于位置数说明有记录在外部被删除
+            matched = {(task['camera_id'], task['table_id']): len(task['positions']) for task in tasks}
+            if row_count < len(keys):
+                matched = self._count_matched_positions(tasks)
+            
             return {
                 'success': True,
-                'message': f'成功更新 {updated_count} 条记录',
-                'updated_count': updated_count
+                'message': f'成功更新 {row_count} 条记录',
+                'row_count': row_count,
+                'matched': matched
             }
             
         except Exception as e:
             if self.db_connection:
                 self.db_connection.rollback()
+            # 写入失败可能是记录被删除，下次重新确认初始记录
+            self._initialized_cameras.clear()
             
             return {
                 'success': False,
                 'message': f'数据库更新失败: {str(e)}',
-                'updated_count': 0
+                'row_count': 0,
+                'matched': {}
             }
     
+    def _count_matched_positions(self, tasks: List[Dict[str, Any]]) -> Dict[tuple, int]:
+        """
+        逐个摄像头统计存在的位置记录，缺少记录的摄像头移出已初始化缓存（下一轮重新插入）
+        
+        Returns:
+            {(摄像头ID, tableId): 存在的记录数}
+        """
+        matched = {}
+        for task in tasks:
+            key = (task['camera_id'], task['table_id'])
+            positions = list(task['positions'])
+            if not positions:
+                matched[key] = 0
+                continue
+            try:
+                with self.db_connection.cursor() as cursor:
+                    sql = (f"SELECT COUNT(*) FROM tu_bjl_result WHERE camera_id = %s AND tableId = %s "
+                           f"AND position IN ({', '.join(['%s'] * len(positions))})")
+                    cursor.execute(sql, [task['camera_id'], task['table_id']] + positions)
+                    matched[key] = cursor.fetchone()[0]
+            except Exception as e:
+                print(f"      ⚠️  查询摄像头数据失败: {e}")
+                matched[key] = 0
+            
+            if matched[key] < len(positions):
+                print(f"      ⚠️  摄像头 {task['camera_id']} 缺少 {len(positions) - matched[key]} 条记录，下一轮重新初始化")
+                self._initialized_cameras.discard(key)
+        return matched
+    
     def _display_recognition_results(self, camera_id: str, db_data: Dict[str, Any], table_id: int):
         """显示识别结果"""
         with self.display_lock:
@@ -489,6 +703,11 @@ class SimplifiedTuiSystem:
     
     def _update_recognition_stats(self, camera_id: str, result: Dict[str, Any], duration: float):
         """更新识别统计信息"""
+        with self.stats_lock:
+            self._update_recognition_stats_locked(camera_id, result, duration)
+    
+    def _update_recognition_stats_locked(self, camera_id: str, result: Dict[str, Any], duration: float):
+        """更新识别统计信息（调用方持有 stats_lock）"""
         try:
             # 更新摄像头统计
             stats = self.stats['camera_stats'][camera_id]
@@ -522,7 +741,11 @@ class SimplifiedTuiSystem:
         try:
             print(f"\n🔄 开始简化版数据库推送循环")
             print(f"   识别间隔: {self.config['recognition_interval']} 秒")
-            print(f"   切换延迟: {self.config['camera_switch_delay']} 秒")
+            if self.config['concurrent_cameras']:
+                print(f"   并发处理: {self.config['max_workers']} 线程, 识别名额 {self.config['recognition_slots']}, "
+                      f"截止时间 {self.config['camera_deadline']} 秒")
+            else:
+                print(f"   切换延迟: {self.config['camera_switch_delay']} 秒")
             print(f"   启用摄像头: {len(self.enabled_cameras)} 个")
             print(f"   数据库写入: {'启用' if self.config['enable_database'] else '禁用'}")
             print("=" * 60)
@@ -534,23 +757,11 @@ class SimplifiedTuiSystem:
                 # 显示循环信息
                 self._display_cycle_header()
                 
-                # 轮询处理每个摄像头
-                for i, camera in enumerate(self.enabled_cameras):
-                    if self.shutdown_requested:
-                        break
-                    
-                    camera_id = camera['id']
-                    camera_name = camera.get('name', f'摄像头{camera_id}')
-                    
-                    # 显示当前处理的摄像头
-                    self._display_camera_processing(i + 1, len(self.enabled_cameras), camera_name, camera_id)
-                    
-                    # 执行完整流程
-                    self._process_single_camera_workflow(camera_id)
-                    
-                    # 摄像头切换延迟
-                    if i < len(self.enabled_cameras) - 1 and not self.shutdown_requested:
-                        time.sleep(self.config['camera_switch_delay'])
+                # 并发处理所有摄像头
+                if self.config['concurrent_cameras']:
+                    self._run_concurrent_cycle()
+                else:
+                    self._run_sequential_cycle()
                 
                 # 显示本轮统计
                 cycle_duration = time.time() - cycle_start_time
@@ -569,11 +780,57 @@ class SimplifiedTuiSystem:
             print(f"\n❌ 主循环异常: {e}")
             self.shutdown_requested = True
         finally:
+            # 关闭调度器（等待进行中的摄像头处理完成，避免关闭正在使用的数据库连接）
+            if self.scheduler is not None:
+                self.scheduler.shutdown()
+                self.scheduler = None
+            
             # 关闭数据库连接
             if self.db_connection:
                 self.db_connection.close()
                 print("🗄️  数据库连接已关闭")
     
+    def _run_concurrent_cycle(self):
+        """并发处理所有摄像头：拍照、识别、数据库写入同时进行"""
+        if self.scheduler is None:
+            from src.workflows.camera_scheduler import CameraScheduler
+            
+            self.scheduler = CameraScheduler(
+                worker=self._process_single_camera_workflow,
+                max_workers=min(self.config['max_workers'], max(1, len(self.enabled_cameras))),
+                camera_deadline=self.config['camera_deadline'],
+                recognition_slots=self.config['recognition_slots']
+            )
+        
+        camera_ids = [camera['id'] for camera in self.enabled_cameras]
+        self._display_camera_processing(len(camera_ids), len(camera_ids), "并发处理", ', '.join(camera_ids))
+        cycle_result = self.scheduler.run_cycle(camera_ids)
+        
+        with self.display_lock:
+            for camera_id in cycle_result['timeouts']:
+                print(f"   ⏰ 摄像头 {camera_id} 超过截止时间 {self.config['camera_deadline']}s，本轮结果延后")
+            for camera_id in cycle_result['skipped']:
+                print(f"   ⏭️  摄像头 {camera_id} 上一轮仍在处理，本轮跳过")
+    
+    def _run_sequential_cycle(self):
+        """顺序处理每个摄像头"""
+        for i, camera in enumerate(self.enabled_cameras):
+            if self.shutdown_requested:
+                break
+            
+            camera_id = camera['id']
+            camera_name = camera.get('name', f'摄像头{camera_id}')
+            
+            # 显示当前处理的摄像头
+            self._display_camera_processing(i + 1, len(self.enabled_cameras), camera_name, camera_id)
+            
+            # 执行完整流程
+            self._process_single_camera_workflow(camera_id)
+            
+            # 摄像头切换延迟
+            if i < len(self.enabled_cameras) - 1 and not self.shutdown_requested:
+                time.sleep(self.config['camera_switch_delay'])
+    
     def _process_single_camera_workflow(self, camera_id: str) -> bool:
         """处理单个摄像头的完整工作流程"""
         workflow_start_time = time.time()
@@ -647,7 +904,9 @@ class SimplifiedTuiSystem:
             success_rate = summary.get('success_rate', '0%')
             duration = result.get('processing_time', 0)
             
-            print(f"      ✅ see.py识别: {successful}/{total} 成功 ({success_rate}) ({duration:.2f}s)")
+            unchanged = summary.get('unchanged', 0)
+            unchanged_str = f" 未变化复用{unchanged}" if unchanged else ""
+            print(f"      ✅ see.py识别: {successful}/{total} 成功 ({success_rate}){unchanged_str} ({duration:.2f}s)")
             
             # 显示识别的卡牌
             cards = summary.get('cards', [])
@@ -685,6 +944,14 @@ class SimplifiedTuiSystem:
                 print(f"   {status_icon} {camera_name}: 识别{stats['successful_recognitions']}/{stats['total_attempts']}({rec_success_rate:.0f}%) "
                       f"写入{stats['successful_writes']}({write_success_rate:.0f}%) 平均{avg_duration:.2f}s "
                       f"表ID{table_id} 最后:{last_time}")
+            
+            # 显示并发调度的每摄像头循环延迟
+            if self.scheduler is not None:
+                print(f"   ⏱️  循环延迟 (本次/平均/P95/最大):")
+                for camera_id, latency in self.scheduler.get_latency_summary().items():
+                    print(f"      {camera_id}: {latency['last_latency']:.2f}s / {latency['avg_latency']:.2f}s / "
+                          f"{latency['p95_latency']:.2f}s / {latency['max_latency']:.2f}s "
+                          f"超时{latency['timeouts']} 跳过{latency['skipped']}")
     
     def _display_waiting(self, wait_time: float):
         """显示等待信息"""
@@ -711,6 +978,7 @@ class SimplifiedTuiSystem:
                 print(f"  成功写入: {db_stats['successful_writes']} ({db_success_rate:.1f}%)")
                 print(f"  失败写入: {db_stats['failed_writes']}")
                 print(f"  连接错误: {db_stats['connection_errors']}")
+                print(f"  批量写入: {db_stats['batch_flushes']} 次")
                 print(f"  最后写入: {db_stats['last_write_time'] or '无'}")
             
             # 显示识别统计
@@ -752,6 +1020,8 @@ def parse_arguments():
   python tui.py                           # 默认配置运行
   python tui.py --interval 5              # 设置循环间隔为5秒
   python tui.py --no-db                   # 禁用数据库写入功能
+  python tui.py --save-images             # 保留拍照和切图文件
+  python tui.py --sequential              # 按顺序逐个处理摄像头
         """
     )
     
@@ -763,6 +1033,16 @@ def parse_arguments():
                        help='最大重试次数 (默认: 3)')
     parser.add_argument('--no-db', action='store_true',
                        help='禁用数据库写入功能')
+    parser.add_argument('--save-images', action='store_true',
+                       help='写出拍照和切图文件（关闭内存识别流水线）')
+    parser.add_argument('--sequential', action='store_true',
+                       help='按顺序逐个处理摄像头（关闭并发调度）')
+    parser.add_argument('--workers', type=int, default=4,
+                       help='并发工作线程数 (默认: 4)')
+    parser.add_argument('--recognition-slots', type=int, default=2,
+                       help='同时识别的摄像头数 (默认: 2)')
+    parser.add_argument('--camera-deadline', type=float, default=20.0,
+                       help='单个摄像头每轮处理截止时间(秒) (默认: 20)')
     
     return parser.parse_args()
 
@@ -781,12 +1061,23 @@ def main():
             'camera_switch_delay': args.camera_delay,
             'max_retry_times': args.max_retries,
             'enable_database': not args.no_db,
+            'in_memory_pipeline': not args.save_images,
+            'concurrent_cameras': not args.sequential,
+            'max_workers': args.workers,
+            'recognition_slots': args.recognition_slots,
+            'camera_deadline': args.camera_deadline,
         })
         
         # 步骤1: 读取摄像头配置
         if not system.step1_load_camera_config():
             return 1
         
+        # 预热OCR引擎池
+        system.warmup_recognition_engines()
+        
+        # 启动常驻抓帧器
+        system.start_frame_grabbers()
+        
         # 初始化数据库连接
         if system.config['enable_database']:
             if not system._init_database_connection():
@@ -812,7 +1103,10 @@ def main():
         print("\n🔄 按 Ctrl+C 停止系统")
         
         # 运行主循环
-        system.run_main_loop()
+        try:
+            system.run_main_loop()
+        finally:
+            system.stop_frame_grabbers()
         
         # 显示最终统计
         if system.stats['total_cycles'] > 0: